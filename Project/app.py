@@ -1,94 +1,604 @@
 import sys
 import os
-import pandas as pd
-from flask import Flask, render_template
+import argparse
+import json
+import time
+import shlex
+import hashlib
+import threading
+import subprocess
+import matplotlib
+from flask import (
+    Blueprint,
+    Flask,
+    Response,
+    abort,
+    current_app,
+    g,
+    jsonify,
+    render_template,
+    request,
+    send_from_directory,
+)
 
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-from config import CSV_PATH
+from config import (
+    CHART_CACHE_MAX_BYTES,
+    CHART_RENDER_DPI,
+    COLUMNAR_PATH,
+    CSV_PATH,
+    DATA_RELOAD_INTERVAL,
+    HISTORY_DIR,
+    POSTER_DIR,
+    POSTER_FORMATS,
+    POSTER_SIZES,
+    POSTER_STATIC_DIR,
+    PROFILE_DIR,
+    PROFILE_REQUEST_RATE,
+    RELEASE_DIR,
+    SCHEDULE_JITTER,
+    SCHEDULE_LOCK_PATH,
+    SCHEDULE_REPORT_PATH,
+    SEARCH_INDEX_PATH,
+    SERVE_HOST,
+    SERVE_PORT,
+    SERVE_THREADS,
+    SERVE_WORKERS,
+)
+from utils.data_store import MovieDataStore
+from utils.search_index import SearchIndexLoader
+from utils.chart_cache import RenderCache
+from utils.history_store import HistoryStore
+from utils.poster_store import PosterStore
+from utils.release import ReleaseStore
+from utils.metrics import REGISTRY
+
+# Web 进程只在内存中绘图，导入时选定非交互式后端（此时不会导入 pyplot）
+matplotlib.use("Agg")
 
 current_dir = os.path.dirname(os.path.abspath(__file__))
 root_dir = os.path.dirname(current_dir)
 
-app = Flask(
-    __name__,
-    static_folder=os.path.join(root_dir, "static"),
-    template_folder=os.path.join(current_dir, "templates"),
+views = Blueprint("views", __name__)
+
+# pyplot 的全局状态不是线程安全的，同一进程内的绘图需要串行
+_chart_render_lock = threading.Lock()
+_CHART_MIMETYPES = {"png": "image/png", "svg": "image/svg+xml", "webp": "image/webp"}
+
+# 请求指标按视图函数名统计（而不是完整路径），避免标签值无限增长
+_HTTP_SECONDS = REGISTRY.histogram("douban_http_request_seconds", "请求处理耗时(秒)", ["endpoint"])
+_HTTP_REQUESTS = REGISTRY.counter(
+    "douban_http_requests_total", "请求数（按视图与状态码）", ["endpoint", "status"]
+)
+_CHART_CACHE_STATS = REGISTRY.gauge(
+    "douban_chart_render_cache", "按需绘制图表缓存的统计（命中/未命中/合并/淘汰/条目/字节）", ["stat"]
 )
 
 
-def get_movie_data():
-    """读取 CSV 数据"""
-    csv_path = os.path.join(root_dir, CSV_PATH)
-    if not os.path.exists(csv_path):
-        return pd.DataFrame()
-    df = pd.read_csv(csv_path)
-    df = df.fillna("未知")
-    return df
+def create_app(
+    preload: bool = False,
+    profile_rate: float = PROFILE_REQUEST_RATE,
+    profile_dir: str = PROFILE_DIR,
+) -> Flask:
+    """
+    创建 Flask 应用
+
+    Args:
+        preload: 是否在创建时预加载数据（生产环境在 fork 工作进程之前调用）
+        profile_rate: 抽样剖析的请求比例，为 0 时不注册剖析钩子
+        profile_dir: 请求剖析结果(.prof)的保存目录
+    """
+    app = Flask(
+        __name__,
+        static_folder=os.path.join(root_dir, "static"),
+        template_folder=os.path.join(current_dir, "templates"),
+    )
+    # 已发布过数据版本时，数据与检索索引都从当前版本中读取，不会读到新旧混合的文件
+    release = ReleaseStore(os.path.join(root_dir, RELEASE_DIR), logger=app.logger)
+    store = MovieDataStore(
+        csv_path=os.path.join(root_dir, CSV_PATH),
+        logger=app.logger,
+        check_interval=DATA_RELOAD_INTERVAL,
+        columnar_path=os.path.join(root_dir, COLUMNAR_PATH),
+        release=release,
+    )
+    app.extensions["movie_store"] = store
+    search_loader = SearchIndexLoader(
+        path=os.path.join(root_dir, SEARCH_INDEX_PATH),
+        logger=app.logger,
+        check_interval=DATA_RELOAD_INTERVAL,
+        release=release,
+    )
+    app.extensions["search_index"] = search_loader
+    app.extensions["history"] = HistoryStore(
+        os.path.join(root_dir, HISTORY_DIR),
+        logger=app.logger,
+        check_interval=DATA_RELOAD_INTERVAL,
+    )
+    app.extensions["posters"] = PosterStore(
+        os.path.join(root_dir, POSTER_DIR),
+        os.path.join(root_dir, POSTER_STATIC_DIR),
+        sizes=POSTER_SIZES,
+        formats=POSTER_FORMATS,
+        logger=app.logger,
+        check_interval=DATA_RELOAD_INTERVAL,
+    )
+    chart_cache = RenderCache(max_bytes=CHART_CACHE_MAX_BYTES)
+    app.extensions["chart_cache"] = chart_cache
+    _CHART_CACHE_STATS.set_function(chart_cache.stats)
+    app.register_blueprint(views)
+    app.before_request(_start_timer)
+    app.after_request(_record_request)
+    if profile_rate > 0:
+        _install_request_profiler(app, profile_rate, os.path.join(root_dir, profile_dir))
+
+    if preload:
+        store.warm()
+        search_loader.get()
+        from utils.jieba_cache import init_jieba
+
+        init_jieba(app.logger)  # 提前加载词典，避免第一次查询时加载
+    return app
+
+
+def _start_timer():
+    g.request_start = time.perf_counter()
+
+
+def _record_request(response: Response) -> Response:
+    """登记请求耗时与状态码"""
+    start = g.pop("request_start", None)
+    endpoint = request.endpoint or "unknown"
+    if start is not None:
+        _HTTP_SECONDS.observe(time.perf_counter() - start, endpoint=endpoint)
+    _HTTP_REQUESTS.inc(endpoint=endpoint, status=response.status_code)
+    return response
+
+
+def _install_request_profiler(app: Flask, rate: float, output_dir: str) -> None:
+    """按比例抽样剖析请求，每个被抽中的请求保存一个 .prof 文件"""
+    from utils.profiling import RequestProfiler
+
+    profiler = RequestProfiler(output_dir, rate=rate, logger=app.logger)
+
+    def start_profile():
+        g.request_profiler = profiler.start()
+        g.profile_start = time.perf_counter()
 
+    def stop_profile(exc) -> None:
+        # 在请求结束（teardown）时停止，抛出异常、不执行 after_request 的请求同样会停止剖析
+        request_profiler = g.pop("request_profiler", None)
+        if request_profiler is not None:
+            elapsed = time.perf_counter() - g.pop("profile_start")
+            profiler.stop(request_profiler, request.endpoint or "unknown", elapsed)
 
-@app.route("/")
+    app.before_request(start_profile)
+    app.teardown_request(stop_profile)
+    app.logger.info(f"已启用请求剖析，抽样比例 {rate}，结果保存至 {output_dir}")
+
+
+def get_store() -> MovieDataStore:
+    """获取当前应用的数据缓存"""
+    return current_app.extensions["movie_store"]
+
+
+@views.route("/")
 def index():
     return render_template("index.html")
 
 
-@app.route("/index")
+@views.route("/index")
 def home():
     return index()
 
 
-@app.route("/movie")
+@views.route("/movie")
 def movie():
-    df = get_movie_data()
-    if df.empty:
-        datalist = []
-    else:
-        datalist = df.to_dict("records")
-    return render_template("movie.html", movies=datalist)
+    datalist = get_store().get_records()
+    posters = current_app.extensions["posters"]
+    return render_template(
+        "movie.html", movies=datalist, posters=posters.get(), poster_sizes=posters.sizes
+    )
+
 
+@views.route("/posters/<path:filename>")
+def poster(filename: str):
+    """海报缩略图：文件名包含原图内容哈希，内容变化时文件名随之变化，因此可以永久缓存"""
+    response = send_from_directory(
+        current_app.extensions["posters"].static_dir, filename, max_age=365 * 24 * 3600
+    )
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
 
-@app.route("/score")
+
+@views.route("/score")
 def score():
-    df = get_movie_data()
-    if df.empty:
-        return render_template("score.html", score=[], num=[], num2=[], score2=[])
+    analytics = get_store().get_score_analytics()
+    return render_template("score.html", **analytics)
 
-    rating_series = pd.to_numeric(df["nums-rating"], errors="coerce").dropna()
-    rating_counts = rating_series.value_counts().sort_index()
-    score_list = rating_counts.index.astype(str).tolist()
-    num_list = rating_counts.values.tolist()
 
-    year_series = pd.to_numeric(df["year"], errors="coerce").dropna()
-    year_counts = year_series.astype(int).value_counts().sort_index()
+@views.route("/api/search")
+def search():
+    query = request.args.get("q", "").strip()
+    limit = min(max(request.args.get("limit", 10, type=int), 1), 100)
+    index = current_app.extensions["search_index"].get()
+    if index is None:
+        return jsonify({"query": query, "results": [], "error": "检索索引不存在"}), 503
+    return jsonify({"query": query, "results": index.search(query, limit=limit)})
 
-    score2_list = year_counts.index.astype(str).tolist()
-    num2_list = year_counts.values.tolist()
 
-    res = dict(zip(score_list, num_list))
+@views.route("/api/facets/<field>")
+def facets(field: str):
+    """
+    多值字段（country、classification、director、actors）的分面统计，
+    支持 top_n、year_from、year_to 参数
+    """
+    snapshot = get_store().snapshot()
+    if field not in snapshot.entities.tables:
+        abort(404)
+    top_n = min(max(request.args.get("top_n", 20, type=int), 1), 200)
+    year_from = request.args.get("year_from", type=int)
+    year_to = request.args.get("year_to", type=int)
 
-    return render_template(
-        "score.html",
-        score=score_list,
-        num=num_list,
-        res=res,
-        num2=num2_list,
-        score2=score2_list,
+    mask = None
+    if year_from is not None or year_to is not None:
+        import pandas as pd
+
+        years = pd.to_numeric(snapshot.frame(["year"])["year"], errors="coerce")
+        mask = years.notna()
+        if year_from is not None:
+            mask &= years >= year_from
+        if year_to is not None:
+            mask &= years <= year_to
+        mask = mask.to_numpy()
+
+    counts = snapshot.entities.table(field).top(top_n, movie_mask=mask)
+    return jsonify(
+        {
+            "field": field,
+            "facets": [
+                {"name": name, "count": int(count)} for name, count in counts.items()
+            ],
+        }
+    )
+
+
+@views.route("/api/export")
+def export():
+    """
+    流式导出电影数据：format=ndjson|csv，fields 为逗号分隔的列名（默认全部列），
+    过滤参数见 utils.export（year_from、rating_min、country 等），limit 为最多导出的行数，gzip=1 时压缩输出
+    """
+    from utils.export import FORMATS, ExportFilter, ExportSource, iter_export
+
+    fmt = request.args.get("format", "ndjson")
+    if fmt not in FORMATS:
+        abort(400, f"format 必须是 {' / '.join(FORMATS)}")
+    fields = [f.strip() for f in request.args.get("fields", "").split(",") if f.strip()]
+    limit = request.args.get("limit", type=int)
+    compress = request.args.get("gzip", "0").lower() in ("1", "true", "yes")
+    snapshot = get_store().snapshot()
+    if snapshot.version == 0:
+        abort(503, "数据文件不存在")
+    try:
+        chunks = iter_export(
+            ExportSource(snapshot),
+            fmt,
+            fields=fields,
+            export_filter=ExportFilter.from_args(request.args),
+            limit=max(limit, 0) if limit is not None else None,
+            gzip=compress,
+        )
+    except ValueError as e:
+        abort(400, str(e))
+
+    filename = f"douban_top250_movies.{fmt}" + (".gz" if compress else "")
+    content_type = "application/gzip" if compress else f"{FORMATS[fmt]}; charset=utf-8"
+    response = Response(chunks, content_type=content_type)
+    response.headers["Content-Disposition"] = f"attachment; filename={filename}"
+    response.headers["X-Data-Version"] = str(snapshot.version)
+    return response
+
+
+@views.route("/api/history")
+def history():
+    """
+    排名历史：指定 movie（豆瓣编号或标题）时返回该电影的排名、评分与评价人数序列，
+    否则返回历史概况；days、n 参数用于 movers 与 drift
+    """
+    history = current_app.extensions["history"].get()
+    movie = request.args.get("movie", "").strip()
+    if movie:
+        series = history.series(movie)
+        if series is None:
+            return jsonify({"movie": movie, "error": "历史记录中没有该电影"}), 404
+        return jsonify(series)
+    return jsonify(
+        {
+            "crawls": len(history),
+            "first": history.times[0].isoformat() if len(history) else None,
+            "latest": history.times[-1].isoformat() if len(history) else None,
+            "movies": len(history.ids),
+        }
     )
 
 
-@app.route("/word")
+@views.route("/api/history/<kind>")
+def history_changes(kind: str):
+    """最近 days 天内排名（movers）或评分（drift）变化最大的 n 部电影"""
+    if kind not in ("movers", "drift"):
+        abort(404)
+    days = max(request.args.get("days", 30, type=float), 0)
+    n = min(max(request.args.get("n", 10, type=int), 1), 250)
+    history = current_app.extensions["history"].get()
+    results = history.movers(days, n) if kind == "movers" else history.rating_drift(days, n)
+    return jsonify({"days": days, "results": results})
+
+
+@views.route("/charts/<name>.<fmt>")
+def chart(name: str, fmt: str):
+    """
+    按需绘制图表，支持 top_n、year_from、year_to 参数，
+    结果按 (数据版本, 图表, 参数) 缓存
+    """
+    if fmt not in _CHART_MIMETYPES:
+        abort(404)
+    top_n = request.args.get("top_n", type=int)
+    year_from = request.args.get("year_from", type=int)
+    year_to = request.args.get("year_to", type=int)
+    if top_n is not None and not 1 <= top_n <= 50:
+        abort(400, "top_n 需要在 1 到 50 之间")
+
+    from utils.data_visualization import CHART_METHODS, DataVisualizer
+
+    if f"plot_{name}" not in CHART_METHODS:
+        abort(404)
+
+    snapshot = get_store().snapshot()
+    if snapshot.version == 0:
+        abort(503, "数据文件不存在")
+    mask = None
+    if year_from is not None or year_to is not None:
+        import pandas as pd
+
+        years = pd.to_numeric(snapshot.frame(["year"])["year"], errors="coerce")
+        mask = years.notna()
+        if year_from is not None:
+            mask &= years >= year_from
+        if year_to is not None:
+            mask &= years <= year_to
+        mask = mask.to_numpy()
+        if not mask.any():
+            abort(404, "没有符合条件的电影")
+    key = (snapshot.version, name, fmt, top_n, year_from, year_to)
+
+    def render() -> bytes:
+        df = snapshot.df if mask is None else snapshot.df[mask]
+        visualizer = DataVisualizer(
+            logger=current_app.logger,
+            save_dir=os.path.join(root_dir, "static", "visualization", "images"),
+            dpi=CHART_RENDER_DPI,
+            image_format=fmt,
+        )
+        with _chart_render_lock:
+            return visualizer.render_chart(name, df, top_n=top_n)
+
+    data = current_app.extensions["chart_cache"].get_or_render(key, render)
+    response = Response(data, mimetype=_CHART_MIMETYPES[fmt])
+    response.set_etag(hashlib.sha1(repr(key).encode("utf-8")).hexdigest())
+    response.cache_control.public = True
+    response.cache_control.max_age = 300
+    return response.make_conditional(request)
+
+
+@views.route("/metrics")
+def metrics():
+    """Prometheus 文本格式的运行指标（多进程部署时为处理本次请求的工作进程的指标）"""
+    return Response(REGISTRY.to_prometheus(), mimetype="text/plain; version=0.0.4; charset=utf-8")
+
+
+@views.route("/word")
 def word():
     return render_template("cloud.html")
 
 
-@app.route("/team")
+@views.route("/team")
 def team():
     return render_template("team.html")
 
 
-@app.route("/aboutMe")
+@views.route("/aboutMe")
 def aboutMe():
     return render_template("aboutMe.html")
 
 
+def start_scheduler(
+    app: Flask,
+    interval: float,
+    jitter: float = SCHEDULE_JITTER,
+    crawl_args: str = "",
+    nice: int = 10,
+):
+    """
+    在 Web 服务中启动定时爬取
+
+    每次运行在子进程中执行 main.py（不占用 Web 进程的 GIL 与内存，并降低调度优先级），
+    成功后立即通知本进程在后台切换数据；gunicorn 的各工作进程在下一次检查数据文件时各自切换
+
+    gunicorn 的主进程在 SIGCHLD 中回收所有退出的子进程，subprocess 因此可能拿不到真实的退出码
+    （waitpid 报 ECHILD 时返回 0），所以是否成功以子进程写入的运行报告为准
+
+    Args:
+        app: Flask 应用
+        interval: 两次运行之间的间隔(秒)
+        jitter: 间隔的随机抖动幅度(秒)
+        crawl_args: 传给 main.py 的其他参数，如 "--if_save_to_excel ''"
+        nice: 子进程降低的调度优先级
+    """
+    from utils.scheduler import CrawlScheduler
+
+    report_path = os.path.join(root_dir, SCHEDULE_REPORT_PATH)
+    command = [sys.executable, os.path.join(current_dir, "main.py"), "--nice", str(nice)]
+    command += shlex.split(crawl_args)
+    command += ["--metrics_report", report_path]  # 放在最后，不会被 crawl_args 覆盖
+
+    def run() -> bool:
+        app.logger.info(f"开始定时运行: {' '.join(command)}")
+        try:
+            os.remove(report_path)  # 不把上一次运行的报告当作本次的结果
+        except FileNotFoundError:
+            pass
+        if subprocess.run(command, cwd=root_dir).returncode != 0:
+            return False
+        try:
+            with open(report_path, "r", encoding="utf-8") as f:
+                return json.load(f).get("ok") is True
+        except (OSError, ValueError) as e:
+            app.logger.error(f"读取定时运行的报告失败，视为运行失败: {e}")
+            return False
+
+    def on_publish():
+        app.extensions["movie_store"].refresh()
+        app.extensions["search_index"].refresh()
+
+    scheduler = CrawlScheduler(
+        run=run,
+        interval=interval,
+        jitter=jitter,
+        lock_path=os.path.join(root_dir, SCHEDULE_LOCK_PATH),
+        on_publish=on_publish,
+        logger=app.logger,
+    )
+    app.extensions["scheduler"] = scheduler
+    scheduler.start()
+    return scheduler
+
+
+def serve(
+    host: str,
+    port: int,
+    workers: int,
+    threads: int,
+    profile_rate: float = 0.0,
+    schedule_interval: float = 0.0,
+    schedule_jitter: float = SCHEDULE_JITTER,
+    crawl_args: str = "",
+):
+    """
+    以生产模式启动 Web 服务
+
+    优先使用 gunicorn（多进程 + 多线程，数据在 fork 之前预加载），
+    其次使用 waitress（单进程多线程），都不可用时退回到 Flask 自带的多线程服务器；
+    schedule_interval 大于 0 时在主进程中启动定时爬取
+    """
+    app = create_app(preload=True, profile_rate=profile_rate)
+    if schedule_interval > 0:
+        # gunicorn 在 fork 时只复制主线程，定时任务只在主进程中运行；
+        # 主进程切换数据后，因 max_requests 重启的工作进程直接继承新数据
+        start_scheduler(app, schedule_interval, schedule_jitter, crawl_args)
+
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError:
+        BaseApplication = None
+
+    if BaseApplication is not None:
+
+        class StandaloneApplication(BaseApplication):
+            def __init__(self, application, options):
+                self.application = application
+                self.options = options
+                super().__init__()
+
+            def load_config(self):
+                for key, value in self.options.items():
+                    self.cfg.set(key, value)
+
+            def load(self):
+                return self.application
+
+        options = {
+            "bind": f"{host}:{port}",
+            "workers": workers,
+            "threads": threads,
+            "worker_class": "gthread",
+            "preload_app": True,  # 数据已在主进程中加载，fork 后各进程共享内存页
+            "keepalive": 5,
+            "timeout": 30,
+            "max_requests": 10000,
+            "max_requests_jitter": 1000,
+            "backlog": 2048,
+        }
+        StandaloneApplication(app, options).run()
+        return
+
+    try:
+        from waitress import serve as waitress_serve
+    except ImportError:
+        waitress_serve = None
+
+    if waitress_serve is not None:
+        app.logger.warning("未安装 gunicorn，使用 waitress 单进程多线程模式")
+        waitress_serve(app, host=host, port=port, threads=workers * threads)
+        return
+
+    app.logger.warning("未安装 gunicorn/waitress，使用 Flask 自带的多线程服务器")
+    app.run(host=host, port=port, debug=False, threaded=True, use_reloader=False)
+
+
 if __name__ == "__main__":
-    app.run(debug=True)
+    parser = argparse.ArgumentParser(description="豆瓣电影Top250 Web 应用")
+    subparsers = parser.add_subparsers(dest="command")
+
+    # 生产模式
+    serve_parser = subparsers.add_parser("serve", help="以生产模式启动 Web 服务")
+    serve_parser.add_argument("--host", type=str, default=SERVE_HOST)
+    serve_parser.add_argument("--port", type=int, default=SERVE_PORT)
+    serve_parser.add_argument(
+        "--workers", type=int, default=SERVE_WORKERS, help="工作进程数"
+    )
+    serve_parser.add_argument(
+        "--threads", type=int, default=SERVE_THREADS, help="每个工作进程的线程数"
+    )
+    serve_parser.add_argument(
+        "--profile_rate",
+        type=float,
+        default=PROFILE_REQUEST_RATE,
+        help="抽样剖析的请求比例（0~1），剖析结果保存到 data/profiles/",
+    )
+
+    serve_parser.add_argument(
+        "--schedule_interval",
+        type=float,
+        default=0,
+        help="大于 0 时在服务中定时运行爬取流水线（main.py），每隔该秒数一次",
+    )
+    serve_parser.add_argument(
+        "--schedule_jitter",
+        type=float,
+        default=SCHEDULE_JITTER,
+        help="定时运行间隔的随机抖动幅度(秒)",
+    )
+    serve_parser.add_argument(
+        "--crawl_args",
+        type=str,
+        default="",
+        help="定时运行时传给 main.py 的其他参数（整体作为一个字符串，如 --crawl_args=\"--stages crawl save\"）",
+    )
+
+    args = parser.parse_args()
+    if args.command == "serve":
+        serve(
+            args.host,
+            args.port,
+            args.workers,
+            args.threads,
+            args.profile_rate,
+            args.schedule_interval,
+            args.schedule_jitter,
+            args.crawl_args,
+        )
+    else:
+        # 开发模式
+        create_app().run(debug=True)
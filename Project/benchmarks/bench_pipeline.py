@@ -0,0 +1,243 @@
+"""
+离线基准测试套件，基于 fixtures/ 中的豆瓣列表页夹具测量流水线各阶段的耗时，不访问网络
+
+    python benchmarks/bench_pipeline.py                           # 250 / 10000 / 100000 部电影
+    python benchmarks/bench_pipeline.py --sizes 250 10000 --stages parse clean save
+    python benchmarks/bench_pipeline.py --compare benchmarks/results/bench_20250101-120000.json
+
+测量项：
+    parse: MovieSpider.parse_single_page，按 BeautifulSoup 解析器分别测量（未安装的解析器跳过）
+    clean: DataCleaner.clean_data
+    save: DataSaver.save_to_csv / save_to_excel / save_to_json
+    charts: DataVisualizer 的每个 plot_* 方法（关闭指纹缓存，Agg 后端）
+    wordcloud: WordCloudGenerator.generate_wordcloud（不使用分词缓存）
+
+结果保存为 JSON（包含环境信息），--compare 与之前的结果对比，
+耗时超过基线 --threshold 倍的测量项视为性能退化，此时以退出码 1 结束
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import warnings
+import logging
+import argparse
+import platform
+import subprocess
+import tempfile
+from typing import Callable, Dict, List
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.dirname(BENCH_DIR))
+sys.path.append(BENCH_DIR)
+
+from douban_fixtures import load_fixture_movies, render_pages, synthesize_movies
+
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+STAGES = ["parse", "clean", "save", "charts", "wordcloud"]
+HTML_PARSERS = ["lxml", "html.parser", "html5lib"]
+
+# 基准测试中只输出警告，避免各模块的日志影响计时；缺少中文字体等绘图警告不影响计时，直接忽略
+logger = logging.getLogger("benchmark")
+logger.setLevel(logging.WARNING)
+logging.getLogger("matplotlib").setLevel(logging.ERROR)
+warnings.filterwarnings("ignore", category=UserWarning)
+
+
+def timed(func: Callable[[], object], repeat: int) -> Dict[str, float]:
+    """重复执行 repeat 次，返回最快与平均耗时"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return {"best": min(times), "mean": sum(times) / len(times)}
+
+
+def available_parsers() -> List[str]:
+    from bs4 import BeautifulSoup, FeatureNotFound
+
+    parsers = []
+    for name in HTML_PARSERS:
+        try:
+            BeautifulSoup("<p></p>", name)
+            parsers.append(name)
+        except FeatureNotFound:
+            continue
+    return parsers
+
+
+def bench_parse(movies: List[Dict], repeat: int) -> Dict[str, Dict]:
+    from spiders.spider import MovieSpider
+
+    pages = render_pages(movies)
+    results = {}
+    for parser in available_parsers():
+        spider = MovieSpider(logger=logger, html_parser=parser)
+
+        def run():
+            parsed = 0
+            for i, page in enumerate(pages, 1):
+                parsed += len(spider.parse_single_page(page, i) or [])
+            assert parsed == len(movies), f"{parser} 解析出 {parsed} 部电影，应为 {len(movies)}"
+
+        results[f"parse_single_page[{parser}]"] = timed(run, repeat)
+    return results
+
+
+def bench_clean(movies: List[Dict], repeat: int) -> Dict[str, Dict]:
+    from utils.data_clean import DataCleaner
+
+    cleaner = DataCleaner(logger=logger)
+    return {"clean_data": timed(lambda: cleaner.clean_data(movies), repeat)}
+
+
+def bench_save(df, repeat: int, work_dir: str) -> Dict[str, Dict]:
+    from utils.data_save import DataSaver
+
+    saver = DataSaver(logger=logger)
+    results = {}
+    for fmt, method, ext in (
+        ("csv", saver.save_to_csv, "csv"),
+        ("excel", saver.save_to_excel, "xlsx"),
+        ("json", saver.save_to_json, "json"),
+    ):
+        path = os.path.join(work_dir, f"movies.{ext}")
+        results[f"save_to_{fmt}"] = timed(lambda: method(save_path=path, movies=df), repeat)
+    return results
+
+
+def bench_charts(df, repeat: int, work_dir: str) -> Dict[str, Dict]:
+    import matplotlib
+
+    matplotlib.use("Agg")
+    from utils.data_visualization import CHART_METHODS, DataVisualizer
+
+    visualizer = DataVisualizer(
+        logger=logger, save_dir=work_dir, dpi=100, use_cache=False, autosave_manifest=False
+    )
+    return {
+        name: timed(lambda: getattr(visualizer, name)(df, show=False), repeat)
+        for name in CHART_METHODS
+    }
+
+
+def bench_wordcloud(df, repeat: int, work_dir: str, mask: str, font_path: str) -> Dict[str, Dict]:
+    from utils.wordcloud_generator import WordCloudGenerator
+
+    def run():
+        generator = WordCloudGenerator(
+            data=df,
+            logger=logger,
+            save_dir=work_dir,
+            font_path=font_path,
+            token_cache_path=None,
+        )
+        if not generator.generate_wordcloud(mask_path=mask, columns=["title", "comment"]):
+            raise RuntimeError("词云生成失败")
+
+    return {"generate_wordcloud": timed(run, repeat)}
+
+
+def environment() -> Dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=BENCH_DIR,
+            capture_output=True,
+            text=True,
+        ).stdout.strip()
+    except OSError:
+        commit = ""
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "commit": commit,
+        "time": time.strftime("%Y-%m-%d %H:%M:%S"),
+    }
+
+
+def compare(results: List[Dict], baseline_path: str, threshold: float) -> bool:
+    """与基线结果对比并打印，存在性能退化时返回 True"""
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = {(r["stage"], r["case"], r["size"]): r for r in json.load(f)["results"]}
+    regressed = False
+    print(f"\n与基线对比: {baseline_path}（阈值 {threshold:.2f} 倍）")
+    print(f"{'测量项':<44}{'规模':>8}{'基线':>10}{'本次':>10}{'倍数':>8}")
+    for r in results:
+        base = baseline.get((r["stage"], r["case"], r["size"]))
+        if base is None:
+            continue
+        ratio = r["best"] / base["best"] if base["best"] else float("inf")
+        flag = "  退化" if ratio > threshold else ""
+        regressed |= ratio > threshold
+        print(
+            f"{r['case']:<44}{r['size']:>8}{base['best']:>10.3f}{r['best']:>10.3f}{ratio:>8.2f}{flag}"
+        )
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="离线基准测试套件")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[250, 10000, 100000])
+    parser.add_argument("--stages", type=str, nargs="+", default=STAGES, choices=STAGES)
+    parser.add_argument("--repeat", type=int, default=3, help="每个测量项的重复次数")
+    parser.add_argument(
+        "--mask",
+        type=str,
+        default=os.path.join(os.path.dirname(os.path.dirname(BENCH_DIR)), "static", "visualization", "masks", "example.png"),
+        help="词云遮罩图片",
+    )
+    parser.add_argument("--font_path", type=str, default=None, help="词云字体，默认使用 WordCloud 自带字体")
+    parser.add_argument("--output", type=str, default=None, help="结果文件路径，默认保存到 benchmarks/results/")
+    parser.add_argument("--compare", type=str, default=None, help="作为基线的结果文件")
+    parser.add_argument("--threshold", type=float, default=1.25, help="判定为性能退化的耗时倍数")
+    args = parser.parse_args()
+
+    base = load_fixture_movies()
+    work_dir = tempfile.mkdtemp(prefix="bench_pipeline_")
+    results = []
+    print(f"{'测量项':<44}{'规模':>8}{'最快':>10}{'平均':>10}")
+    try:
+        for size in args.sizes:
+            movies = synthesize_movies(size, base)
+            df = None
+            for stage in args.stages:
+                if stage == "parse":
+                    cases = bench_parse(movies, args.repeat)
+                elif stage == "clean":
+                    cases = bench_clean(movies, args.repeat)
+                else:
+                    if df is None:
+                        from utils.data_clean import DataCleaner
+
+                        df = DataCleaner(logger=logger).clean_data(movies)
+                    if stage == "save":
+                        cases = bench_save(df, args.repeat, work_dir)
+                    elif stage == "charts":
+                        cases = bench_charts(df, args.repeat, work_dir)
+                    else:
+                        cases = bench_wordcloud(df, args.repeat, work_dir, args.mask, args.font_path)
+                for case, timing in cases.items():
+                    results.append({"stage": stage, "case": case, "size": size, "repeat": args.repeat, **timing})
+                    print(f"{case:<44}{size:>8}{timing['best']:>10.3f}{timing['mean']:>10.3f}", flush=True)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"bench_{time.strftime('%Y%m%d-%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump({"environment": environment(), "results": results}, f, ensure_ascii=False, indent=2)
+    print(f"结果已保存至 {output}")
+
+    if args.compare and compare(results, args.compare, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
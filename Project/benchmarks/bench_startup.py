@@ -0,0 +1,74 @@
+"""
+启动耗时基准测试，每项都在新的 Python 进程中测量，避免模块缓存的影响
+
+    python benchmarks/bench_startup.py --repeat 5
+
+测量项：
+    main.py 启动：导入 main 模块（延迟导入后只包含日志、配置等轻量模块）
+    全部导入：一次性导入所有阶段的模块（改造前 main.py 启动时的行为）
+    各阶段导入：单独导入每个阶段的模块
+    jieba 初始化：无缓存（重新解析词典）与使用项目内缓存两种情况
+"""
+
+import os
+import sys
+import argparse
+import subprocess
+import tempfile
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+STAGE_IMPORTS = {
+    "crawl": "from spiders.spider import MovieSpider",
+    "clean/save": "from utils.data_clean import DataCleaner; from utils.data_save import DataSaver",
+    "search_index": "from utils.search_index import SearchIndex",
+    "charts": "from utils.data_visualization import DataVisualizer",
+    "wordcloud": "from utils.wordcloud_generator import WordCloudGenerator",
+}
+
+
+def run_timed(code: str) -> float:
+    """在新进程中执行代码，返回其中 __timed__ 部分的耗时(秒)"""
+    script = (
+        "import time, sys\n"
+        f"sys.path.insert(0, {PROJECT_DIR!r})\n"
+        "__start = time.perf_counter()\n"
+        f"{code}\n"
+        "print(time.perf_counter() - __start)\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=PROJECT_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="启动耗时基准测试")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    cache_dir = tempfile.mkdtemp(prefix="bench_startup_")
+    cache_path = os.path.join(cache_dir, "jieba.cache")
+    cases = [("main.py 启动", "import main"), ("全部导入", "; ".join(STAGE_IMPORTS.values()))]
+    cases += [(f"导入 {name}", code) for name, code in STAGE_IMPORTS.items()]
+    init_code = (
+        "from utils.jieba_cache import init_jieba\n"
+        "__start = time.perf_counter()\n"
+        f"init_jieba(cache_path={cache_path!r})"
+    )
+    cases += [("jieba 初始化(无缓存)", f"import os\nos.path.exists({cache_path!r}) and os.remove({cache_path!r})\n{init_code}")]
+    cases += [("jieba 初始化(有缓存)", init_code)]
+
+    print(f"耗时（秒，重复 {args.repeat} 次）")
+    print(f"{'测量项':<24}{'最快':>10}{'平均':>10}")
+    for name, code in cases:
+        times = [run_timed(code) for _ in range(args.repeat)]
+        print(f"{name:<24}{min(times):>10.3f}{sum(times) / len(times):>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
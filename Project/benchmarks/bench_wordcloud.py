@@ -0,0 +1,99 @@
+"""
+词云生成基准测试，对比旧流程与新流程生成每个词云的耗时
+
+旧流程：每次调用都 np.array(Image.open(mask)) 解码遮罩，拼接全部文本后 jieba 分词，
+       generate_from_text 再次分词，最后经 plt.imshow + plt.savefig 输出
+新流程：遮罩按路径缓存并二值化，逐条记录分词并缓存，generate_from_frequencies，
+       直接由 WordCloud 画布写出图片
+
+    python benchmarks/bench_wordcloud.py --csv data/douban_top250_movies.csv --repeat 3
+    python benchmarks/bench_wordcloud.py --rows 20000   # 扩充数据量，观察分词缓存的效果
+
+新流程的"首次"包含冷缓存分词，"最快"为缓存命中后的耗时
+"""
+
+import os
+import sys
+import time
+import argparse
+import logging
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import jieba
+import numpy as np
+import pandas as pd
+from PIL import Image
+from wordcloud import WordCloud
+from matplotlib import pyplot as plt
+from config import CSV_PATH, MASK
+from utils.wordcloud_generator import WordCloudGenerator
+
+
+def legacy_wordcloud(df, mask_path, column, font_path, save_path):
+    """旧流程（与改造前的 generate_wordcloud 相同）"""
+    img_array = np.array(Image.open(mask_path))
+    text = " ".join(df[column].dropna().astype(str).tolist())
+    string = " ".join(jieba.cut(text))
+    wc = WordCloud(background_color="white", mask=img_array, font_path=font_path)
+    wc.generate_from_text(string)
+    plt.imshow(wc)
+    plt.axis("off")
+    plt.savefig(save_path)
+    plt.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="词云生成基准测试")
+    parser.add_argument("--csv", type=str, default=CSV_PATH)
+    parser.add_argument("--mask", type=str, default=MASK)
+    parser.add_argument("--font_path", type=str, default=None, help="字体路径，默认使用 WordCloud 自带字体")
+    parser.add_argument("--columns", type=str, nargs="+", default=["title", "comment"])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--rows", type=int, default=0, help="将数据重复扩充到指定行数（0 表示不扩充）"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    plt.switch_backend("Agg")
+    jieba.initialize()
+    df = pd.read_csv(args.csv)
+    if args.rows > len(df):
+        df = pd.concat([df] * (args.rows // len(df) + 1), ignore_index=True).head(args.rows)
+    out_dir = tempfile.mkdtemp(prefix="bench_wordcloud_")
+    n_clouds = len(args.columns)
+
+    legacy_times = []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        for column in args.columns:
+            legacy_wordcloud(
+                df, args.mask, column, args.font_path,
+                os.path.join(out_dir, f"legacy_{column}.png"),
+            )
+        legacy_times.append((time.perf_counter() - start) / n_clouds)
+
+    token_cache = os.path.join(out_dir, "token_cache.json")
+    new_times = []
+    for i in range(args.repeat):
+        generator = WordCloudGenerator(
+            data=df,
+            save_dir=out_dir,
+            font_path=args.font_path,
+            token_cache_path=token_cache,
+        )
+        start = time.perf_counter()
+        generator.generate_wordcloud(mask_path=args.mask, columns=args.columns)
+        new_times.append((time.perf_counter() - start) / n_clouds)
+
+    print(f"每个词云的耗时（秒，{n_clouds} 个词云，重复 {args.repeat} 次）")
+    print(f"{'流程':<16}{'首次':>10}{'最快':>10}{'平均':>10}")
+    for name, times in (("旧流程", legacy_times), ("新流程", new_times)):
+        print(f"{name:<16}{times[0]:>10.3f}{min(times):>10.3f}{sum(times) / len(times):>10.3f}")
+    print(f"图片输出目录: {out_dir}")
+
+
+if __name__ == "__main__":
+    main()
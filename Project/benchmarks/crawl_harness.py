@@ -0,0 +1,110 @@
+"""
+爬虫压测脚本，让 MovieSpider 爬取本地模拟豆瓣服务器（mock_douban.py），统计吞吐量、重试次数与尾延迟
+
+    # 在进程内启动模拟服务器，1000 部电影（40 页），注入 2% 的 500、1% 的 503 与 1% 的超时
+    python benchmarks/crawl_harness.py --movies 1000 --concurrency 8 \
+        --latency lognormal:-3,0.5 --errors 500=0.02 503=0.01 timeout=0.01 --timeout_delay 3 --timeout 1
+    # 爬取已单独启动的模拟服务器
+    python benchmarks/crawl_harness.py --base_url http://127.0.0.1:8765/top250 --pages 10
+    # 爬取 3 轮：第 2 轮起爬虫携带 If-None-Match 发出条件请求，未变化的页面返回 304
+    python benchmarks/crawl_harness.py --pages 10 --rounds 3
+
+输出每秒页数、成功解析的页数与电影数、请求数、重试数、失败页数、状态码分布、
+延迟 p50 / p95 / p99 / 最大值，以及服务器端记录的响应状态
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.dirname(BENCH_DIR))
+sys.path.append(BENCH_DIR)
+
+from load_test import percentile
+from mock_douban import PAGE_SIZE, add_server_arguments, server_from_args
+
+logger = logging.getLogger("crawl_harness")
+logger.setLevel(logging.CRITICAL)
+
+
+def crawl(spider, pages: int, concurrency: int) -> Dict:
+    """并发抓取并解析 pages 页，返回成功的页数与电影数"""
+
+    def run(i: int) -> int:
+        content = spider.fetch_page(f"{spider.url}?start={i * PAGE_SIZE}&filter=")
+        movies = spider.parse_single_page(content, i + 1) if content else None
+        return len(movies or [])
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        counts = list(executor.map(run, range(pages)))
+    return {"pages_ok": sum(1 for c in counts if c), "movies": sum(counts)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="爬虫压测（本地模拟服务器）")
+    parser.add_argument("--base_url", type=str, default=None, help="已启动的模拟服务器地址，不指定时在进程内启动")
+    parser.add_argument("--pages", type=int, default=None, help="爬取的页数，默认为全部页面")
+    parser.add_argument("--rounds", type=int, default=1, help="爬取的轮数，第 2 轮起为条件请求")
+    parser.add_argument("--concurrency", type=int, default=4, help="同时请求的页面数")
+    parser.add_argument("--delay", type=float, default=0.0, help="爬虫每次请求前的固定延时(秒)")
+    parser.add_argument("--timeout", type=float, default=5.0, help="爬虫的请求超时时间(秒)")
+    parser.add_argument("--retries", type=int, default=3, help="爬虫的重试次数")
+    parser.add_argument("--max_retry_after", type=float, default=5.0, help="爬虫遵守 Retry-After 的最长等待时间(秒)")
+    add_server_arguments(parser)
+    args = parser.parse_args()
+
+    from spiders.spider import MovieSpider
+
+    server = None
+    if args.base_url:
+        url = args.base_url
+    else:
+        server = server_from_args(args).start()
+        url = server.url
+    pages = args.pages or -(-args.movies // PAGE_SIZE)
+
+    spider = MovieSpider(
+        url=url,
+        logger=logger,
+        delay_range=(args.delay, args.delay),
+        timeout=args.timeout,
+        max_retry_after=args.max_retry_after,
+    )
+    fetch_page = spider.fetch_page
+    spider.fetch_page = lambda page_url: fetch_page(page_url, retries=args.retries)
+
+    start = time.perf_counter()
+    result = {"pages_ok": 0, "movies": 0}
+    for _ in range(max(1, args.rounds)):
+        for key, value in crawl(spider, pages, args.concurrency).items():
+            result[key] += value
+    elapsed = time.perf_counter() - start
+    pages *= max(1, args.rounds)
+    server_stats = server.stats() if server else None
+    if server:
+        server.stop()
+
+    stats = spider.stats
+    latencies = sorted(stats["latencies"])
+    print(f"目标: {url}，{pages} 页，并发 {args.concurrency}")
+    print(f"耗时 {elapsed:.2f} 秒，{pages / elapsed:.1f} 页/秒")
+    print(f"成功页数 {result['pages_ok']}/{pages}，电影 {result['movies']} 部")
+    print(f"请求 {stats['requests']} 次，重试 {stats['retries']} 次，失败页数 {stats['failures']}")
+    print(f"状态码分布: {json.dumps(dict(stats['status']), ensure_ascii=False)}")
+    print(
+        "延迟(ms): "
+        + "  ".join(f"p{p}={percentile(latencies, p) * 1000:.1f}" for p in (50, 95, 99))
+        + f"  max={(latencies[-1] if latencies else 0) * 1000:.1f}"
+    )
+    if server_stats is not None:
+        print(f"服务器端响应: {json.dumps(server_stats, ensure_ascii=False)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+"""
+豆瓣 Top250 列表页夹具(fixture)，供基准测试与本地模拟服务器使用
+
+    fixtures/top250_start0.html 是按豆瓣列表页结构保存的第一页（25 部电影），
+    更大规模的数据由这 25 部电影按规则变换生成，再用同样的模板渲染成列表页
+
+下面是对各个函数的介绍：
+    render_item(): 将一部电影（MovieSpider 解析结果的格式）渲染为列表页中的 <li> 条目
+    render_list_page(): 渲染一整页列表页（含分页链接）
+    load_fixture_movies(): 用 MovieSpider 解析夹具页面，得到基础电影数据
+    synthesize_movies(): 由基础电影数据生成任意数量的电影
+    render_pages(): 将电影列表按每页 25 部渲染为列表页
+"""
+
+import os
+import sys
+import html
+import zlib
+import random
+from typing import Dict, List, Optional
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+FIXTURE_PAGE = os.path.join(FIXTURE_DIR, "top250_start0.html")
+PAGE_SIZE = 25
+_STAR_CLASSES = {"5": "rating5-t", "4.5": "rating45-t", "4": "rating4-t"}
+
+_PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="zh-CN" class="ua-linux ua-webkit">
+<head>
+    <meta http-equiv="Content-Type" content="text/html; charset=utf-8">
+    <title>
+豆瓣电影 Top 250
+</title>
+</head>
+<body>
+<div id="wrapper">
+    <div id="content">
+        <h1>豆瓣电影 Top 250</h1>
+        <div class="grid-16-8 clearfix">
+            <div class="article">
+                <div class="opt mod">
+                    <div class="fright">
+                        <span class="thispage">{page}</span>
+                    </div>
+                </div>
+<ol class="grid_view">
+{items}
+</ol>
+<div class="paginator">
+{prev}
+        <span class="thispage">{page}</span>
+{next}
+            <span class="count">(共{total}条)</span>
+</div>
+            </div>
+        </div>
+    </div>
+</div>
+</body>
+</html>
+"""
+
+_ITEM_TEMPLATE = """        <li>
+            <div class="item">
+                <div class="pic">
+                    <em class="">{rank}</em>
+                    <a href="{url}">
+                        <img width="100" alt="{title}" src="{poster}" class="">
+                    </a>
+                </div>
+                <div class="info">
+                    <div class="hd">
+                        <a href="{url}" class="">
+                            <span class="title">{title}</span>
+                        </a>
+                            <span class="playable">[可播放]</span>
+                    </div>
+                    <div class="bd">
+                        <p class="">
+                            导演: {director}&nbsp;&nbsp;&nbsp;{actors}<br>
+                            {year}&nbsp;/&nbsp;{country}&nbsp;/&nbsp;{classification}
+                        </p>
+                        <div class="star">
+                                <span class="{star_class}"></span>
+                                <span class="rating_num" property="v:average">{rating}</span>
+                                <span property="v:best" content="10.0"></span>
+                                <span>{comment_nums}人评价</span>
+                        </div>
+{quote}
+                    </div>
+                </div>
+            </div>
+        </li>"""
+
+_QUOTE_TEMPLATE = """                            <p class="quote">
+                                <span>{comment}</span>
+                            </p>"""
+
+
+def poster_url(url: str, base: str = "https://img2.doubanio.com/view/photo/s_ratio_poster/public") -> str:
+    """由详情页链接生成固定的海报链接"""
+    return f"{base}/p{zlib.crc32(url.encode('utf-8')) % 10**9}.webp"
+
+
+def render_item(movie: Dict) -> str:
+    """将一部电影渲染为列表页中的 <li> 条目"""
+    esc = lambda value: html.escape(str(value), quote=True)
+    actors = movie.get("actors")
+    comment = movie.get("comment")
+    url = movie.get("url") or f"https://movie.douban.com/subject/{1000000 + int(movie['rank'])}/"
+    return _ITEM_TEMPLATE.format(
+        rank=esc(movie["rank"]),
+        url=esc(url),
+        poster=esc(movie.get("poster") or poster_url(url)),
+        title=esc(movie["title"]),
+        director=esc(movie["director"]),
+        actors=f"主演: {esc(actors)}..." if actors and actors != "unshown" else "",
+        year=esc(movie["year"]),
+        country=esc(movie["country"]),
+        classification=esc(movie["classification"]),
+        star_class=_STAR_CLASSES.get(str(movie["star-rating"]), "rating45-t"),
+        rating=esc(movie["nums-rating"]),
+        comment_nums=esc(movie["comment_nums"]),
+        quote=_QUOTE_TEMPLATE.format(comment=esc(comment)) if comment else "",
+    )
+
+
+def render_list_page(movies: List[Dict], start: int, total: int) -> str:
+    """
+    渲染一整页列表页
+
+    Args:
+        movies: 本页的电影
+        start: 本页第一部电影的偏移量（对应 ?start=）
+        total: 榜单电影总数，用于生成分页链接
+    """
+    page = start // PAGE_SIZE + 1
+    prev = (
+        f'        <span class="prev"><a href="?start={start - PAGE_SIZE}&amp;filter=">&lt;前页</a></span>'
+        if start > 0
+        else '        <span class="prev">&lt;前页</span>'
+    )
+    nxt = (
+        f'        <span class="next"><link rel="next" href="?start={start + PAGE_SIZE}&amp;filter="/>'
+        f'<a href="?start={start + PAGE_SIZE}&amp;filter=">后页&gt;</a></span>'
+        if start + PAGE_SIZE < total
+        else '        <span class="next">后页&gt;</span>'
+    )
+    items = "\n".join(render_item(movie) for movie in movies)
+    return _PAGE_TEMPLATE.format(page=page, items=items, prev=prev, next=nxt, total=total)
+
+
+def load_fixture_movies(path: str = FIXTURE_PAGE) -> List[Dict]:
+    """用 MovieSpider 解析夹具页面，得到基础电影数据"""
+    import logging
+    from spiders.spider import MovieSpider
+
+    with open(path, "r", encoding="utf-8") as f:
+        content = f.read()
+    spider = MovieSpider(logger=logging.getLogger(__name__))
+    return spider.parse_single_page(content, 1)
+
+
+def synthesize_movies(n: int, base: Optional[List[Dict]] = None, seed: int = 0) -> List[Dict]:
+    """
+    由基础电影数据生成 n 部电影
+
+    第 k 轮复制时标题追加编号、电影编号与排名顺延，年份、评分和评价人数随机扰动，
+    使分布和重复度接近真实数据，结果可复现
+    """
+    base = base or load_fixture_movies()
+    rng = random.Random(seed)
+    movies = []
+    for i in range(n):
+        movie = dict(base[i % len(base)])
+        k = i // len(base)
+        movie["rank"] = str(i + 1)
+        movie["id"] = str(30000000 + i)
+        movie["url"] = f"https://movie.douban.com/subject/{movie['id']}/"
+        if k:
+            movie["title"] = f"{movie['title']}{k}"
+            movie["year"] = str(int(movie["year"]) + rng.randint(-15, 15))
+            rating = min(9.9, max(7.0, float(movie["nums-rating"]) + rng.uniform(-1.5, 0.3)))
+            movie["nums-rating"] = f"{rating:.1f}"
+            movie["star-rating"] = "5" if rating >= 9.5 else ("4.5" if rating >= 8.5 else "4")
+            movie["comment_nums"] = str(int(int(movie["comment_nums"]) * rng.uniform(0.05, 1.2)))
+        movies.append(movie)
+    return movies
+
+
+def render_pages(movies: List[Dict]) -> List[str]:
+    """将电影列表按每页 25 部渲染为列表页"""
+    return [
+        render_list_page(movies[start : start + PAGE_SIZE], start, len(movies))
+        for start in range(0, len(movies), PAGE_SIZE)
+    ]
@@ -0,0 +1,91 @@
+"""
+Web 应用压测脚本，对本地运行的实例发起并发请求，统计吞吐量与延迟
+
+    # 先启动服务
+    python app.py serve
+    # 再运行压测
+    python benchmarks/load_test.py --paths /movie /score --concurrency 16 --duration 10
+
+输出每个路径的 req/s、p50、p99 延迟和错误数
+"""
+
+import argparse
+import threading
+import time
+import requests
+from typing import Dict, List
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """计算已排序数据的百分位数（最近秩法）"""
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def run_path(base_url: str, path: str, concurrency: int, duration: float) -> Dict:
+    """在 duration 秒内以 concurrency 个线程持续请求同一个路径"""
+    latencies: List[float] = []
+    errors = [0]
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+    url = base_url.rstrip("/") + path
+
+    def worker():
+        session = requests.Session()
+        local_latencies = []
+        local_errors = 0
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                response = session.get(url, timeout=30)
+                ok = response.status_code == 200
+            except requests.exceptions.RequestException:
+                ok = False
+            elapsed = time.perf_counter() - start
+            if ok:
+                local_latencies.append(elapsed)
+            else:
+                local_errors += 1
+        with lock:
+            latencies.extend(local_latencies)
+            errors[0] += local_errors
+
+    # 预热一次，避免把首个请求的加载时间计入统计
+    requests.get(url, timeout=30)
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "path": path,
+        "requests": len(latencies),
+        "errors": errors[0],
+        "req_per_sec": len(latencies) / wall if wall else 0.0,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="豆瓣Top250 Web 应用压测")
+    parser.add_argument("--base_url", type=str, default="http://127.0.0.1:5000")
+    parser.add_argument("--paths", type=str, nargs="+", default=["/movie", "/score"])
+    parser.add_argument("--concurrency", type=int, default=8, help="并发线程数")
+    parser.add_argument("--duration", type=float, default=10.0, help="每个路径的压测时长(秒)")
+    args = parser.parse_args()
+
+    print(f"{'path':<12}{'requests':>10}{'errors':>8}{'req/s':>10}{'p50(ms)':>10}{'p99(ms)':>10}")
+    for path in args.paths:
+        result = run_path(args.base_url, path, args.concurrency, args.duration)
+        print(
+            f"{result['path']:<12}{result['requests']:>10}{result['errors']:>8}"
+            f"{result['req_per_sec']:>10.1f}{result['p50_ms']:>10.2f}{result['p99_ms']:>10.2f}"
+        )
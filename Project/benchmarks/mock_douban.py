@@ -0,0 +1,329 @@
+"""
+本地模拟豆瓣服务器，用于对爬虫做压测和故障注入，不访问真实网站
+
+    python benchmarks/mock_douban.py --port 8765 --movies 250 \
+        --latency lognormal:-3,0.5 --errors 403=0.01 500=0.02 timeout=0.01 --rate_limit 20
+
+页面：
+    /top250?start=N&filter=   按豆瓣列表页结构渲染的第 N 部起的 25 部电影（数据由夹具合成）
+    /poster/pN.webp           海报图片（按编号生成的纯色 JPEG，只有少数几种颜色，用于测试按内容去重），带 ETag
+    /__stats                  请求统计（JSON）
+
+可配置项：
+    延迟分布: fixed:秒 / uniform:最小,最大 / exp:均值 / lognormal:mu,sigma
+    错误率: 403 / 418 / 429 / 5xx 等状态码以及 timeout（长时间不响应）按概率注入
+    Retry-After: 429 与 503 响应携带的等待时间
+    ETag / 304: 每个页面带 ETag，请求携带相同的 If-None-Match 时返回 304
+    限流: 按客户端 IP 的令牌桶，超过速率时返回 429
+
+下面是对各个类和函数的介绍：
+    parse_latency(): 解析延迟分布参数，返回采样函数
+    MockDoubanServer: 在后台线程中运行的模拟服务器
+        start() / stop(): 启动与停止
+        url: 榜单首页链接，可直接作为 MovieSpider 的 url 参数
+        stats(): 请求统计
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import hashlib
+import argparse
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Optional
+from urllib.parse import parse_qs, urlparse
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from douban_fixtures import PAGE_SIZE, poster_url, render_list_page, synthesize_movies
+
+
+def parse_latency(spec: str) -> Callable[[random.Random], float]:
+    """
+    解析延迟分布参数
+
+    Args:
+        spec: fixed:0.05 / uniform:0.01,0.2 / exp:0.05 / lognormal:-3,0.5
+    """
+    kind, _, params = spec.partition(":")
+    values = [float(v) for v in params.split(",") if v]
+    if kind == "fixed":
+        return lambda rng: values[0]
+    if kind == "uniform":
+        return lambda rng: rng.uniform(values[0], values[1])
+    if kind == "exp":
+        return lambda rng: rng.expovariate(1.0 / values[0])
+    if kind == "lognormal":
+        return lambda rng: rng.lognormvariate(values[0], values[1])
+    raise ValueError(f"未知的延迟分布: {spec}")
+
+
+class _TokenBucket:
+    """令牌桶：每秒补充 rate 个令牌，最多积累 burst 个"""
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def take(self) -> float:
+        """取一个令牌，成功返回 0，否则返回需要等待的秒数"""
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+class MockDoubanServer:
+    """
+    在后台线程中运行的模拟豆瓣服务器
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        movies: int = 250,
+        latency: str = "fixed:0",
+        errors: Optional[Dict[str, float]] = None,
+        retry_after: float = 1.0,
+        timeout_delay: float = 30.0,
+        rate_limit: float = 0.0,
+        burst: float = 5.0,
+        seed: int = 0,
+    ):
+        """
+        Args:
+            host / port: 监听地址，port 为 0 时自动分配
+            movies: 榜单中的电影数
+            latency: 延迟分布
+            errors: 状态码(或 "timeout") -> 注入概率
+            retry_after: 429 / 503 响应中 Retry-After 的秒数
+            timeout_delay: 注入 timeout 时不响应的秒数
+            rate_limit: 每个客户端每秒最多请求数，为 0 时不限流
+            burst: 限流令牌桶的容量
+            seed: 随机数种子
+        """
+        self.movies = synthesize_movies(movies)
+        self.latency = parse_latency(latency)
+        self.errors = errors or {}
+        self.retry_after = retry_after
+        self.timeout_delay = timeout_delay
+        self.rate_limit = rate_limit
+        self.burst = burst
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self._buckets: Dict[str, _TokenBucket] = {}
+        self._pages: Dict[int, tuple] = {}  # start -> (页面字节, ETag)
+        self._counts = Counter()
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self._httpd.daemon_threads = True
+        self._posters: Dict[str, tuple] = {}  # 文件名 -> (图片字节, ETag)
+        base = f"http://{self._httpd.server_address[0]}:{self._httpd.server_address[1]}/poster"
+        for movie in self.movies:
+            movie["poster"] = poster_url(movie["url"], base)
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/top250"
+
+    def _page(self, start: int) -> tuple:
+        """渲染并缓存列表页"""
+        with self._lock:
+            page = self._pages.get(start)
+        if page is None:
+            body = render_list_page(
+                self.movies[start : start + PAGE_SIZE], start, len(self.movies)
+            ).encode("utf-8")
+            page = (body, '"%s"' % hashlib.md5(body).hexdigest())
+            with self._lock:
+                self._pages[start] = page
+        return page
+
+    def _poster(self, name: str) -> tuple:
+        """生成并缓存海报图片"""
+        with self._lock:
+            poster = self._posters.get(name)
+        if poster is None:
+            import io
+            from PIL import Image
+
+            shade = 40 + (sum(map(ord, name)) % 8) * 25
+            buffer = io.BytesIO()
+            Image.new("RGB", (270, 400), (shade, 120, 255 - shade)).save(buffer, format="JPEG")
+            body = buffer.getvalue()
+            poster = (body, '"%s"' % hashlib.md5(body).hexdigest())
+            with self._lock:
+                self._posters[name] = poster
+        return poster
+
+    def _draw(self) -> tuple:
+        """抽取本次请求的延迟和要注入的错误"""
+        with self._rng_lock:
+            delay = max(0.0, self.latency(self._rng))
+            roll = self._rng.random()
+        cumulative = 0.0
+        for error, probability in self.errors.items():
+            cumulative += probability
+            if roll < cumulative:
+                return delay, error
+        return delay, None
+
+    def _throttle(self, client: str) -> float:
+        if self.rate_limit <= 0:
+            return 0.0
+        with self._lock:
+            bucket = self._buckets.setdefault(client, _TokenBucket(self.rate_limit, self.burst))
+            return bucket.take()
+
+    def _count(self, key) -> None:
+        with self._lock:
+            self._counts[str(key)] += 1
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._counts)
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send(self, status: int, body: bytes = b"", headers: Optional[Dict] = None):
+                server._count(status)
+                self.send_response(status)
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if body:
+                    self.wfile.write(body)
+
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                if parsed.path == "/__stats":
+                    self._send(200, json.dumps(server.stats()).encode(), {"Content-Type": "application/json"})
+                    return
+                is_poster = parsed.path.startswith("/poster/")
+                if parsed.path.rstrip("/") != "/top250" and not is_poster:
+                    self._send(404)
+                    return
+
+                wait = server._throttle(self.client_address[0])
+                if wait > 0:
+                    self._send(429, headers={"Retry-After": f"{max(wait, server.retry_after):.0f}"})
+                    return
+                if is_poster:
+                    body, etag = server._poster(parsed.path[len("/poster/"):])
+                    if self.headers.get("If-None-Match") == etag:
+                        self._send(304, headers={"ETag": etag})
+                        return
+                    self._send(200, body, {"Content-Type": "image/jpeg", "ETag": etag})
+                    return
+
+                delay, error = server._draw()
+                time.sleep(delay)
+                if error == "timeout":
+                    server._count("timeout")
+                    time.sleep(server.timeout_delay)
+                    self.close_connection = True
+                    return
+                if error is not None:
+                    status = int(error)
+                    headers = {"Retry-After": f"{server.retry_after:.0f}"} if status in (429, 503) else {}
+                    self._send(status, b"error", headers)
+                    return
+
+                try:
+                    start = int(parse_qs(parsed.query).get("start", ["0"])[0])
+                except ValueError:
+                    start = 0
+                if start < 0 or start >= len(server.movies):
+                    self._send(404)
+                    return
+                body, etag = server._page(start)
+                if self.headers.get("If-None-Match") == etag:
+                    self._send(304, headers={"ETag": etag})
+                    return
+                self._send(200, body, {"Content-Type": "text/html; charset=utf-8", "ETag": etag})
+
+        return Handler
+
+    def start(self) -> "MockDoubanServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+def parse_errors(items) -> Dict[str, float]:
+    """解析 403=0.01 timeout=0.02 形式的错误率参数"""
+    errors = {}
+    for item in items or []:
+        key, _, value = item.partition("=")
+        errors[key] = float(value)
+    return errors
+
+
+def add_server_arguments(parser: argparse.ArgumentParser) -> None:
+    """模拟服务器的命令行参数（压测脚本复用）"""
+    parser.add_argument("--movies", type=int, default=250, help="榜单中的电影数")
+    parser.add_argument("--latency", type=str, default="fixed:0", help="延迟分布，如 uniform:0.01,0.2")
+    parser.add_argument("--errors", type=str, nargs="*", default=[], help="错误率，如 403=0.01 500=0.02 timeout=0.01")
+    parser.add_argument("--retry_after", type=float, default=1.0, help="429/503 响应的 Retry-After 秒数")
+    parser.add_argument("--timeout_delay", type=float, default=30.0, help="注入超时时不响应的秒数")
+    parser.add_argument("--rate_limit", type=float, default=0.0, help="每个客户端每秒最多请求数，0 表示不限流")
+    parser.add_argument("--burst", type=float, default=5.0, help="限流令牌桶容量")
+    parser.add_argument("--seed", type=int, default=0)
+
+
+def server_from_args(args, host: str = "127.0.0.1", port: int = 0) -> MockDoubanServer:
+    return MockDoubanServer(
+        host=host,
+        port=port,
+        movies=args.movies,
+        latency=args.latency,
+        errors=parse_errors(args.errors),
+        retry_after=args.retry_after,
+        timeout_delay=args.timeout_delay,
+        rate_limit=args.rate_limit,
+        burst=args.burst,
+        seed=args.seed,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="本地模拟豆瓣服务器")
+    parser.add_argument("--host", type=str, default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    add_server_arguments(parser)
+    args = parser.parse_args()
+
+    server = server_from_args(args, args.host, args.port).start()
+    print(f"模拟服务器已启动: {server.url}（Ctrl+C 退出）")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -4,8 +4,14 @@ import logging
 
 # 豆瓣网址
 BASE_URL = "https://movie.douban.com/top250"
+# 短评页链接模板
+REVIEW_URL = "https://movie.douban.com/subject/{subject_id}/comments?start={start}&limit=20&status=P&sort=new_score"
+REVIEW_RATE_LIMIT = 0.5  # 短评爬取的全局请求速率(次/秒)
+POSTER_RATE_LIMIT = 2.0  # 海报下载的全局请求速率(次/秒)
 # 日志文件路径
 LOG_PATH = "logs/spider.log"  # 日志文件路径
+LOG_MAX_BYTES = 10 * 1024 * 1024  # 按大小轮转时单个日志文件的上限(字节)
+LOG_BACKUP_COUNT = 5  # 保留的旧日志文件数
 
 # 数据保存文件路径
 BASE_DATA_DIR = "data"
@@ -14,7 +20,27 @@ JSON_PATH = os.path.join(BASE_DATA_DIR, "douban_top250_movies.json")  # 用于
 EXCEL_PATH = os.path.join(
     BASE_DATA_DIR, "douban_top250_movies.xlsx"
 )  # 用于保存Excel文件
+COLUMNAR_PATH = os.path.join(
+    BASE_DATA_DIR, "douban_top250_movies.col"
+)  # 供 Web 工作进程共享映射的列式数据文件
+SEARCH_INDEX_PATH = os.path.join(
+    BASE_DATA_DIR, "search_index.json.gz"
+)  # 全文检索倒排索引
+RELEASE_DIR = os.path.join(BASE_DATA_DIR, "releases")  # Web 应用读取的数据版本(CSV/列式数据/检索索引)与 CURRENT 指针
+RELEASE_KEEP = 3  # 保留的数据版本数
 STOPWORDS_PATH = os.path.join(BASE_DATA_DIR, "stopwords.txt")  # 停用词文件路径
+TOKEN_CACHE_PATH = os.path.join(BASE_DATA_DIR, "token_cache.json")  # 词云分词缓存
+JIEBA_CACHE_PATH = os.path.join(BASE_DATA_DIR, "jieba.cache")  # jieba 词典缓存
+WORD_FREQ_DIR = os.path.join(BASE_DATA_DIR, "word_freq")  # 大规模文本的增量词频统计结果
+REVIEWS_DIR = os.path.join(BASE_DATA_DIR, "reviews")  # 按电影分片的短评文件
+PAGE_ARCHIVE_DIR = os.path.join(BASE_DATA_DIR, "page_archive")  # 原始列表页的压缩归档
+QUARANTINE_PATH = os.path.join(BASE_DATA_DIR, "quarantine.jsonl")  # 未通过校验的记录及原因
+HISTORY_DIR = os.path.join(BASE_DATA_DIR, "history")  # 每次爬取的排名/评分历史(增量编码)
+POSTER_DIR = os.path.join(BASE_DATA_DIR, "posters")  # 海报原图(按内容哈希去重)与下载清单
+METRICS_REPORT_PATH = os.path.join(BASE_DATA_DIR, "run_report.json")  # 每次运行的指标报告
+PROFILE_DIR = os.path.join(BASE_DATA_DIR, "profiles")  # 性能剖析结果(.prof 与汇总)
+SCHEDULE_LOCK_PATH = os.path.join(BASE_DATA_DIR, "crawl.lock")  # 定时运行的进程间锁文件
+SCHEDULE_REPORT_PATH = os.path.join(BASE_DATA_DIR, "scheduled_run_report.json")  # Web 服务内定时运行的报告
 
 # 图片保存目录
 BASE_STATIC_DIR = "static/visualization"
@@ -25,12 +51,32 @@ BASE_MASK_DIR = os.path.join(BASE_STATIC_DIR, "masks")
 MASK = os.path.join(BASE_MASK_DIR, "example.png")
 GENERATE_WORDCLOUD_DIR = []
 
+# 海报缩略图（文件名包含原图内容哈希，Web 应用以 immutable 长期缓存）
+POSTER_STATIC_DIR = os.path.join("static", "posters")
+POSTER_SIZES = [60, 120, 240]  # 缩略图宽度(像素)
+POSTER_FORMATS = ["webp", "jpeg"]  # 缩略图格式，浏览器不支持 WebP 时使用 JPEG
+
 # 检查有无遮罩图片
 if not MASK:
     logging.warning("警告信息：无遮罩图片")
 
+# Web 服务相关配置
+SERVE_HOST = "127.0.0.1"  # 生产模式监听地址
+SERVE_PORT = 5000  # 生产模式监听端口
+SERVE_WORKERS = max(2, min(8, (os.cpu_count() or 1)))  # 工作进程数
+SERVE_THREADS = 4  # 每个工作进程的线程数
+DATA_RELOAD_INTERVAL = 5.0  # 检查数据文件是否更新的最小间隔(秒)
+CHART_CACHE_MAX_BYTES = 64 * 1024 * 1024  # 按需绘制图表的缓存容量(字节)
+CHART_RENDER_DPI = 100  # 按需绘制图表的分辨率
+PROFILE_REQUEST_RATE = 0.0  # 抽样剖析的 Web 请求比例，0 表示不剖析
+
+# 定时爬取相关配置
+SCHEDULE_INTERVAL = 24 * 3600  # 建议的定时运行间隔(秒)
+SCHEDULE_JITTER = 600  # 定时运行间隔的随机抖动幅度(秒)
+
 # 爬取电影信息
 MOVIE_INFO = {
+    "id": None,  # 豆瓣电影编号（取自详情页链接，作为主键）
     "rank": None,  # 排名
     "title": None,  # 电影名
     "director": None,  # 导演
@@ -42,6 +88,35 @@ MOVIE_INFO = {
     "nums-rating": None,  # 数字评分
     "comment_nums": None,  # 评论数
     "comment": None,  # 短评
+    "url": None,  # 详情页链接
+    "poster": None,  # 海报图片链接
+}
+
+# MOVIE_INFO 各字段的校验规则（utils.validation），清洗时对整批数据按列校验：
+#   type: 转换后的类型 int / float / str
+#   required: 必填字段校验失败时整条记录移入隔离文件；选填字段校验失败时只将该字段置空
+#   pattern: 值必须匹配的正则，取第一个分组作为该字段的值（如从 "1961(中国大陆)" 中取出年份）
+#   min / max: 数值范围；choices: 可选值
+MOVIE_SCHEMA = {
+    "id": {"type": "str", "required": False, "pattern": r"^(\d+)$"},
+    "rank": {"type": "int", "required": True, "min": 1},
+    "title": {"type": "str", "required": True},
+    "director": {"type": "str", "required": False},
+    "actors": {"type": "str", "required": False},
+    "year": {"type": "int", "required": False, "pattern": r"(\d{4})", "min": 1888, "max": 2100},
+    "country": {"type": "str", "required": False},
+    "classification": {"type": "str", "required": False},
+    "star-rating": {
+        "type": "str",
+        "required": False,
+        "pattern": r"^(\d(?:\.5)?)",
+        "choices": ["3", "3.5", "4", "4.5", "5"],
+    },
+    "nums-rating": {"type": "float", "required": True, "min": 0, "max": 10},
+    "comment_nums": {"type": "int", "required": False, "min": 0},
+    "comment": {"type": "str", "required": False},
+    "url": {"type": "str", "required": False, "pattern": r"^(https?://\S+)$"},
+    "poster": {"type": "str", "required": False, "pattern": r"^(https?://\S+)$"},
 }
 
 # 确保目录存在
@@ -1,77 +1,496 @@
 """
 主程序模块，用于协调整个豆瓣电影Top250爬虫项目的运行
 
+各阶段（爬取、保存、列式数据、检索索引、发布、短评、海报、图表、排名历史、词云、词频）由 utils.pipeline 按依赖关系调度：
+互不依赖的阶段并发执行，输出文件比输入文件新的阶段会被跳过，--stages 可以只运行其中几个阶段
+
+CSV、列式数据与检索索引生成之后，由发布阶段（utils.release）作为一个数据版本整体切换，
+Web 应用不会读到新旧混合的数据
+
+各阶段的依赖（pandas、matplotlib、jieba、wordcloud 等）只在该阶段执行时才导入，
+只爬取或只保存数据时不会加载绘图与分词相关的库；使用 --timing 输出各阶段
+导入 / 初始化 / 执行 的耗时；使用 --profile 用 cProfile 与 tracemalloc 剖析每个阶段
+
+每次运行结束时，各阶段的状态、耗时与运行指标（请求延迟、下载字节数、解析耗时、重试次数、
+图表缓存命中等，见 utils.metrics）写入 JSON 运行报告（--metrics_report）
+
+使用 --schedule_interval 进入定时模式（utils.scheduler），按间隔加随机抖动周期性运行，
+同一时刻只允许一次运行；新的数据版本发布后，正在运行的 Web 应用会在后台切换到新数据
 """
 
+import os
+import sys
+import glob
 import time
+import logging
+from datetime import datetime
+
+_module_start = time.perf_counter()
+
 import argparse
-from spiders.spider import MovieSpider
-from utils.data_save import DataSaver
-from utils.data_visualization import DataVisualizer
-from utils.data_clean import DataCleaner
-from utils.wordcloud_generator import WordCloudGenerator
 from utils.log import clear_log_file, setup_logging
-from config import CSV_PATH, EXCEL_PATH, JSON_PATH, IMAGE_SAVE_DIR, MASK
-import config
-from typing import List
+from utils.timing import StageTimer
+from utils.pipeline import DONE, SKIPPED, Pipeline, PipelineContext, Stage
+from config import CSV_PATH, EXCEL_PATH, JSON_PATH, COLUMNAR_PATH, IMAGE_SAVE_DIR, MASK
+from config import SEARCH_INDEX_PATH, WORD_FREQ_DIR, REVIEWS_DIR, REVIEW_RATE_LIMIT, RELEASE_DIR, RELEASE_KEEP
+from config import METRICS_REPORT_PATH, PROFILE_DIR, PAGE_ARCHIVE_DIR, HISTORY_DIR, QUARANTINE_PATH
+from config import SCHEDULE_INTERVAL, SCHEDULE_JITTER, SCHEDULE_LOCK_PATH
+from config import POSTER_DIR, POSTER_STATIC_DIR, POSTER_SIZES, POSTER_FORMATS, POSTER_RATE_LIMIT
+from typing import List, Tuple
 
-start_time = time.time()
+_startup_seconds = time.perf_counter() - _module_start
 
 
-def main(args):
-    """主函数，协调各个模块的运行"""
+def build_pipeline(args, logger, timer: StageTimer, profiler=None) -> Pipeline:
+    """
+    声明各阶段及其依赖、输入与输出文件
 
-    # 是否删除先前的日志文件
-    if args.if_reset_log:
-        clear_log_file()
+    除爬取外，各阶段只依赖电影数据：爬取阶段本次运行过时使用内存中的数据，
+    否则从 CSV 文件加载，因此可以用 --stages 单独运行其中的任意几个阶段
+    """
+    # 各模块使用以模块名命名的日志记录器，可以通过 --log_levels 单独设置级别
+    log = logging.getLogger
 
-    # 设置日志
-    logger = setup_logging()
+    def load_movies():
+        import pandas as pd
+        from utils.data_clean import DataCleaner
 
-    # 创建爬虫实例
-    spider = MovieSpider(logger=logger, if_print=args.if_print)
+        logger.info(f"使用已有的数据文件 {args.csv_save_path}")
+        return DataCleaner(logger=log("utils.data_clean")).clean_data(pd.read_csv(args.csv_save_path, dtype={"id": str}))
 
-    # 1. 爬取数据
-    movies = spider.parse_all_pages()
+    def movies(ctx: PipelineContext):
+        return ctx.get_or_load("df_movies", load_movies)
 
-    if not movies:  # 检测是否爬取到数据
-        logger.warning("未爬取到数据，程序结束。")
-        return
+    # 1. 爬取数据并清洗（--reparse 时不访问网络，从页面归档重新解析）
+    def crawl(ctx: PipelineContext):
+        with timer.measure("crawl", "import"):
+            from spiders.spider import MovieSpider
+            from utils.data_clean import DataCleaner
+            from utils.page_archive import PageArchive
+        with timer.measure("crawl", "init"):
+            archive = None
+            if args.reparse or args.if_archive_pages:
+                archive = PageArchive(args.archive_dir, logger=log("utils.page_archive"))
+            if not args.reparse:
+                spider = MovieSpider(
+                    logger=log("spiders.spider"), if_print=args.if_print, archive=archive
+                )
+        with timer.measure("crawl"):
+            if args.reparse:
+                from spiders.reparse import reparse_archive
 
-    # 2. 数据清洗
-    data_cleaner = DataCleaner(logger=logger)
-    df_movies = data_cleaner.clean_data(movies)
+                records = reparse_archive(
+                    archive, run_id=args.reparse_run, logger=log("spiders.reparse")
+                )
+            else:
+                records = spider.parse_all_pages()
+            if not records:  # 检测是否爬取到数据
+                raise RuntimeError("未爬取到数据")
+            cleaner = DataCleaner(logger=log("utils.data_clean"), quarantine_path=args.quarantine_path)
+            df_movies = cleaner.clean_data(records)
+            if df_movies.empty:  # 不发布空数据，保留上一次的数据文件
+                raise RuntimeError("所有记录都未通过校验")
+            ctx.set("df_movies", df_movies)
+            ctx.set("crawled_at", datetime.now())
 
-    # 3. 数据保存
-    data_saver = DataSaver(logger=logger)
+    # 2. 数据保存
+    save_outputs = []
     if args.if_save_to_csv:
-        data_saver.save_to_csv(save_path=args.csv_save_path, movies=df_movies)
+        save_outputs.append(args.csv_save_path)
     if args.if_save_to_excel:
-        data_saver.save_to_excel(save_path=args.excel_save_path, movies=df_movies)
+        save_outputs.append(args.excel_save_path)
     if args.if_save_to_json:
-        data_saver.save_to_json(save_path=args.json_save_path, movies=df_movies)
+        save_outputs.append(args.json_save_path)
+
+    def save(ctx: PipelineContext):
+        with timer.measure("save", "import"):
+            from utils.data_save import DataSaver
+        df_movies = movies(ctx)
+        with timer.measure("save"):
+            data_saver = DataSaver(logger=log("utils.data_save"))
+            if args.if_save_to_csv:
+                data_saver.save_to_csv(save_path=args.csv_save_path, movies=df_movies)
+            if args.if_save_to_excel:
+                data_saver.save_to_excel(save_path=args.excel_save_path, movies=df_movies)
+            if args.if_save_to_json:
+                data_saver.save_to_json(save_path=args.json_save_path, movies=df_movies)
+
+    # 2.1 发布列式数据文件，Web 工作进程通过内存映射共享读取
+    def columnar(ctx: PipelineContext):
+        with timer.measure("columnar", "import"):
+            from utils.columnar_store import ColumnarStore
+        df_movies = movies(ctx)
+        with timer.measure("columnar"):
+            store = ColumnarStore(args.columnar_save_path, logger=log("utils.columnar_store"))
+            if not store.publish(df_movies):
+                raise RuntimeError(f"列式数据发布失败: {args.columnar_save_path}")
+
+    # 2.2 建立全文检索倒排索引，Web 应用启动时直接加载
+    def search_index(ctx: PipelineContext):
+        with timer.measure("search_index", "import"):
+            from utils.search_index import SearchIndex
+            from utils.jieba_cache import init_jieba
+        with timer.measure("search_index", "init"):
+            init_jieba(logger)
+        df_movies = movies(ctx)
+        with timer.measure("search_index"):
+            SearchIndex().build(df_movies).save(args.search_index_path)
+        logger.info(f"检索索引已保存至 {args.search_index_path}")
+
+    # 2.3 把 CSV、列式数据与检索索引作为一个数据版本发布，Web 应用整体切换
+    def release(ctx: PipelineContext):
+        with timer.measure("release", "import"):
+            from utils.release import ReleaseStore
+        with timer.measure("release"):
+            ReleaseStore(
+                args.release_dir, keep=RELEASE_KEEP, logger=log("utils.release")
+            ).publish(
+                {
+                    "csv": args.csv_save_path if args.if_save_to_csv else None,
+                    "columnar": args.columnar_save_path if args.if_publish_columnar else None,
+                    "search_index": args.search_index_path if args.if_build_search_index else None,
+                }
+            )
+
+    # 3. 短评爬取（逐页追加写入按电影分片的 .jsonl.gz，支持断点续爬）
+    def reviews(ctx: PipelineContext):
+        with timer.measure("reviews", "import"):
+            from spiders.review_spider import ReviewSpider
+        with timer.measure("reviews", "init"):
+            review_spider = ReviewSpider(
+                logger=log("spiders.review_spider"),
+                reviews_dir=args.reviews_dir,
+                max_reviews_per_movie=args.reviews_per_movie,
+                rate=args.reviews_rate,
+            )
+        df_movies = movies(ctx)
+        with timer.measure("reviews"):
+            review_spider.crawl(df_movies["id"].dropna())
+
+    # 3.1 海报下载（按链接与 ETag 增量下载、按内容去重）与缩略图
+    def posters(ctx: PipelineContext):
+        with timer.measure("posters", "import"):
+            from spiders.poster_spider import PosterSpider
+            from utils.poster_store import PosterStore
+        with timer.measure("posters", "init"):
+            store = PosterStore(
+                args.posters_dir,
+                args.posters_static_dir,
+                sizes=args.poster_sizes,
+                formats=POSTER_FORMATS,
+                logger=log("utils.poster_store"),
+            )
+            poster_spider = PosterSpider(
+                store,
+                logger=log("spiders.poster_spider"),
+                rate=args.posters_rate,
+                revalidate=args.posters_revalidate,
+            )
+        df_movies = movies(ctx)
+        with timer.measure("posters"):
+            if args.reparse:
+                logger.info("重新解析模式下不下载海报，只为已下载的海报生成缩略图")
+            elif "poster" not in df_movies.columns or df_movies["poster"].isna().all():
+                logger.warning("数据中没有海报链接，请重新爬取")
+            else:
+                poster_spider.crawl(df_movies)
+            store.build_thumbnails(poster_spider.manifest)
+            # 缩略图生成之后再保存清单，Web 应用不会引用尚未生成的缩略图
+            store.save_manifest(poster_spider.manifest)
 
     # 4. 数据可视化
-    if args.if_data_visualization:
-        visualizer = DataVisualizer(logger=spider.logger, save_dir=args.image_save_dir)
-        visualizer.generate_all_charts(df_movies, show=args.show_charts)
+    def charts(ctx: PipelineContext):
+        with timer.measure("charts", "import"):
+            from utils.data_visualization import DataVisualizer
+        with timer.measure("charts", "init"):
+            visualizer = DataVisualizer(
+                logger=log("utils.data_visualization"),
+                save_dir=args.image_save_dir,
+                dpi=args.chart_dpi,
+                image_format=args.chart_format,
+                use_cache=args.chart_cache,
+            )
+        df_movies = movies(ctx)
+        with timer.measure("charts"):
+            visualizer.generate_all_charts(
+                df_movies, show=False, parallel=args.chart_parallel
+            )
+            # 所有图表的指纹都未变化时不会重写清单，更新其修改时间，表示图表已对照当前数据检查过
+            if os.path.exists(visualizer.manifest_path):
+                os.utime(visualizer.manifest_path)
+
+    # 4.1 排名历史（本次运行爬取过时追加一次记录）与趋势图
+    def history(ctx: PipelineContext):
+        with timer.measure("history", "import"):
+            from utils.history_store import HistoryStore
+            from utils.data_visualization import DataVisualizer
+        store = HistoryStore(args.history_dir, logger=log("utils.history_store"))
+        with timer.measure("history"):
+            crawled_at = ctx.get("crawled_at")
+            if crawled_at is not None and not args.reparse:
+                store.append(movies(ctx), timestamp=crawled_at)
+            DataVisualizer(
+                logger=log("utils.data_visualization"),
+                save_dir=args.image_save_dir,
+                dpi=args.chart_dpi,
+                image_format=args.chart_format,
+            ).generate_trend_charts(
+                store.load(), top_n=args.history_top, days=args.history_days
+            )
 
     # 5. 词云生成
-    if args.if_generate_wordcloud:
-        spider.logger.info("开始生成词云")
-        wc_generator = WordCloudGenerator(
-            data=df_movies,
-            logger=spider.logger,
-            save_dir=args.image_save_dir,
-            font_path="msyh.ttc",
-        )
+    def wordcloud(ctx: PipelineContext):
+        with timer.measure("wordcloud", "import"):
+            from utils.wordcloud_generator import WordCloudGenerator
+        df_movies = movies(ctx)
+        with timer.measure("wordcloud", "init"):
+            wc_generator = WordCloudGenerator(
+                data=df_movies,
+                logger=log("utils.wordcloud_generator"),
+                save_dir=args.image_save_dir,
+                font_path="msyh.ttc",
+                scale=args.wordcloud_scale,
+            )
+        with timer.measure("wordcloud"):
+            # 分词结果全部命中缓存时不会加载 jieba 词典
+            if not wc_generator.generate_wordcloud(
+                mask_path=args.wordcloud_mask, columns=args.wordcloud_columns
+            ):
+                raise RuntimeError("未生成任何词云图片")
+
+    # 6. 大规模文本词频统计（流式分块分词，增量更新）
+    def word_freq(ctx: PipelineContext):
+        if not args.word_freq_sources:
+            logger.warning("未指定 --word_freq_sources，跳过词频统计")
+            return
+        with timer.measure("word_freq", "import"):
+            from utils.word_frequency import WordFrequencyEngine
+            from utils.wordcloud_generator import WordCloudGenerator
+            from utils.jieba_cache import init_jieba
+        with timer.measure("word_freq", "init"):
+            init_jieba(logger)
+            engine = WordFrequencyEngine(
+                store_dir=args.word_freq_dir,
+                logger=log("utils.word_frequency"),
+                text_field=args.word_freq_field,
+            )
+        with timer.measure("word_freq"):
+            engine.update(args.word_freq_sources)
+            engine.export_top_terms(
+                os.path.join(args.word_freq_dir, "top_terms.csv"), n=args.word_freq_top
+            )
+            if args.wordcloud_mask:
+                WordCloudGenerator(
+                    data=None,
+                    logger=log("utils.wordcloud_generator"),
+                    save_dir=args.image_save_dir,
+                    font_path="msyh.ttc",
+                    scale=args.wordcloud_scale,
+                ).generate_from_frequencies(
+                    dict(engine.top_terms(args.word_freq_top)),
+                    name="word_freq",
+                    mask_path=args.wordcloud_mask,
+                )
 
-        wc_generator.generate_wordcloud(
-            mask_path=args.wordcloud_mask, columns=args.wordcloud_columns
+    data_inputs = [args.csv_save_path]
+    pipeline = Pipeline(
+        logger=logger,
+        # 剖析时按顺序执行各阶段，避免多个阶段的耗时与内存分配混在一起
+        max_workers=1 if profiler else args.max_parallel_stages,
+        force=args.force,
+        profiler=profiler,
+    )
+    pipeline.add(Stage("crawl", crawl))
+    pipeline.add(Stage("save", save, deps=["crawl"], outputs=save_outputs))
+    pipeline.add(
+        Stage(
+            "columnar", columnar, deps=["crawl"], inputs=data_inputs,
+            outputs=[args.columnar_save_path],
+        )
+    )
+    pipeline.add(
+        Stage(
+            "search_index", search_index, deps=["crawl"], inputs=data_inputs,
+            outputs=[args.search_index_path],
         )
+    )
+    # 上游阶段失败时不发布，Web 应用继续使用上一个完整的版本
+    pipeline.add(Stage("release", release, deps=["save", "columnar", "search_index"]))
+    pipeline.add(Stage("reviews", reviews, deps=["crawl"]))
+    pipeline.add(Stage("posters", posters, deps=["crawl"]))
+    pipeline.add(
+        Stage(
+            "charts", charts, deps=["crawl"], inputs=data_inputs,
+            outputs=[os.path.join(args.image_save_dir, "chart_manifest.json")],
+        )
+    )
+    # pyplot 的全局状态不是线程安全的，趋势图在图表阶段之后绘制，不与其并发使用 pyplot
+    pipeline.add(Stage("history", history, deps=["crawl", "charts"]))
+    pipeline.add(
+        Stage(
+            "wordcloud", wordcloud, deps=["crawl"],
+            inputs=data_inputs + [args.wordcloud_mask],
+            outputs=[
+                os.path.join(args.image_save_dir, f"wordcloud_{column}.png")
+                for column in args.wordcloud_columns
+            ],
+        )
+    )
+    pipeline.add(
+        Stage(
+            "word_freq", word_freq, deps=["reviews"],
+            inputs=[path for pattern in args.word_freq_sources for path in glob.glob(pattern)],
+            outputs=[os.path.join(args.word_freq_dir, "top_terms.csv")],
+        )
+    )
+    return pipeline
+
+
+def default_stages(args) -> List[str]:
+    """未指定 --stages 时，按各个 --if_* 开关选择阶段"""
+    stages = ["crawl"]
+    if args.if_save_to_csv or args.if_save_to_excel or args.if_save_to_json:
+        stages.append("save")
+    flags = [
+        ("columnar", args.if_publish_columnar),
+        ("search_index", args.if_build_search_index),
+        ("reviews", args.if_crawl_reviews),
+        ("posters", args.if_download_posters),
+        ("charts", args.if_data_visualization),
+        ("history", args.if_track_history),
+        ("wordcloud", args.if_generate_wordcloud),
+        ("word_freq", args.if_count_words),
+    ]
+    stages.extend(name for name, enabled in flags if enabled)
+    return stages
+
+
+def with_release(args, stages: List[str]) -> List[str]:
+    """运行了生成 Web 数据的阶段时，自动加入发布阶段，避免 Web 应用一直使用旧版本"""
+    if args.if_publish_release and "release" not in stages:
+        if any(name in stages for name in ("crawl", "save", "columnar", "search_index")):
+            return list(stages) + ["release"]
+    return list(stages)
+
+
+def run_pipeline(args, logger, start: float) -> bool:
+    """
+    运行一次阶段图
+
+    Args:
+        start: 本次运行的开始时间（perf_counter），用于计算总耗时
+
+    Returns:
+        是否所有选中的阶段都成功（完成或跳过）
+    """
+    from utils.metrics import REGISTRY
+
+    # 定时模式下同一进程多次运行，运行报告只记录本次运行的指标
+    REGISTRY.reset()
+    timer = StageTimer()
+    timer.add("startup", "import", _startup_seconds)
 
-    end_time = time.time()
-    spider.logger.info(f"程序运行完毕，耗时 {end_time - start_time:.2f} 秒")
+    profiler = None
+    if args.profile:
+        from utils.profiling import StageProfiler
+
+        profiler = StageProfiler(args.profile_dir, top_n=args.profile_top, logger=logger)
+        logger.info(f"已启用性能剖析，各阶段按顺序执行，结果保存至 {args.profile_dir}")
+
+    pipeline = build_pipeline(args, logger, timer, profiler)
+    stages = with_release(args, args.stages if args.stages else default_stages(args))
+    status = pipeline.run(PipelineContext(), selected=stages)
+    if args.show_charts and any(status.get(name) in (DONE, SKIPPED) for name in ("charts", "history")):
+        from utils.data_visualization import DataVisualizer
+
+        # 各阶段在工作线程中执行，只保存图片；图表窗口在流水线结束后由主线程弹出
+        DataVisualizer(
+            logger=logging.getLogger("utils.data_visualization"),
+            save_dir=args.image_save_dir,
+            image_format=args.chart_format,
+        ).show_charts()
+
+    logger.info("各阶段执行情况：\n" + pipeline.summary())
+    if profiler is not None:
+        logger.info("性能剖析汇总：\n" + profiler.summary())
+    if args.timing:
+        logger.info("各阶段耗时（秒）：\n" + timer.report())
+    elapsed = time.perf_counter() - start
+    write_run_report(args.metrics_report, pipeline, timer, elapsed, logger)
+    logger.info(f"程序运行完毕，耗时 {elapsed:.2f} 秒")
+    return all(value in (DONE, SKIPPED) for value in status.values())
+
+
+def main(args) -> bool:
+    """主函数，按阶段图协调各个模块的运行；--schedule_interval 大于 0 时定时循环运行"""
+    # 是否删除先前的日志文件
+    if args.if_reset_log:
+        clear_log_file()
+
+    # 设置日志
+    logger = setup_logging(
+        level=args.log_level,
+        rotation=args.log_rotation,
+        json_format=args.log_format == "json",
+        module_levels=dict(args.log_levels),
+    )
+
+    if args.nice and hasattr(os, "nice"):
+        os.nice(args.nice)  # 与 Web 服务部署在同一台机器上时，让出 CPU
+
+    if args.schedule_interval <= 0:
+        return run_pipeline(args, logger, _module_start)
+
+    from utils.scheduler import CrawlScheduler
+
+    # 每次运行的数据文件都先写临时文件再原子替换，Web 应用检测到文件更新后在后台切换数据
+    scheduler = CrawlScheduler(
+        run=lambda: run_pipeline(args, logger, time.perf_counter()),
+        interval=args.schedule_interval,
+        jitter=args.schedule_jitter,
+        lock_path=args.schedule_lock,
+        run_immediately=True,
+        logger=logging.getLogger("utils.scheduler"),
+    )
+    logger.info(
+        f"定时模式：每 {args.schedule_interval:.0f} 秒运行一次"
+        f"（抖动 ±{args.schedule_jitter:.0f} 秒），按 Ctrl+C 退出"
+    )
+    scheduler.run_forever()
+    return True
+
+
+def module_log_level(item: str) -> Tuple[str, str]:
+    """解析 --log_levels 的一项（记录器名称=级别），格式不正确时由 argparse 给出用法错误"""
+    name, sep, level = item.partition("=")
+    level = level.strip().upper()
+    if not sep or not name.strip():
+        raise argparse.ArgumentTypeError(f"格式应为 记录器名称=级别，如 spiders.spider=ERROR: {item}")
+    if level not in ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"):
+        raise argparse.ArgumentTypeError(f"未知的日志级别: {item}，可选 DEBUG / INFO / WARNING / ERROR / CRITICAL")
+    return name.strip(), level
+
+
+def write_run_report(path: str, pipeline: Pipeline, timer: StageTimer, elapsed: float, logger) -> None:
+    """将各阶段的状态与耗时、导入/初始化/执行耗时以及运行指标写入 JSON 报告"""
+    from utils.metrics import REGISTRY
+
+    try:
+        REGISTRY.write_report(
+            path,
+            time=time.strftime("%Y-%m-%d %H:%M:%S"),
+            ok=all(status in (DONE, SKIPPED) for status in pipeline.status.values()),
+            elapsed=elapsed,
+            wall_time=pipeline.wall_time,
+            stages={
+                name: {"status": status, "seconds": pipeline.elapsed.get(name)}
+                for name, status in pipeline.status.items()
+            },
+            timing=timer.stages,
+        )
+        logger.info(f"运行报告已保存至 {path}")
+    except OSError as e:
+        logger.error(f"运行报告保存失败: {e}")
 
 
 if __name__ == "__main__":
@@ -82,7 +501,36 @@ if __name__ == "__main__":
         "--if_print",
         type=bool,
         default=True,
-        help="是否在终端当中打印爬取到的电影信息",
+        help="是否输出爬取到的电影信息（记录器 spiders.spider.items，级别 INFO）",
+    )
+
+    parser.add_argument(
+        "--if_archive_pages",
+        type=bool,
+        default=True,
+        help="是否将抓取到的原始页面追加写入压缩归档",
+    )
+    parser.add_argument(
+        "--archive_dir", type=str, default=PAGE_ARCHIVE_DIR, help="原始页面归档目录"
+    )
+    parser.add_argument(
+        "--reparse",
+        type=bool,
+        default=False,
+        help="不访问网络，用当前的解析逻辑并行重新解析归档中的页面（代替爬取）",
+    )
+    parser.add_argument(
+        "--reparse_run",
+        type=str,
+        default=None,
+        help="只重新解析指定运行编号抓取的页面，默认使用每个页面最近一次抓取的内容",
+    )
+
+    parser.add_argument(
+        "--quarantine_path",
+        type=str,
+        default=QUARANTINE_PATH,
+        help="未通过校验（必填字段缺失或非法）的记录及原因的追加写入路径",
     )
 
     # CSV保存相关参数
@@ -103,6 +551,76 @@ if __name__ == "__main__":
     )
     parser.add_argument("--json_save_path", type=str, default=JSON_PATH)
 
+    # 列式数据发布相关参数
+    parser.add_argument(
+        "--if_publish_columnar",
+        type=bool,
+        default=True,
+        help="是否发布供Web应用共享映射的列式数据文件",
+    )
+    parser.add_argument("--columnar_save_path", type=str, default=COLUMNAR_PATH)
+
+    # 全文检索相关参数
+    parser.add_argument(
+        "--if_build_search_index", type=bool, default=True, help="是否建立检索索引"
+    )
+    parser.add_argument("--search_index_path", type=str, default=SEARCH_INDEX_PATH)
+
+    # 数据版本发布相关参数
+    parser.add_argument(
+        "--if_publish_release",
+        type=bool,
+        default=True,
+        help="是否将CSV、列式数据与检索索引作为一个数据版本整体发布给Web应用",
+    )
+    parser.add_argument("--release_dir", type=str, default=RELEASE_DIR)
+
+    # 短评爬取相关参数
+    parser.add_argument(
+        "--if_crawl_reviews", type=bool, default=False, help="是否爬取每部电影的短评"
+    )
+    parser.add_argument(
+        "--reviews_dir", type=str, default=REVIEWS_DIR, help="短评分片文件保存目录"
+    )
+    parser.add_argument(
+        "--reviews_per_movie", type=int, default=200, help="每部电影最多爬取的短评数"
+    )
+    parser.add_argument(
+        "--reviews_rate",
+        type=float,
+        default=REVIEW_RATE_LIMIT,
+        help="短评爬取的全局请求速率(次/秒)",
+    )
+
+    # 海报相关参数
+    parser.add_argument(
+        "--if_download_posters",
+        type=bool,
+        default=False,
+        help="是否下载海报并生成缩略图（Web 应用的电影列表中显示）",
+    )
+    parser.add_argument(
+        "--posters_dir", type=str, default=POSTER_DIR, help="海报原图与下载清单保存目录"
+    )
+    parser.add_argument(
+        "--posters_static_dir", type=str, default=POSTER_STATIC_DIR, help="海报缩略图保存目录"
+    )
+    parser.add_argument(
+        "--poster_sizes", type=int, nargs="+", default=POSTER_SIZES, help="缩略图宽度(像素)"
+    )
+    parser.add_argument(
+        "--posters_rate",
+        type=float,
+        default=POSTER_RATE_LIMIT,
+        help="海报下载的全局请求速率(次/秒)",
+    )
+    parser.add_argument(
+        "--posters_revalidate",
+        type=bool,
+        default=False,
+        help="海报链接未变化时是否仍发出条件请求，ETag 变化时重新下载",
+    )
+
     # 数据可视化相关参数
     parser.add_argument(
         "--if_data_visualization", type=bool, default=True, help="是否进行常规图表分析"
@@ -113,6 +631,43 @@ if __name__ == "__main__":
     parser.add_argument(
         "--show_charts", type=bool, default=False, help="是否弹出显示图表"
     )
+    parser.add_argument(
+        "--chart_parallel",
+        type=bool,
+        default=True,
+        help="是否在进程池中并行绘制图表（弹出显示图表时自动退回顺序绘制）",
+    )
+    parser.add_argument("--chart_dpi", type=int, default=300, help="图表分辨率")
+    parser.add_argument(
+        "--chart_cache",
+        type=bool,
+        default=True,
+        help="图表输入(所用列与参数)未变化时是否跳过重新绘制",
+    )
+    parser.add_argument(
+        "--chart_format",
+        type=str,
+        default="png",
+        choices=["png", "svg", "webp"],
+        help="图表图片格式",
+    )
+
+    # 排名历史相关参数
+    parser.add_argument(
+        "--if_track_history",
+        type=bool,
+        default=True,
+        help="是否记录每次爬取的排名/评分历史并绘制趋势图",
+    )
+    parser.add_argument(
+        "--history_dir", type=str, default=HISTORY_DIR, help="排名历史保存目录"
+    )
+    parser.add_argument(
+        "--history_days", type=float, default=30, help="趋势图统计最近多少天内的变化"
+    )
+    parser.add_argument(
+        "--history_top", type=int, default=10, help="趋势图显示变化最大的前N部电影"
+    )
 
     # 词云相关参数
     parser.add_argument(
@@ -124,6 +679,12 @@ if __name__ == "__main__":
         default=MASK,
         help="词云遮罩图片路径",
     )
+    parser.add_argument(
+        "--wordcloud_scale",
+        type=float,
+        default=1.0,
+        help="词云图片相对遮罩尺寸的放大倍数",
+    )
     parser.add_argument(
         "--wordcloud_columns",
         type=List[str],
@@ -131,6 +692,134 @@ if __name__ == "__main__":
         help="请参考config.py当中的MOVIE_INFO设置参数，代码将根据这部分的参数生成对应的词云",
     )
 
+    # 大规模文本词频统计相关参数
+    parser.add_argument(
+        "--if_count_words",
+        type=bool,
+        default=False,
+        help="是否对大规模文本（如短评）做流式增量词频统计",
+    )
+    parser.add_argument(
+        "--word_freq_sources",
+        type=str,
+        nargs="+",
+        default=[],
+        help="词频统计的数据源（.txt/.jsonl 及其 .gz 压缩形式、.csv，支持通配符）",
+    )
+    parser.add_argument(
+        "--word_freq_field",
+        type=str,
+        default="comment",
+        help="JSON Lines / CSV 数据源中的文本字段名",
+    )
+    parser.add_argument(
+        "--word_freq_dir", type=str, default=WORD_FREQ_DIR, help="词频统计结果保存目录"
+    )
+    parser.add_argument(
+        "--word_freq_top", type=int, default=200, help="高频词报告与词云包含的词数"
+    )
+
+    # 阶段调度相关参数
+    parser.add_argument(
+        "--stages",
+        type=str,
+        nargs="+",
+        default=None,
+        choices=[
+            "crawl", "save", "columnar", "search_index", "release", "reviews", "posters",
+            "charts", "history", "wordcloud", "word_freq",
+        ],
+        help="只运行指定的阶段（默认按各个 --if_* 开关选择），未运行爬取时使用已有的 CSV 数据",
+    )
+    parser.add_argument(
+        "--max_parallel_stages", type=int, default=4, help="最多同时执行的阶段数"
+    )
+    parser.add_argument(
+        "--force",
+        type=bool,
+        default=False,
+        help="是否忽略输出文件的新旧，强制执行所有选中的阶段",
+    )
+
+    # 耗时统计
+    parser.add_argument(
+        "--timing",
+        type=bool,
+        default=False,
+        help="是否输出各阶段 导入/初始化/执行 的耗时",
+    )
+
+    # 性能剖析
+    parser.add_argument(
+        "--profile",
+        type=bool,
+        default=False,
+        help="是否用 cProfile 与 tracemalloc 剖析每个阶段（各阶段按顺序执行；进程池中绘制的图表不在剖析范围内）",
+    )
+    parser.add_argument(
+        "--profile_dir", type=str, default=PROFILE_DIR, help="剖析结果(.prof 与汇总)保存目录"
+    )
+    parser.add_argument(
+        "--profile_top", type=int, default=20, help="汇总中列出的热点函数与内存分配位置数"
+    )
+
+    # 定时运行
+    parser.add_argument(
+        "--schedule_interval",
+        type=float,
+        default=0,
+        help=f"大于 0 时进入定时模式，每隔该秒数运行一次（如 {SCHEDULE_INTERVAL:.0f} 为每天一次）",
+    )
+    parser.add_argument(
+        "--schedule_jitter",
+        type=float,
+        default=SCHEDULE_JITTER,
+        help="定时运行间隔的随机抖动幅度(秒)",
+    )
+    parser.add_argument(
+        "--schedule_lock",
+        type=str,
+        default=SCHEDULE_LOCK_PATH,
+        help="进程间锁文件，同一时刻只允许一个定时运行（与 app.py serve 的定时任务共用）",
+    )
+    parser.add_argument(
+        "--nice", type=int, default=0, help="降低本进程的调度优先级（仅 Linux/macOS）"
+    )
+
+    # 运行报告
+    parser.add_argument(
+        "--metrics_report",
+        type=str,
+        default=METRICS_REPORT_PATH,
+        help="运行报告（各阶段状态与运行指标）的保存路径",
+    )
+
+    # 日志相关参数
+    parser.add_argument(
+        "--log_level",
+        type=str,
+        default="INFO",
+        choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+        help="全局日志级别",
+    )
+    parser.add_argument(
+        "--log_levels",
+        type=module_log_level,
+        nargs="*",
+        default=[],
+        help="按模块设置日志级别，如 spiders.spider.items=WARNING spiders.spider=ERROR",
+    )
+    parser.add_argument(
+        "--log_format", type=str, default="text", choices=["text", "json"], help="日志格式"
+    )
+    parser.add_argument(
+        "--log_rotation",
+        type=str,
+        default="size",
+        choices=["size", "time", "none"],
+        help="日志轮转方式：按大小 / 按天 / 不轮转（轮转出的旧日志用 gzip 压缩）",
+    )
+
     # 是否重置日志
     parser.add_argument(
         "--if_reset_log", type=bool, default=False, help="是否删除旧日志文件"
@@ -138,5 +827,6 @@ if __name__ == "__main__":
 
     args = parser.parse_args()
     print("开始执行爬虫")
-    main(args)
-    print("所有任务执行完毕！")
+    ok = main(args)
+    print("所有任务执行完毕！" if ok else "部分阶段执行失败，请查看日志")
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,200 @@
+"""
+海报爬虫模块，在线程池中并发下载每部电影的海报，所有线程共享全局限速器（spiders.review_spider.RateLimiter）
+
+海报原图、下载清单与缩略图由 utils.poster_store.PosterStore 管理，只在以下情况下重新下载：
+    - 海报链接与清单中记录的不同（豆瓣更换海报时链接会变化），或原图文件已不存在
+    - 开启 revalidate 时，携带 If-None-Match / If-Modified-Since 发出条件请求，服务器返回 304 时不下载，
+      只有 ETag（或修改时间）变化时才下载新内容
+下载到的内容按 SHA-1 去重，不同电影使用同一张图片时只保存一份
+
+下面是对PosterSpider类中各个方法的介绍：
+    fetch_poster()  按全局限速请求海报（带重试机制），返回 (状态码, 内容, 响应头)
+    download()  下载单部电影的海报并更新清单，返回本次的结果（unchanged / not_modified / downloaded / duplicate / failed）
+    crawl()  在线程池中下载所有电影的海报，清单保存在 manifest 中，由调用方在生成缩略图后保存
+"""
+
+import os
+import sys
+import time
+import logging
+import threading
+import requests
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import POSTER_RATE_LIMIT
+from spiders.review_spider import RateLimiter
+from utils.metrics import REGISTRY
+from utils.poster_store import PosterStore
+
+_DOWNLOADS = REGISTRY.counter(
+    "douban_poster_downloads_total", "海报处理结果（未变化/304/已下载/内容重复/失败）", ["result"]
+)
+_DOWNLOAD_BYTES = REGISTRY.counter("douban_poster_bytes_total", "下载的海报字节数")
+
+_IMAGE_EXTENSIONS = {"jpg", "jpeg", "png", "webp", "gif"}
+
+
+def _extension(url: str) -> str:
+    ext = os.path.splitext(urlparse(url).path)[1].lstrip(".").lower()
+    return ext if ext in _IMAGE_EXTENSIONS else "jpg"
+
+
+class PosterSpider:
+    def __init__(
+        self,
+        store: PosterStore,
+        logger: logging.Logger = None,
+        rate: float = POSTER_RATE_LIMIT,
+        max_workers: int = 4,
+        revalidate: bool = False,
+        timeout: float = 10,
+    ):
+        """
+        Args:
+            store: 海报存储
+            logger: 日志记录器
+            rate: 全局每秒最多请求数
+            max_workers: 同时下载的海报数（线程数）
+            revalidate: 链接未变化时是否仍发出条件请求，检查 ETag 是否变化
+            timeout: 请求超时时间(秒)
+        """
+        self.store = store
+        self.logger = logger if logger else logging.getLogger(__name__)
+        self.limiter = RateLimiter(rate)
+        self.max_workers = max_workers
+        self.revalidate = revalidate
+        self.timeout = timeout
+        self.headers = {
+            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/",  # 反爬虫标识
+            "Accept": "image/webp,image/*,*/*;q=0.8",
+            "Referer": "https://movie.douban.com/",  # 豆瓣图片服务器会拒绝没有来源页的请求
+        }
+        self.manifest: Dict[str, Dict] = store.load_manifest()
+        self._manifest_lock = threading.Lock()
+        self._local = threading.local()
+
+    def _session(self) -> requests.Session:
+        """每个线程使用自己的 Session，复用连接"""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update(self.headers)
+            self._local.session = session
+        return session
+
+    def fetch_poster(
+        self, url: str, entry: Optional[Dict] = None, retries: int = 3
+    ) -> Tuple[Optional[int], bytes, Dict]:
+        """
+        按全局限速请求海报（带重试机制）
+
+        Args:
+            url: 海报链接
+            entry: 清单中该电影的记录，链接相同时携带其 ETag / Last-Modified 发出条件请求
+
+        Returns:
+            (状态码：失败时为 None, 内容, 响应头)
+        """
+        headers = {}
+        if entry and entry.get("url") == url:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        for attempt in range(retries):
+            self.limiter.wait()
+            try:
+                response = self._session().get(url, headers=headers, timeout=self.timeout)
+            except requests.exceptions.RequestException as e:
+                self.logger.error(f"第{attempt+1}次请求失败：{url}，错误信息：{e}")
+                continue
+            if response.status_code in (200, 304, 404):
+                return response.status_code, response.content, response.headers
+            self.logger.error(f"请求失败，状态码：{response.status_code}，{url}")
+            # 被限流时退避，等待时间逐次加倍
+            if response.status_code in (403, 418, 429):
+                time.sleep(2 ** attempt * 5)
+        return None, b"", {}
+
+    def download(self, movie_id: str, url: str) -> str:
+        """
+        下载单部电影的海报并更新清单
+
+        Returns:
+            unchanged: 链接未变化且原图存在，没有发出请求
+            not_modified: 条件请求返回 304
+            downloaded: 下载到新内容
+            duplicate: 下载成功，但内容与已保存的某张海报相同
+            failed: 下载失败
+        """
+        with self._manifest_lock:
+            entry = self.manifest.get(movie_id)
+        current = (
+            entry is not None
+            and entry.get("url") == url
+            and os.path.exists(self.store.original_path(entry["sha1"], entry["ext"]))
+        )
+        if current and not self.revalidate:
+            return "unchanged"
+
+        status, content, headers = self.fetch_poster(url, entry if current else None)
+        if status == 304 and current:
+            return "not_modified"
+        if status != 200 or not content:
+            if status == 404:
+                self.logger.warning(f"海报不存在：{url}")
+            return "failed"
+
+        _DOWNLOAD_BYTES.inc(len(content))
+        ext = _extension(url)
+        sha1, is_new = self.store.save_original(content, ext)
+        with self._manifest_lock:
+            self.manifest[movie_id] = {
+                "url": url,
+                "etag": headers.get("ETag"),
+                "last_modified": headers.get("Last-Modified"),
+                "sha1": sha1,
+                "ext": ext,
+                "fetched_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+            }
+        return "downloaded" if is_new else "duplicate"
+
+    def crawl(self, movies) -> Counter:
+        """
+        在线程池中下载所有电影的海报，所有线程共享全局限速
+
+        Args:
+            movies: 电影数据（DataFrame），需要 id 与 poster 列
+
+        Returns:
+            各结果的电影数
+        """
+        pairs = {
+            str(movie_id): url
+            for movie_id, url in zip(movies["id"], movies["poster"])
+            if movie_id is not None and movie_id == movie_id  # 排除 NaN
+            and isinstance(url, str) and url.startswith("http")
+        }
+        self.logger.info(f"开始下载海报：共 {len(pairs)} 部电影")
+        start = time.perf_counter()
+        results = Counter()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(self.download, m, url): m for m, url in pairs.items()}
+            for future in as_completed(futures):
+                try:
+                    result = future.result()
+                except Exception as e:
+                    self.logger.error(f"电影 {futures[future]} 的海报下载失败: {e}")
+                    result = "failed"
+                results[result] += 1
+                _DOWNLOADS.inc(result=result)
+
+        self.logger.info(
+            f"海报下载结束，耗时 {time.perf_counter() - start:.2f} 秒："
+            + ", ".join(f"{result}={n}" for result, n in sorted(results.items()))
+        )
+        return results
@@ -0,0 +1,85 @@
+"""
+重新解析模块，用当前的 MovieSpider 解析逻辑在进程池中重新解析页面归档（utils.page_archive），不访问网络
+
+解析逻辑修改或新增字段后，用归档中每个列表页最近一次抓取的内容重新生成电影数据，
+之后的保存、图表等阶段与正常爬取完全相同
+
+下面是对各个函数的介绍：
+    page_number_from_url(): 由列表页链接中的 start 参数计算页码
+    reparse_archive(): 并行重新解析归档中的页面，返回按排名排序的电影信息列表
+"""
+
+import os
+import re
+import logging
+from typing import Dict, List, Optional, Tuple
+
+from spiders.spider import MovieSpider
+from utils.page_archive import PageArchive, read_record
+from utils.process_pool import process_pool
+
+_START_PATTERN = re.compile(r"[?&]start=(\d+)")
+_worker_spider: Optional[MovieSpider] = None
+
+
+def page_number_from_url(url: str, page_size: int = 25) -> int:
+    match = _START_PATTERN.search(url)
+    return int(match.group(1)) // page_size + 1 if match else 1
+
+
+def _init_worker(html_parser: str) -> None:
+    """每个工作进程只创建一个爬虫实例，不逐条输出电影信息"""
+    global _worker_spider
+    _worker_spider = MovieSpider(html_parser=html_parser, if_print=False)
+
+
+def _parse_worker(task: Tuple[str, int, int, str]) -> List[Dict]:
+    path, offset, length, url = task
+    return _worker_spider.parse_single_page(read_record(path, offset, length), page_number_from_url(url)) or []
+
+
+def _rank(movie: Dict) -> int:
+    try:
+        return int(movie.get("rank"))
+    except (TypeError, ValueError):
+        return 10**9
+
+
+def reparse_archive(
+    archive: PageArchive,
+    run_id: Optional[str] = None,
+    html_parser: str = "lxml",
+    max_workers: Optional[int] = None,
+    logger: logging.Logger = None,
+) -> List[Dict]:
+    """
+    并行重新解析归档中的页面
+
+    Args:
+        archive: 页面归档
+        run_id: 只解析指定运行抓取的页面，默认使用每个列表页最近一次抓取的内容
+        html_parser: BeautifulSoup 使用的解析器
+        max_workers: 进程池大小，默认为 CPU 核数
+        logger: 日志记录器
+
+    Returns:
+        按排名排序的电影信息列表
+    """
+    logger = logger if logger else logging.getLogger(__name__)
+    entries = [e for e in archive.entries(latest_only=True, run_id=run_id) if e.get("status") == 200]
+    if not entries:
+        logger.warning(f"页面归档 {archive.archive_dir} 中没有可解析的页面")
+        return []
+    tasks = [(archive.path_of(e), e["offset"], e["length"], e["url"]) for e in entries]
+    workers = max_workers or min(len(tasks), os.cpu_count() or 1)
+
+    movies: List[Dict] = []
+    with process_pool(
+        max_workers=workers, initializer=_init_worker, initargs=(html_parser,)
+    ) as executor:
+        chunksize = max(1, len(tasks) // (workers * 4))
+        for page_movies in executor.map(_parse_worker, tasks, chunksize=chunksize):
+            movies.extend(page_movies)  # 重复的电影由 DataCleaner 按编号去重
+    results = sorted(movies, key=_rank)
+    logger.info(f"已从归档重新解析 {len(tasks)} 个页面，共 {len(results)} 部电影")
+    return results
@@ -0,0 +1,293 @@
+"""
+短评爬虫模块，用于按页爬取每部电影的短评，并流式写入按电影分片的 gzip 压缩 JSON Lines 文件
+
+短评不会在内存中累积：每爬取一页就追加写入该电影的分片文件 <reviews_dir>/<subject_id>.jsonl.gz，
+并在进度文件 _progress.json 中记录下一页的位置，程序中断后重新运行会从断点继续
+
+下面是对各个类和方法的简单介绍：
+    RateLimiter: 全局限速器，所有线程共享，保证总请求速率不超过设定值
+    ReviewSpider: 短评爬虫
+        fetch_page()  按全局限速请求页面（带重试机制）
+        parse_reviews()  解析一页短评，返回短评列表以及是否还有下一页
+        crawl_movie()  爬取单部电影的短评，逐页追加写入分片文件，达到上限或没有下一页时结束
+        crawl()  在线程池中爬取多部电影的短评，已爬完或已达到上限的电影会被跳过
+
+电影编号由 utils.movie_id.subject_id_from_url() 从详情页链接中提取
+"""
+
+import os
+import re
+import sys
+import gzip
+import json
+import time
+import random
+import logging
+import threading
+import requests
+from bs4 import BeautifulSoup
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterable, List, Optional, Tuple
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import REVIEW_RATE_LIMIT, REVIEW_URL, REVIEWS_DIR
+
+# 短评星级，如 class="allstar50 rating" 表示 5 星
+_STAR_PATTERN = re.compile(r"allstar(\d)0")
+# 每页短评数（豆瓣固定为 20）
+PAGE_SIZE = 20
+
+
+class RateLimiter:
+    """
+    全局限速器：相邻两次请求的间隔不小于 1 / rate 秒，所有线程共享
+    """
+
+    def __init__(self, rate: float = REVIEW_RATE_LIMIT, jitter: float = 0.3):
+        """
+        Args:
+            rate: 每秒最多请求数
+            jitter: 在间隔基础上增加的随机延时比例，模拟人类行为
+        """
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self.jitter = jitter
+        self._next_time = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        """阻塞到可以发出下一次请求"""
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_time)
+            self._next_time = start + self.interval * (1 + random.uniform(0, self.jitter))
+        delay = start - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+class ReviewSpider:
+    def __init__(
+        self,
+        logger: logging.Logger = None,
+        reviews_dir: str = REVIEWS_DIR,
+        max_reviews_per_movie: int = 200,
+        rate: float = REVIEW_RATE_LIMIT,
+        max_workers: int = 4,
+        review_url: str = REVIEW_URL,
+    ):
+        """
+        Args:
+            logger: 日志记录器
+            reviews_dir: 短评分片文件与进度文件的保存目录
+            max_reviews_per_movie: 每部电影最多爬取的短评数
+            rate: 全局每秒最多请求数
+            max_workers: 同时爬取的电影数（线程数）
+            review_url: 短评页链接模板，包含 {subject_id} 与 {start}
+        """
+        self.logger = logger if logger else logging.getLogger(__name__)
+        self.reviews_dir = reviews_dir
+        self.max_reviews_per_movie = max_reviews_per_movie
+        self.max_workers = max_workers
+        self.review_url = review_url
+        self.limiter = RateLimiter(rate)
+        self.headers = {
+            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/",  # 反爬虫标识
+            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
+            "Accept-Language": "zh-CN,zh;q=0.9,en;q=0.8",
+            "Connection": "keep-alive",
+        }
+        self.progress_path = os.path.join(reviews_dir, "_progress.json")
+        self._progress_lock = threading.Lock()
+        self._local = threading.local()
+        os.makedirs(reviews_dir, exist_ok=True)
+        self.progress = self._load_progress()
+
+    def _load_progress(self) -> Dict[str, Dict]:
+        if os.path.exists(self.progress_path):
+            try:
+                with open(self.progress_path, "r", encoding="utf-8") as f:
+                    return json.load(f)
+            except (OSError, ValueError) as e:
+                self.logger.warning(f"短评爬取进度读取失败，将从头爬取: {e}")
+        return {}
+
+    def _save_progress(self, subject_id: str, state: Dict) -> None:
+        """更新单部电影的进度并写入进度文件（原子替换）"""
+        with self._progress_lock:
+            self.progress[subject_id] = state
+            tmp_path = f"{self.progress_path}.tmp.{os.getpid()}"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.progress, f, ensure_ascii=False)
+            os.replace(tmp_path, self.progress_path)
+
+    def _session(self) -> requests.Session:
+        """每个线程使用自己的 Session，复用连接"""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update(self.headers)
+            self._local.session = session
+        return session
+
+    def shard_path(self, subject_id: str) -> str:
+        return os.path.join(self.reviews_dir, f"{subject_id}.jsonl.gz")
+
+    def fetch_page(self, url: str, retries: int = 3) -> Optional[str]:
+        """
+        按全局限速请求页面（带重试机制）
+
+        Returns:
+            页面HTML内容，失败或页面不存在时返回None
+        """
+        for attempt in range(retries):
+            self.limiter.wait()
+            try:
+                response = self._session().get(url, timeout=10)
+            except requests.exceptions.RequestException as e:
+                self.logger.error(f"第{attempt+1}次请求失败：{url}，错误信息：{e}")
+                continue
+            if response.status_code == 200:
+                response.encoding = "utf-8"
+                return response.text
+            if response.status_code == 404:
+                self.logger.warning(f"页面不存在：{url}")
+                return None
+            self.logger.error(f"请求失败，状态码：{response.status_code}，{url}")
+            # 被限流时退避，等待时间逐次加倍
+            if response.status_code in (403, 429):
+                time.sleep(2 ** attempt * 5)
+        return None
+
+    def parse_reviews(self, page_content: str, subject_id: str) -> Tuple[List[Dict], bool]:
+        """
+        解析一页短评
+
+        Returns:
+            (短评列表, 是否还有下一页)
+        """
+        soup = BeautifulSoup(page_content, "lxml")
+        reviews = []
+        for item in soup.find_all("div", class_="comment-item"):
+            content_tag = item.find("span", class_="short")
+            if not content_tag:
+                continue
+            info_tag = item.find("span", class_="comment-info")
+            user_tag = info_tag.find("a") if info_tag else None
+            rating_tag = item.find("span", class_=_STAR_PATTERN)
+            time_tag = item.find("span", class_="comment-time")
+            votes_tag = item.find("span", class_="votes")
+
+            star = None
+            if rating_tag:
+                match = _STAR_PATTERN.search(" ".join(rating_tag.get("class", [])))
+                star = int(match.group(1)) if match else None
+            votes = votes_tag.text.strip() if votes_tag else ""
+            reviews.append(
+                {
+                    "subject_id": subject_id,
+                    "review_id": item.get("data-cid"),
+                    "user": user_tag.text.strip() if user_tag else None,
+                    "star": star,
+                    "time": (time_tag.get("title") or time_tag.text).strip() if time_tag else None,
+                    "votes": int(votes) if votes.isdigit() else 0,
+                    "comment": content_tag.text.strip(),
+                }
+            )
+        has_next = soup.find("a", class_="next") is not None
+        return reviews, has_next
+
+    def _existing_review_ids(self, subject_id: str) -> set:
+        """读取分片文件中已保存的短评编号，断点续爬时避免重复写入"""
+        path = self.shard_path(subject_id)
+        ids = set()
+        if not os.path.exists(path):
+            return ids
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        ids.add(json.loads(line).get("review_id"))
+                    except ValueError:
+                        continue
+        except (OSError, EOFError) as e:
+            # 上次写入中断导致文件末尾不完整，已读取的部分仍然有效
+            self.logger.warning(f"{path} 末尾不完整: {e}")
+        return ids
+
+    def crawl_movie(self, subject_id: str) -> int:
+        """
+        爬取单部电影的短评，每页追加写入分片文件并记录进度
+
+        Returns:
+            该电影已保存的短评总数
+        """
+        state = dict(self.progress.get(subject_id, {"start": 0, "count": 0, "exhausted": False}))
+        if self._is_complete(state):
+            return state["count"]
+        seen = self._existing_review_ids(subject_id)
+        # 写入分片后、记录进度前中断时，以分片中实际保存的条数为准
+        state["count"] = max(state["count"], len(seen))
+
+        while state["count"] < self.max_reviews_per_movie:
+            url = self.review_url.format(subject_id=subject_id, start=state["start"])
+            page_content = self.fetch_page(url)
+            if page_content is None:
+                # 请求失败时不推进进度，下次运行从该页继续
+                self.logger.warning(f"电影 {subject_id} 的短评在 start={state['start']} 处中断")
+                return state["count"]
+            reviews, has_next = self.parse_reviews(page_content, subject_id)
+            reviews = [r for r in reviews if r["review_id"] is None or r["review_id"] not in seen]
+            remaining = self.max_reviews_per_movie - state["count"]
+            truncated = len(reviews) > remaining
+            reviews = reviews[:remaining]
+            if reviews:
+                # 每页作为一个独立的 gzip 成员追加写入，已写入的内容不会因后续中断而损坏
+                with gzip.open(self.shard_path(subject_id), "at", encoding="utf-8") as f:
+                    for review in reviews:
+                        f.write(json.dumps(review, ensure_ascii=False) + "\n")
+                seen.update(r["review_id"] for r in reviews)
+            state["count"] += len(reviews)
+            # 因达到上限只写入了一部分的页面不推进位置，调高上限后从该页继续（已写入的按编号去重）
+            if not truncated:
+                state["start"] += PAGE_SIZE
+            state["exhausted"] = not has_next
+            self._save_progress(subject_id, state)
+            if not has_next:
+                break
+
+        self.logger.info(f"电影 {subject_id} 的短评爬取完成，共 {state['count']} 条")
+        return state["count"]
+
+    def _is_complete(self, state: Dict) -> bool:
+        """没有下一页，或已达到每部电影的短评上限"""
+        return state.get("exhausted", False) or state.get("count", 0) >= self.max_reviews_per_movie
+
+    def crawl(self, subject_ids: Iterable[str]) -> int:
+        """
+        在线程池中爬取多部电影的短评，所有线程共享全局限速
+
+        Args:
+            subject_ids: 豆瓣电影编号
+
+        Returns:
+            所有电影已保存的短评总数
+        """
+        subject_ids = [str(s) for s in dict.fromkeys(subject_ids) if s]
+        pending = [s for s in subject_ids if not self._is_complete(self.progress.get(s, {}))]
+        self.logger.info(
+            f"开始爬取短评：共 {len(subject_ids)} 部电影，{len(subject_ids) - len(pending)} 部已完成"
+        )
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(self.crawl_movie, s): s for s in pending}
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                except Exception as e:
+                    self.logger.error(f"电影 {futures[future]} 的短评爬取失败: {e}")
+
+        total = sum(self.progress.get(s, {}).get("count", 0) for s in subject_ids)
+        self.logger.info(
+            f"短评爬取结束，共 {total} 条，耗时 {time.perf_counter() - start:.2f} 秒"
+        )
+        return total
@@ -3,10 +3,14 @@
 
 下面是对各个函数的简单介绍：
     __init__()  类的初始化函数
-    setup_logging() 日志记录函数，用于记录爬取过程中的信息，将信息保存在logs/spider.log文件当中
-    fetch_page()  爬取一整个网页的信息，返回一整个网页的信息
-    parse_single_movie()  解析单个电影的信息，返回解析到的电影信息
+    日志记录器默认为 spiders.spider；if_print 为真时，每部电影的信息通过 spiders.spider.items 记录器以 INFO 级别输出，
+    可以在 setup_logging() 中单独调高该记录器的级别来关闭
+    fetch_page()  爬取一整个网页的信息，返回一整个网页的信息；被限流(429/503)时按 Retry-After 等待后重试，
+        每次请求的状态码与延迟记录在 stats 中，并登记到全局指标（utils.metrics）；
+        再次请求同一页面时携带上次响应的 ETag / Last-Modified 发出条件请求，服务器返回 304 时使用上次的内容
+    parse_single_movie()  解析单个电影的信息，返回解析到的电影信息（缺失的字段为 None，由清洗阶段按字段规则统一校验）
     parse_single_page() 解析一整个页面的电影信息，通过调用parse_single_movie()来实现对电影的解析
+    指定 archive（utils.page_archive.PageArchive）时，每个成功抓取的页面都会追加写入归档，供 spiders.reparse 重新解析
     parse_all_pages()   解析所有页面的信息，过程：通过fetch_page()抓取一整个页面的信息，然后调用parse_single_page()解析页面中的电影信息
 """
 
@@ -15,8 +19,24 @@ from bs4 import BeautifulSoup
 import time
 import random
 import logging
-from typing import List, Dict, Optional
+import threading
+from collections import Counter
+from typing import List, Dict, Optional, Tuple
 from config import BASE_URL, MOVIE_INFO
+from utils.movie_id import subject_id_from_url
+from utils.metrics import REGISTRY
+
+_FETCH_SECONDS = REGISTRY.histogram("douban_spider_fetch_seconds", "列表页请求耗时(秒)")
+_FETCH_BYTES = REGISTRY.counter("douban_spider_fetch_bytes_total", "下载的页面字节数")
+_REQUESTS = REGISTRY.counter("douban_spider_requests_total", "列表页请求数（按状态码）", ["status"])
+_RETRIES = REGISTRY.counter("douban_spider_retries_total", "列表页重试次数")
+_PAGE_FAILURES = REGISTRY.counter("douban_spider_page_failures_total", "重试后仍失败的页面数")
+_PARSE_SECONDS = REGISTRY.histogram("douban_spider_parse_seconds", "单个列表页的解析耗时(秒)")
+_MOVIES_PARSED = REGISTRY.counter("douban_spider_movies_parsed_total", "解析成功的电影数")
+_PARSE_FAILURES = REGISTRY.counter("douban_spider_movie_parse_failures_total", "解析失败的电影条目数")
+
+# 逐条输出电影信息的记录器，与其他爬取日志分开设置级别
+_item_logger = logging.getLogger(__name__ + ".items")
 
 
 class MovieSpider:
@@ -25,7 +45,23 @@ class MovieSpider:
         url: str = BASE_URL,
         logger: logging.Logger = None,
         if_print: bool = False,
+        html_parser: str = "lxml",
+        delay_range: Tuple[float, float] = (1, 3),
+        timeout: float = 10,
+        max_retry_after: float = 60,
+        archive=None,
     ):
+        """
+        Args:
+            url: 榜单首页链接
+            logger: 日志记录器
+            if_print: 是否逐条输出爬取到的电影信息
+            html_parser: BeautifulSoup 使用的解析器（lxml / html.parser / html5lib）
+            delay_range: 每次请求前随机延时的范围(秒)
+            timeout: 请求超时时间(秒)
+            max_retry_after: 服务器通过 Retry-After 要求等待时的最长等待时间(秒)
+            archive: 原始页面归档（PageArchive），为 None 时不归档
+        """
         self.url = url
         self.headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/",  # 反爬虫标识
@@ -34,8 +70,48 @@ class MovieSpider:
             "Connection": "keep-alive",  # 连接方式
         }
         self.movies: List[Dict[str, Optional[str]]] = []  # 存储电影信息的列表
-        self.logger = logger
+        self.logger = logger if logger else logging.getLogger(__name__)
         self.if_print = if_print
+        self.html_parser = html_parser
+        self.delay_range = delay_range
+        self.timeout = timeout
+        self.max_retry_after = max_retry_after
+        self.archive = archive
+        # 请求统计：请求数、重试数、最终失败的页面数、状态码分布、每次请求的延迟
+        self.stats = {
+            "requests": 0,
+            "retries": 0,
+            "failures": 0,
+            "status": Counter(),
+            "latencies": [],
+        }
+        self._stats_lock = threading.Lock()
+        # 条件请求的验证信息：页面链接 -> (ETag, Last-Modified, 页面内容)
+        self._validators: Dict[str, Tuple[Optional[str], Optional[str], str]] = {}
+
+    def _record(self, status, latency: Optional[float] = None, retry: bool = False) -> None:
+        """记录一次请求的结果，用于统计重试次数、状态码分布和延迟"""
+        with self._stats_lock:
+            self.stats["requests"] += 1
+            self.stats["retries"] += int(retry)
+            self.stats["status"][str(status)] += 1
+            if latency is not None:
+                self.stats["latencies"].append(latency)
+        _REQUESTS.inc(status=status)
+        if retry:
+            _RETRIES.inc()
+        if latency is not None:
+            _FETCH_SECONDS.observe(latency)
+
+    def _retry_after(self, response) -> float:
+        """限流响应(429/503)中 Retry-After 指定的等待时间(秒)，最多等待 max_retry_after 秒"""
+        value = response.headers.get("Retry-After")
+        if not value:
+            return 0.0
+        try:
+            return min(float(value), self.max_retry_after)
+        except ValueError:
+            return 0.0
 
     def fetch_page(self, url: str, retries: int = 3) -> Optional[str]:
         """
@@ -48,48 +124,91 @@ class MovieSpider:
         页面HTML内容，如果失败则返回NOne
         """
 
+        headers = dict(self.headers)
+        with self._stats_lock:
+            cached = self._validators.get(url)
+        if cached is not None:
+            etag, last_modified, _ = cached
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+
         for attempt in range(retries):
+            start = None
             try:
                 self.logger.info(f"正在请求页面：{url},第{attempt+1}次尝试")
 
-                time.sleep(random.uniform(1, 3))  # 随机延时，模拟人类行为
+                time.sleep(random.uniform(*self.delay_range))  # 随机延时，模拟人类行为
+                start = time.perf_counter()
                 response = requests.get(
                     url=url,
-                    headers=self.headers,
-                    timeout=10,
+                    headers=headers,
+                    timeout=self.timeout,
                 )
-                print("当前状态码:", response.status_code)
+                latency = time.perf_counter() - start
+                self._record(response.status_code, latency, attempt > 0)
+                self.logger.debug(f"当前状态码: {response.status_code}")
                 if response.status_code == 200:
+                    _FETCH_BYTES.inc(len(response.content))
                     response.encoding = "utf-8"
+                    if self.archive is not None:
+                        try:
+                            self.archive.append(url, response.text, response.status_code, latency)
+                        except OSError as e:
+                            self.logger.error(f"页面归档失败：{url}，错误信息：{e}")
+                    etag, last_modified = response.headers.get("ETag"), response.headers.get("Last-Modified")
+                    if etag or last_modified:
+                        with self._stats_lock:
+                            self._validators[url] = (etag, last_modified, response.text)
                     return response.text
+                elif response.status_code == 304 and cached is not None:
+                    # 页面未变化，使用上次的内容（已归档过，不再重复归档）
+                    return cached[2]
                 else:
                     self.logger.error(f"请求失败，状态码：{response.status_code}")
+                    # 最后一次尝试失败后不再等待
+                    if response.status_code in (429, 503) and attempt < retries - 1:
+                        time.sleep(self._retry_after(response))
                     continue
 
             except requests.exceptions.Timeout as e:
+                self._record("timeout", self.timeout, attempt > 0)
                 self.logger.error(f"第{attempt+1}次请求失败：{url}，错误信息：{e}")
             except requests.exceptions.RequestException as e:
+                latency = time.perf_counter() - start if start is not None else None
+                self._record("error", latency, attempt > 0)
                 self.logger.error(f"第{attempt+1}次请求失败：{url},错误信息：{e}")
             except Exception as e:
                 self.logger.error(f"第{attempt+1}次请求失败：{url},错误信息：{e}")
+        with self._stats_lock:
+            self.stats["failures"] += 1
+        _PAGE_FAILURES.inc()
         return None
 
     def parse_single_movie(self, movie) -> Optional[Dict]:
         """
         解析单个电影信息
+
+        某个字段解析失败时只将该字段置为 None，不丢弃整条记录；
+        字段是否合法由清洗阶段按 config.MOVIE_SCHEMA 统一校验（必填字段缺失的记录移入隔离文件）
         """
         # 电影信息相关映射
         movie_info = MOVIE_INFO.copy()
+        missing = []
 
-        # 爬取电影排名
+        # 爬取电影排名、详情页链接（短评爬取需要其中的电影编号）与海报链接
         div_pic_tag = movie.find("div", class_="pic")
-        movie_rank = div_pic_tag.find("em")
+        movie_rank = div_pic_tag.find("em") if div_pic_tag else None
         if movie_rank:
             movie_info["rank"] = movie_rank.text.strip()
         else:
-            movie_info["rank"] = None
-            self.logger.warning("电影排名未找到")
-            return None
+            missing.append("rank")
+        link_tag = div_pic_tag.find("a") if div_pic_tag else None
+        movie_info["url"] = link_tag.get("href") if link_tag else None
+        movie_info["id"] = subject_id_from_url(movie_info["url"])  # 主键，排名与标题都不能唯一标识电影
+        poster_tag = link_tag.find("img") if link_tag else None
+        movie_info["poster"] = poster_tag.get("src") if poster_tag else None
 
         # 爬取电影标题
         movie_title = movie.find(
@@ -98,110 +217,83 @@ class MovieSpider:
         if movie_title:
             movie_info["title"] = movie_title.text.strip()
         else:
-            movie_info["title"] = None
-            self.logger.warning("电影标题未找到")
-            return None
+            missing.append("title")
 
         # <div class="bd"> 中包含了很多信息：导演，演员，年份，国家，类型，星级，评分，评论人数，短评
         bd_div_tag = movie.find("div", class_="bd")
+        if not bd_div_tag:
+            self.logger.debug("未找到包含电影信息的<div class='bd'>标签")
+            bd_div_tag = movie  # 在整个条目中查找其余字段
 
-        if bd_div_tag:
-            # 爬取导演，演员，年份，国家和类型，这几个信息都存在一个p标签当中
-            p_tag = bd_div_tag.find("p")
-            if p_tag:
-                # 按行进行分割
-                p_text = p_tag.get_text(separator="\n", strip=True)
-                p_lines = [line.strip() for line in p_text.split("\n") if line.strip()]
-                if len(p_lines) >= 2:
-                    first_line = p_lines[0]  # &nbsp已被BeautifulSoup自动处理为普通空格
-
-                    # 解析导演
-                    if "导演:" in first_line:
-                        director = first_line.split("导演:")[1]
-                        if "主演:" in director:
-                            director = director.split("主演:")[0].strip()
-                            movie_info["director"] = director.strip()
-                    else:
-                        movie_info["director"] = None
-                        print("导演信息未找到")
-                        return None
-                    # 解析演员
-                    if "主演:" in first_line:
-                        actors = first_line.split("主演:")[1].strip()
-                        movie_info["actors"] = actors.rstrip("...").strip()
-                    else:
-                        movie_info["actors"] = "unshown"
-                        # self.logger.warning("演员信息未找到，已设置为'unshown'")
-                        # 不返回 None，继续执行
-
-                    # 解析年份，国家和类型
-                    second_line = p_lines[1]
-                    parts = [
-                        part.strip() for part in second_line.split("/") if part.strip()
-                    ]
-                    if len(parts) >= 3:
-                        movie_info["year"] = parts[0]
-                        movie_info["country"] = parts[1]
-                        movie_info["classification"] = parts[2]
-                    else:
-                        self.logger.warning(f"年份/国家/类型信息不完整: {second_line}")
-                        return None
-                else:
-                    self.logger.warning("导演，演员等信息行格式不正确")
-                    return None
+        # 爬取导演，演员，年份，国家和类型，这几个信息都存在一个p标签当中
+        p_tag = bd_div_tag.find("p")
+        p_lines = []
+        if p_tag:
+            # 按行进行分割
+            p_text = p_tag.get_text(separator="\n", strip=True)
+            p_lines = [line.strip() for line in p_text.split("\n") if line.strip()]
 
-            else:
-                self.logger.warning("未找到包含导演，演员等信息的<p>标签")
-                return None
-
-            # 爬取评论星级
-            for star in [
-                "5",
-                "45",
-                "4",
-            ]:  # 分析电影html可知，只有5和45这两种(5表示5星，45表示4.5星, 4表示4星)
-                star_tag = bd_div_tag.find("span", class_=f"rating{star}-t")
-                if star_tag:
-                    movie_info["star-rating"] = star.replace("45", "4.5")
-                    break
-            if not movie_info["star-rating"]:
-                movie_info["star-rating"] = None
-                self.logger.warning("星级评分未找到")
-                return None
-
-            # 爬取评分
-            num_rating_tag = bd_div_tag.find("span", class_="rating_num")
-            if num_rating_tag:
-                movie_info["nums-rating"] = num_rating_tag.text.strip()
-            else:
-                movie_info["nums-rating"] = None
-                self.logger.warning("数字评分未找到")
-                return None
-
-            # 爬取评论人数
-            spans = bd_div_tag.find_all("span")
-            if spans:
-                for span in spans:
-                    if "人评价" in span.text:
-                        movie_info["comment_nums"] = span.text.replace(
-                            "人评价", ""
-                        ).strip()
-                        break
-                if not movie_info["comment_nums"]:
-                    movie_info["comment_nums"] = None
-                    self.logger.warning("评论人数未找到")
-                    return None
-            # 爬取短评
-            quote_tag = movie.find("p", class_="quote")
-            if quote_tag:
-                movie_info["comment"] = quote_tag.text.strip()
-            else:
-                movie_info["comment"] = None  # 短评可以为空，不强制要求
+        first_line = p_lines[0] if p_lines else ""  # &nbsp已被BeautifulSoup自动处理为普通空格
+        # 解析导演
+        if "导演:" in first_line:
+            director = first_line.split("导演:")[1]
+            if "主演:" in director:
+                director = director.split("主演:")[0]
+            movie_info["director"] = director.strip()
         else:
-            self.logger.warning("未找到包含电影信息的<div class='bd'>标签")
+            missing.append("director")
+        # 解析演员
+        if "主演:" in first_line:
+            actors = first_line.split("主演:")[1].strip()
+            movie_info["actors"] = actors.rstrip("...").strip()
+        else:
+            movie_info["actors"] = "unshown"
+
+        # 解析年份，国家和类型（不足三项时按顺序填入已有的部分）
+        second_line = p_lines[1] if len(p_lines) >= 2 else ""
+        parts = [part.strip() for part in second_line.split("/") if part.strip()]
+        for key, part in zip(["year", "country", "classification"], parts):
+            movie_info[key] = part
+        if len(parts) < 3:
+            missing.append("year/country/classification")
+
+        # 爬取评论星级
+        for star in [
+            "5",
+            "45",
+            "4",
+        ]:  # 分析电影html可知，只有5和45这两种(5表示5星，45表示4.5星, 4表示4星)
+            star_tag = bd_div_tag.find("span", class_=f"rating{star}-t")
+            if star_tag:
+                movie_info["star-rating"] = star.replace("45", "4.5")
+                break
+        if not movie_info["star-rating"]:
+            missing.append("star-rating")
 
+        # 爬取评分
+        num_rating_tag = bd_div_tag.find("span", class_="rating_num")
+        if num_rating_tag:
+            movie_info["nums-rating"] = num_rating_tag.text.strip()
+        else:
+            missing.append("nums-rating")
+
+        # 爬取评论人数
+        for span in bd_div_tag.find_all("span"):
+            if "人评价" in span.text:
+                movie_info["comment_nums"] = span.text.replace("人评价", "").strip()
+                break
+        if not movie_info["comment_nums"]:
+            missing.append("comment_nums")
+
+        # 爬取短评（短评可以为空，不强制要求）
+        quote_tag = movie.find("p", class_="quote")
+        movie_info["comment"] = quote_tag.text.strip() if quote_tag else None
+
+        if missing:
+            self.logger.debug(f"电影 {movie_info['title']} 未找到字段: {', '.join(missing)}")
         if self.if_print:
-            print(movie_info)
+            # 参数延迟到确实需要输出时才格式化，该记录器被关闭时几乎没有开销
+            _item_logger.info("%s", movie_info)
         return movie_info
 
     def parse_single_page(
@@ -221,17 +313,19 @@ class MovieSpider:
             self.logger.warning(f"第{page_number}页的内容缺失")
             return None
         else:
-            soup = BeautifulSoup(page_content, "lxml")
-            movies = soup.find_all("div", class_="item")
-            if not movies:
-                self.logger.warning(f"第{page_number}页未找到任何电影项")
-                return None
-            for i, movie in enumerate(movies, 1):
-                movie_info = self.parse_single_movie(movie)
-                if movie_info:
-                    results.append(movie_info)
-                else:
-                    self.logger.warning(f"第{page_number}页的第{i}个电影信息解析失败")
+            with _PARSE_SECONDS.time():
+                soup = BeautifulSoup(page_content, self.html_parser)
+                movies = soup.find_all("div", class_="item")
+                if not movies:
+                    self.logger.warning(f"第{page_number}页未找到任何电影项")
+                    return None
+                for i, movie in enumerate(movies, 1):
+                    try:
+                        results.append(self.parse_single_movie(movie))
+                    except Exception as e:
+                        _PARSE_FAILURES.inc()
+                        self.logger.warning(f"第{page_number}页的第{i}个电影信息解析失败: {e}")
+            _MOVIES_PARSED.inc(len(results))
             return results
 
     def parse_all_pages(self, page_nums: int = 10) -> Optional[List[Dict]]:
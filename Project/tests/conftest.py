@@ -0,0 +1,5 @@
+import os
+import sys
+
+# 与 main.py 一样以 Project 目录为导入根目录
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,43 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import app as app_module
+from utils.columnar_store import ColumnarStore
+from utils.data_store import MovieDataStore
+
+
+@pytest.fixture
+def client(tmp_path):
+    n = 20
+    df = pd.DataFrame(
+        {
+            "id": [str(1000 + i) for i in range(n)],
+            "rank": np.arange(1, n + 1),
+            "title": [f"电影{i}" for i in range(n)],
+            "nums-rating": np.linspace(8.0, 9.7, n).round(1),
+            "comment_nums": np.arange(n) * 1000,
+            "year": np.arange(1990, 1990 + n).astype(float),
+            "country": ["美国 英国", "中国大陆", "日本", "法国"] * (n // 4),
+        }
+    )
+    columnar_path = os.path.join(str(tmp_path), "movies.col")
+    ColumnarStore(columnar_path).publish(df)
+    app = app_module.create_app(profile_rate=0)
+    app.extensions["movie_store"] = MovieDataStore(
+        os.path.join(str(tmp_path), "movies.csv"), columnar_path=columnar_path
+    )
+    return app.test_client()
+
+
+def test_chart_renders(client):
+    response = client.get("/charts/country_distribution.png?year_from=2000")
+    assert response.status_code == 200
+    assert response.mimetype == "image/png"
+
+
+def test_chart_with_no_matching_movies(client):
+    response = client.get("/charts/country_distribution.png?year_from=3000")
+    assert response.status_code == 404
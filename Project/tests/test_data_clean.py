@@ -0,0 +1,34 @@
+import pandas as pd
+import pytest
+
+from utils.data_clean import DataCleaner
+from utils.data_visualization import CHART_METHODS, DataVisualizer
+
+# 旧版 CSV 的表头：没有 id 与 url 列
+_LEGACY_HEADER = "rank,title,director,actors,year,country,classification,star-rating,nums-rating,comment_nums,comment"
+
+
+@pytest.fixture
+def legacy_movies(tmp_path):
+    path = tmp_path / "legacy.csv"
+    rows = [
+        f"{i + 1},电影{i}号,导演{i % 5},演员{i % 7},{1950 + i},美国 中国香港,喜剧 科幻,"
+        f"{4.5 if i % 2 else 5.0},{9.0 + (i % 8) / 10:.1f},{10000 + i * 137},短评{i}"
+        for i in range(30)
+    ]
+    path.write_text("﻿" + "\n".join([_LEGACY_HEADER] + rows) + "\n", encoding="utf-8")
+    return DataCleaner().clean_data(pd.read_csv(path, dtype={"id": str}))
+
+
+def test_legacy_csv_keeps_positional_index(legacy_movies):
+    assert len(legacy_movies) == 30
+    assert legacy_movies.index.is_unique
+    assert list(legacy_movies.index) == list(range(30))
+
+
+@pytest.mark.parametrize("method", CHART_METHODS)
+def test_legacy_csv_renders_every_chart(legacy_movies, tmp_path, method):
+    visualizer = DataVisualizer(save_dir=str(tmp_path / "images"), dpi=50, use_cache=False)
+    # 直接调用绘图方法，绘制失败时抛出异常（generate_all_charts 只记录日志）
+    getattr(visualizer, method)(legacy_movies, show=False)
+    assert (tmp_path / "images" / f"{method[len('plot_'):]}.png").exists()
@@ -0,0 +1,41 @@
+import os
+import gzip
+from datetime import datetime
+
+from utils.history_store import HistoryStore
+
+
+def _movies(offset):
+    return [
+        {"id": str(1000 + i), "title": f"电影{i}", "rank": i + 1 + offset, "nums-rating": 9.0, "comment_nums": 100 + i}
+        for i in range(5)
+    ]
+
+
+def test_append_after_torn_tail(tmp_path):
+    store = HistoryStore(str(tmp_path))
+    store.append(_movies(0), datetime(2025, 1, 1))
+    store.append(_movies(1), datetime(2025, 1, 2))
+    good_size = os.path.getsize(store.history_path)
+
+    # 模拟写入中断：末尾只写了半个 gzip 成员
+    member = gzip.compress(b'{"t":"2025-01-03T00:00:00"}\n')
+    with open(store.history_path, "ab") as f:
+        f.write(member[: len(member) // 2])
+    assert len(store.load()) == 2
+
+    store.append(_movies(2), datetime(2025, 1, 4))
+    history = store.load()
+    assert len(history) == 3
+    assert [p["rank"] for p in history.series("1000")["points"]] == [1, 2, 3]
+    assert os.path.getsize(store.history_path) > good_size
+
+
+def test_garbage_tail_is_ignored(tmp_path):
+    store = HistoryStore(str(tmp_path))
+    store.append(_movies(0), datetime(2025, 1, 1))
+    with open(store.history_path, "ab") as f:
+        f.write(b"\x1f\x8bgarbage")
+    assert len(store.load()) == 1
+    store.append(_movies(1), datetime(2025, 1, 2))
+    assert len(store.load()) == 2
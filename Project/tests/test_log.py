@@ -0,0 +1,19 @@
+import json
+import logging
+
+from utils.log import setup_logging, stop_logging
+
+
+def test_json_log_keeps_traceback_out_of_message(tmp_path):
+    path = tmp_path / "run.log"
+    setup_logging(log_path=str(path), json_format=True, console=False)
+    try:
+        try:
+            raise ZeroDivisionError("division by zero")
+        except ZeroDivisionError:
+            logging.getLogger("test_log").exception("失败 %s", 1)
+    finally:
+        stop_logging()
+    entry = json.loads(path.read_text(encoding="utf-8").splitlines()[-1])
+    assert entry["message"] == "失败 1"
+    assert "ZeroDivisionError" in entry["exc_info"]
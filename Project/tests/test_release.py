@@ -0,0 +1,37 @@
+import os
+
+from utils.release import ReleaseStore
+
+
+def _write(path, text):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp_path, path)  # 与各阶段一样原子替换
+
+
+def test_publish_switches_all_files_together(tmp_path):
+    csv_path = os.path.join(str(tmp_path), "movies.csv")
+    index_path = os.path.join(str(tmp_path), "index.json.gz")
+    store = ReleaseStore(os.path.join(str(tmp_path), "releases"), keep=2)
+    assert store.current() is None
+
+    _write(csv_path, "v1")
+    _write(index_path, "i1")
+    first = store.publish({"csv": csv_path, "search_index": index_path, "columnar": None})
+    assert store.publish({"csv": csv_path, "search_index": index_path}) == first
+
+    # 新文件写入后，已发布的版本内容不变，切换指针前读取方仍看到旧版本
+    _write(csv_path, "v2")
+    release = store.current()
+    assert release["version"] == first
+    with open(release["csv"], encoding="utf-8") as f:
+        assert f.read() == "v1"
+
+    os.utime(index_path)
+    second = store.publish({"csv": csv_path, "search_index": index_path})
+    assert second != first
+    release = store.current()
+    with open(release["csv"], encoding="utf-8") as f:
+        assert f.read() == "v2"
+    assert set(release) == {"version", "csv", "search_index"}
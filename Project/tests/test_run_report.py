@@ -0,0 +1,50 @@
+import json
+import logging
+from types import SimpleNamespace
+
+import pandas as pd
+
+import main
+from utils.data_clean import DataCleaner
+from utils.pipeline import Pipeline, Stage
+
+
+def test_run_report_only_counts_current_run(tmp_path, monkeypatch):
+    movies = pd.DataFrame(
+        {
+            "rank": [1, 2, 3],
+            "title": ["电影甲", "电影乙", "电影丙"],
+            "director": ["导演"] * 3,
+            "actors": ["演员"] * 3,
+            "year": [1994, 1993, 1997],
+            "country": ["美国"] * 3,
+            "classification": ["剧情"] * 3,
+            "star-rating": [5.0] * 3,
+            "nums-rating": [9.7, 9.6, 9.5],
+            "comment_nums": [100, 200, 300],
+            "comment": ["短评"] * 3,
+        }
+    )
+
+    def clean(ctx):
+        DataCleaner().clean_data(movies)
+
+    monkeypatch.setattr(
+        main, "build_pipeline", lambda *a, **kw: Pipeline(max_workers=1).add(Stage("clean", clean))
+    )
+    report_path = tmp_path / "run_report.json"
+    args = SimpleNamespace(
+        profile=False,
+        stages=["clean"],
+        if_publish_release=False,
+        show_charts=False,
+        timing=False,
+        metrics_report=str(report_path),
+    )
+    logger = logging.getLogger("test_run_report")
+
+    for _ in range(2):  # 与定时模式相同：同一进程中运行两次
+        assert main.run_pipeline(args, logger, 0.0)
+    report = json.loads(report_path.read_text(encoding="utf-8"))
+    assert report["ok"] is True
+    assert report["metrics"]["douban_clean_rows_total"] == 3
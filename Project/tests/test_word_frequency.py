@@ -0,0 +1,52 @@
+import os
+import gzip
+import json
+
+from utils.word_frequency import WordFrequencyEngine
+
+
+def _write_comments(path, comments):
+    # 与 review_spider 相同：每次追加写入一个新的 gzip 成员
+    with gzip.open(path, "at", encoding="utf-8") as f:
+        for comment in comments:
+            f.write(json.dumps({"comment": comment}, ensure_ascii=False) + "\n")
+
+
+def _engine(store_dir):
+    return WordFrequencyEngine(str(store_dir), stopwords_path=None, max_workers=1)
+
+
+def test_gzip_source_resumes_from_member_offset(tmp_path):
+    source = str(tmp_path / "reviews.jsonl.gz")
+    _write_comments(source, ["电影", "电影"])
+    engine = _engine(tmp_path / "store")
+    assert engine.update([source]) == 2
+
+    _write_comments(source, ["电影"])
+    # 模拟正在追加：末尾只写了半个成员
+    member = gzip.compress(json.dumps({"comment": "电影"}, ensure_ascii=False).encode("utf-8") + b"\n")
+    with open(source, "ab") as f:
+        f.write(member[: len(member) // 2])
+    assert engine.update([source]) == 1
+    assert engine.update([source]) == 0
+    assert dict(engine.iter_counts())["电影"] == 3
+
+
+def test_counts_and_state_switch_together(tmp_path):
+    source = str(tmp_path / "reviews.jsonl.gz")
+    _write_comments(source, ["电影"])
+    engine = _engine(tmp_path / "store")
+    engine.update([source])
+
+    # 模拟归并后、保存 state.json 前中断：新一代词频文件已写入但没有生效
+    _write_comments(source, ["电影"])
+    engine._save_state = lambda: None
+    engine.update([source])
+    engine = _engine(tmp_path / "store")
+    assert dict(engine.iter_counts())["电影"] == 1
+
+    engine.update([source])
+    assert dict(engine.iter_counts())["电影"] == 2
+    assert [name for name in os.listdir(engine.store_dir) if name.startswith("counts")] == [
+        os.path.basename(engine.counts_path)
+    ]
@@ -0,0 +1,112 @@
+"""
+图表渲染缓存模块，为 Web 应用按需绘制的图表提供按字节数限制容量的 LRU 缓存
+
+下面是对RenderCache类中各个方法的介绍：
+    __init__(): 初始化缓存，设置容量上限（字节）
+    get_or_render(): 命中则直接返回；未命中时调用渲染函数，
+        同一个键的并发请求只会渲染一次，其余请求等待该次渲染的结果
+    stats(): 返回命中/未命中/合并/淘汰次数及当前占用
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Optional
+
+
+class _InFlight:
+    """正在渲染中的请求，等待者通过 event 获取结果"""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result: Optional[bytes] = None
+        self.error: Optional[BaseException] = None
+
+
+class RenderCache:
+    """
+    按字节数限制容量的 LRU 缓存，带渲染合并
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        """
+        Args:
+            max_bytes: 缓存内容的总字节数上限
+        """
+        self.max_bytes = max_bytes
+        self._items: "OrderedDict[Hashable, bytes]" = OrderedDict()
+        self._inflight: Dict[Hashable, _InFlight] = {}
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    def _put(self, key: Hashable, value: bytes) -> None:
+        """写入缓存并按 LRU 淘汰，调用方需持有锁"""
+        if len(value) > self.max_bytes:
+            return
+        old = self._items.pop(key, None)
+        if old is not None:
+            self._size -= len(old)
+        self._items[key] = value
+        self._size += len(value)
+        while self._size > self.max_bytes:
+            _, evicted = self._items.popitem(last=False)
+            self._size -= len(evicted)
+            self.evictions += 1
+
+    def get_or_render(self, key: Hashable, render: Callable[[], bytes]) -> bytes:
+        """
+        获取缓存内容，未命中时渲染
+
+        Args:
+            key: 缓存键（应包含数据版本与所有渲染参数）
+            render: 渲染函数，返回图片字节
+        """
+        with self._lock:
+            value = self._items.get(key)
+            if value is not None:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return value
+            inflight = self._inflight.get(key)
+            if inflight is None:
+                inflight = _InFlight()
+                self._inflight[key] = inflight
+                owner = True
+                self.misses += 1
+            else:
+                owner = False
+                self.coalesced += 1
+
+        if not owner:
+            inflight.event.wait()
+            if inflight.error is not None:
+                raise inflight.error
+            return inflight.result
+
+        try:
+            value = render()
+            inflight.result = value
+            with self._lock:
+                self._put(key, value)
+            return value
+        except BaseException as e:
+            inflight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            inflight.event.set()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "evictions": self.evictions,
+                "items": len(self._items),
+                "bytes": self._size,
+            }
@@ -0,0 +1,321 @@
+"""
+列式数据存储模块，将电影数据发布为一个内存映射的列式文件，供多个 Web 工作进程共享读取
+
+文件格式（所有数据块按 64 字节对齐）：
+    8 字节魔数 | 8 字节头部长度 | JSON 头部 | 数值列(定长数组) | 字符串列(偏移数组 + 空值掩码 + UTF-8 数据块)
+
+下面是对各个类和方法的介绍：
+    ColumnarDataset: 只读的数据集视图，列数据均为内存映射上的零拷贝 NumPy 视图
+        column(): 获取数值列（零拷贝）
+        string_at(): 获取字符串列中的单个值
+        strings(): 解码整列（或指定行范围内的）字符串
+        record(): 解码单行记录
+        iter_records(): 按块解码并逐行生成记录字典，不会一次性解码整个数据集
+        to_frame(): 转换为 DataFrame（可以只转换指定的列）
+    RecordView: 记录的只读序列视图，按下标或迭代访问时才解码对应的行
+    ColumnarStore: 列式文件的发布与打开
+        publish(): 将 DataFrame 写入临时文件后原子替换，已打开旧文件的进程不受影响
+        open(): 打开（或在文件被替换后重新映射）当前数据集
+"""
+
+import os
+import json
+import struct
+import logging
+import threading
+import numpy as np
+import pandas as pd
+from collections.abc import Sequence
+from typing import Dict, Iterator, List, Optional
+
+MAGIC = b"DBCOL001"
+ALIGNMENT = 64
+
+
+def _align(offset: int) -> int:
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+class ColumnarDataset:
+    """
+    内存映射的只读数据集
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        stat = os.stat(path)
+        self.version = stat.st_mtime_ns
+        self.inode = stat.st_ino
+        # mode="r" 使用只读共享映射，多个进程映射同一文件时共享物理内存页
+        self._buffer = np.memmap(path, dtype=np.uint8, mode="r")
+        if bytes(self._buffer[:8]) != MAGIC:
+            raise ValueError(f"不是有效的列式数据文件: {path}")
+        (header_len,) = struct.unpack("<Q", bytes(self._buffer[8:16]))
+        header = json.loads(bytes(self._buffer[16 : 16 + header_len]).decode("utf-8"))
+        self.nrows: int = header["nrows"]
+        self._columns: Dict[str, Dict] = {c["name"]: c for c in header["columns"]}
+        self.columns: List[str] = [c["name"] for c in header["columns"]]
+
+    def _view(self, offset: int, dtype, count: int) -> np.ndarray:
+        return np.frombuffer(self._buffer, dtype=dtype, count=count, offset=offset)
+
+    def is_numeric(self, name: str) -> bool:
+        return self._columns[name]["kind"] == "numeric"
+
+    def column(self, name: str) -> np.ndarray:
+        """获取数值列的零拷贝视图"""
+        meta = self._columns[name]
+        if meta["kind"] != "numeric":
+            raise TypeError(f"列 {name} 不是数值列")
+        return self._view(meta["offset"], np.dtype(meta["dtype"]), self.nrows)
+
+    def _string_parts(self, name: str):
+        meta = self._columns[name]
+        if meta["kind"] != "string":
+            raise TypeError(f"列 {name} 不是字符串列")
+        offsets = self._view(meta["offsets_offset"], np.int64, self.nrows + 1)
+        nulls = self._view(meta["nulls_offset"], np.uint8, self.nrows)
+        return offsets, nulls, meta["data_offset"]
+
+    def string_at(self, name: str, i: int) -> Optional[str]:
+        """获取字符串列第 i 行的值，空值返回 None"""
+        offsets, nulls, data_offset = self._string_parts(name)
+        if nulls[i]:
+            return None
+        start, end = int(offsets[i]), int(offsets[i + 1])
+        return bytes(self._buffer[data_offset + start : data_offset + end]).decode(
+            "utf-8"
+        )
+
+    def strings(self, name: str, start: int = 0, stop: Optional[int] = None) -> List[Optional[str]]:
+        """解码整列字符串，指定 start / stop 时只解码该范围内的行"""
+        offsets, nulls, data_offset = self._string_parts(name)
+        stop = self.nrows if stop is None else min(stop, self.nrows)
+        if start >= stop:
+            return []
+        base = int(offsets[start])
+        blob = bytes(self._buffer[data_offset + base : data_offset + int(offsets[stop])])
+        bounds = (offsets[start : stop + 1] - base).tolist()
+        return [
+            None if nulls[start + i] else blob[bounds[i] : bounds[i + 1]].decode("utf-8")
+            for i in range(stop - start)
+        ]
+
+    def _chunk_values(self, name: str, start: int, stop: int, fill_value) -> list:
+        """[start, stop) 行的值（Python 原生类型），缺失值替换为 fill_value"""
+        if self.is_numeric(name):
+            values = self.column(name)[start:stop].tolist()
+            return [fill_value if value != value else value for value in values]  # NaN
+        return [fill_value if value is None else value for value in self.strings(name, start, stop)]
+
+    def record(self, i: int, columns: Optional[List[str]] = None, fill_value=None) -> Dict:
+        """解码第 i 行"""
+        if not 0 <= i < self.nrows:
+            raise IndexError(f"行号超出范围: {i}")
+        columns = columns if columns else self.columns
+        return {name: self._chunk_values(name, i, i + 1, fill_value)[0] for name in columns}
+
+    def iter_records(
+        self, columns: Optional[List[str]] = None, fill_value=None, chunk_size: int = 1000
+    ) -> Iterator[Dict]:
+        """按块解码并逐行生成记录字典，内存占用只与分块大小有关"""
+        columns = columns if columns else self.columns
+        for start in range(0, self.nrows, chunk_size):
+            stop = min(start + chunk_size, self.nrows)
+            chunk = [self._chunk_values(name, start, stop, fill_value) for name in columns]
+            for row in zip(*chunk):
+                yield dict(zip(columns, row))
+
+    def to_frame(self, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """转换为 DataFrame（字符串列需要解码，数值列直接引用映射内存），可以只转换指定的列"""
+        columns = list(columns) if columns else self.columns
+        data = {}
+        for name in columns:
+            if self.is_numeric(name):
+                data[name] = self.column(name)
+            else:
+                data[name] = self.strings(name)
+        return pd.DataFrame(data, columns=columns, copy=False)
+
+
+class RecordView(Sequence):
+    """
+    数据集记录的只读序列视图，本身不保存任何解码结果：
+    按下标访问时只解码该行，迭代时按块解码，遍历结束后解码结果即可回收
+    """
+
+    def __init__(self, dataset: ColumnarDataset, fill_value=None):
+        self.dataset = dataset
+        self.fill_value = fill_value
+
+    def __len__(self) -> int:
+        return self.dataset.nrows
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        return self.dataset.record(i, fill_value=self.fill_value)
+
+    def __iter__(self) -> Iterator[Dict]:
+        return self.dataset.iter_records(fill_value=self.fill_value)
+
+
+class ColumnarStore:
+    """
+    列式文件的发布与打开
+    """
+
+    def __init__(self, path: str, logger: logging.Logger = None):
+        """
+        Args:
+            path: 列式文件路径
+            logger: 日志记录器
+        """
+        self.path = path
+        self.logger = logger if logger else logging.getLogger(__name__)
+        self._dataset: Optional[ColumnarDataset] = None
+        self._lock = threading.Lock()
+
+    def publish(self, df: pd.DataFrame) -> bool:
+        """
+        将 DataFrame 发布为列式文件
+
+        先写入同目录下的临时文件，再通过 os.replace 原子替换，
+        读取方要么看到旧文件，要么看到完整的新文件
+
+        Returns:
+            是否发布成功（失败时保留原文件并记录错误）
+        """
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+            columns_meta = []
+            blocks = []  # (相对数据区起点的偏移, bytes)
+            cursor = 0
+            nrows = len(df)
+
+            def add_block(payload: bytes) -> int:
+                nonlocal cursor
+                cursor = _align(cursor)
+                offset = cursor
+                blocks.append((offset, payload))
+                cursor += len(payload)
+                return offset
+
+            for name in df.columns:
+                series = df[name]
+                if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+                    if pd.api.types.is_integer_dtype(series):
+                        array = series.to_numpy(dtype=np.int64)
+                    else:
+                        array = series.to_numpy(dtype=np.float64, na_value=np.nan)
+                    offset = add_block(np.ascontiguousarray(array).tobytes())
+                    columns_meta.append(
+                        {
+                            "name": str(name),
+                            "kind": "numeric",
+                            "dtype": array.dtype.str,
+                            "offset": offset,
+                        }
+                    )
+                else:
+                    values = series.tolist()
+                    nulls = np.zeros(nrows, dtype=np.uint8)
+                    offsets = np.zeros(nrows + 1, dtype=np.int64)
+                    encoded = []
+                    total = 0
+                    for i, value in enumerate(values):
+                        if value is None or (isinstance(value, float) and value != value):
+                            nulls[i] = 1
+                            data = b""
+                        else:
+                            data = str(value).encode("utf-8")
+                        encoded.append(data)
+                        total += len(data)
+                        offsets[i + 1] = total
+                    columns_meta.append(
+                        {
+                            "name": str(name),
+                            "kind": "string",
+                            "offsets_offset": add_block(offsets.tobytes()),
+                            "nulls_offset": add_block(nulls.tobytes()),
+                            "data_offset": add_block(b"".join(encoded)),
+                        }
+                    )
+
+            # 头部长度确定后，把数据区的相对偏移换算为文件内的绝对偏移
+            def build_header(base: int) -> bytes:
+                meta = []
+                for column in columns_meta:
+                    column = dict(column)
+                    for key in ("offset", "offsets_offset", "nulls_offset", "data_offset"):
+                        if key in column:
+                            column[key] += base
+                    meta.append(column)
+                return json.dumps(
+                    {"nrows": nrows, "columns": meta}, ensure_ascii=False
+                ).encode("utf-8")
+
+            base = 0
+            while True:
+                header = build_header(base)
+                needed = _align(16 + len(header))
+                if needed <= base:
+                    break
+                base = needed
+
+            tmp_path = f"{self.path}.tmp.{os.getpid()}"
+            try:
+                with open(tmp_path, "wb") as f:
+                    f.write(MAGIC)
+                    f.write(struct.pack("<Q", len(header)))
+                    f.write(header)
+                    for offset, payload in blocks:
+                        f.seek(base + offset)
+                        f.write(payload)
+                    f.truncate(base + _align(cursor))
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, self.path)
+            finally:
+                # 写入或替换失败时删除临时文件（替换成功后临时文件已不存在）
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+            self.logger.info(f"列式数据已发布至 {self.path}，共 {nrows} 条记录")
+            return True
+        except Exception as e:
+            self.logger.error(f"发布列式数据失败: {e}")
+            return False
+
+    def open(self) -> Optional[ColumnarDataset]:
+        """
+        打开当前数据集
+
+        文件被替换（inode 变化）后重新映射新文件；旧映射由仍在使用它的请求持有，
+        引用释放后自动回收。文件不存在时返回 None
+        """
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        dataset = self._dataset
+        if (
+            dataset is not None
+            and dataset.inode == stat.st_ino
+            and dataset.version == stat.st_mtime_ns
+        ):
+            return dataset
+        with self._lock:
+            dataset = self._dataset
+            if (
+                dataset is None
+                or dataset.inode != stat.st_ino
+                or dataset.version != stat.st_mtime_ns
+            ):
+                dataset = ColumnarDataset(self.path)
+                self._dataset = dataset
+            return dataset
@@ -4,14 +4,30 @@
 下面是对DataCleaner类中各个方法的介绍：
     __init__(): 初始化数据清洗器，设置日志记录器
     clean_data(): 对原始数据进行清洗和预处理，返回清洗后的DataFrame
-        1. 数值类型转换：将评分、评论数、年份等字段转换为合适的数值类型
-        2. 文本清洗：去除标题、导演、演员等文本字段的首尾空格，处理空值
-        3. 数据验证：检查数据完整性，记录清洗过程中的统计信息
+        1. 按 config.MOVIE_SCHEMA 整列校验（utils.validation）：数值类型转换、正则提取、
+           范围与可选值检查，文本去除首尾空格并统一空值；选填字段的非法值置空，记录保留
+        2. 必填字段未通过校验的记录移入隔离文件（附带原因），各字段的失败率输出到日志
+        3. 按豆瓣编号去重（utils.movie_id），返回的 DataFrame 使用位置索引（0..n-1）
+    清洗耗时、行数与各列的缺失值数量登记在全局指标（utils.metrics）中
 """
 
+import os
+import sys
+import time
 import pandas as pd
-from typing import List, Dict, Union
+from typing import List, Dict, Optional, Union
 import logging
+from utils.metrics import REGISTRY
+from utils.validation import SchemaValidator, ValidationReport
+from utils.movie_id import dedupe_movies, extract_ids
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import MOVIE_SCHEMA
+
+_CLEAN_SECONDS = REGISTRY.histogram("douban_clean_seconds", "数据清洗耗时(秒)")
+_CLEAN_ROWS = REGISTRY.counter("douban_clean_rows_total", "清洗的数据行数")
+_DUPLICATES = REGISTRY.counter("douban_clean_duplicates_total", "按编号去重时去掉的重复记录数")
+_NULL_VALUES = REGISTRY.gauge("douban_clean_null_values", "最近一次清洗后各列的缺失值数量", ["column"])
 
 
 class DataCleaner:
@@ -19,8 +35,22 @@ class DataCleaner:
     数据清洗工具类
     """
 
-    def __init__(self, logger: logging.Logger = None):
+    def __init__(
+        self,
+        logger: logging.Logger = None,
+        schema: Dict[str, Dict] = MOVIE_SCHEMA,
+        quarantine_path: Optional[str] = None,
+    ):
+        """
+        Args:
+            logger: 日志记录器
+            schema: 字段校验规则，默认为 config.MOVIE_SCHEMA
+            quarantine_path: 隔离文件路径，为 None 时未通过校验的记录只丢弃并记录日志
+        """
         self.logger = logger if logger else logging.getLogger(__name__)
+        self.validator = SchemaValidator(schema, logger=self.logger)
+        self.quarantine_path = quarantine_path
+        self.last_report: Optional[ValidationReport] = None  # 最近一次清洗的校验结果
 
     def clean_data(self, data: Union[List[Dict], pd.DataFrame]) -> pd.DataFrame:
         """
@@ -30,9 +60,10 @@ class DataCleaner:
             data: 原始数据，可以是列表或DataFrame
 
         Returns:
-            清洗后的DataFrame
+            清洗后的DataFrame（只包含通过校验的记录）
         """
         self.logger.info("开始进行数据清洗...")
+        start = time.perf_counter()
 
         # 统一转换为DataFrame
         if isinstance(data, list):
@@ -40,31 +71,31 @@ class DataCleaner:
         else:
             df = data.copy()
 
-        # 1. 数值类型转换
-        # 处理评分，转换为浮点数
-        df["nums-rating"] = pd.to_numeric(df["nums-rating"], errors="coerce")
-
-        # 处理评论数，转换为整数
-        df["comment_nums"] = pd.to_numeric(df["comment_nums"], errors="coerce")
-
-        # 处理年份，转换为整数
-        df["year"] = pd.to_numeric(df["year"], errors="coerce")
-
-        # 2. 文本清洗
-        text_columns = [
-            "title",
-            "director",
-            "actors",
-            "country",
-            "classification",
-            "comment",
-        ]
-        for col in text_columns:
-            if col in df.columns:
-                # 去除首尾空格，处理可能的空值
-                df[col] = df[col].astype(str).str.strip()
-                # 将字符串 'None' 或 'nan' 替换为实际的 NaN
-                df[col] = df[col].replace({"None": None, "nan": None, "": None})
+        # 旧数据没有编号列时从详情页链接中提取
+        if "url" in df.columns:
+            ids = extract_ids(df["url"])
+            df["id"] = df["id"].fillna(ids) if "id" in df.columns else ids
+
+        # 1. 按字段规则整列校验：数值类型转换、文本去除首尾空格、空值统一为缺失
+        report = self.validator.validate(df)
+        self.last_report = report
+        df = report.valid
+
+        # 2. 必填字段未通过校验的记录移入隔离文件
+        if self.quarantine_path and not report.quarantined.empty:
+            self.validator.quarantine(report, self.quarantine_path)
+        elif not report.quarantined.empty:
+            self.logger.warning(f"{len(report.quarantined)} 条记录未通过校验，已丢弃")
+
+        # 3. 按编号去重（哈希索引），去重与隔离后重新编排位置索引
+        df, removed = dedupe_movies(df, self.logger)
+        _DUPLICATES.inc(removed)
+        df = df.reset_index(drop=True)
+
+        _CLEAN_SECONDS.observe(time.perf_counter() - start)
+        _CLEAN_ROWS.inc(len(df))
+        for col, nulls in df.isna().sum().items():
+            _NULL_VALUES.set(int(nulls), column=col)
 
         self.logger.info("数据清洗完成")
         return df
@@ -5,15 +5,23 @@
     __init__(): 初始化数据保存器，设置日志记录器
     _ensure_dir(): 私有方法，确保保存路径的目录存在，如不存在则创建
     _convert_to_df(): 私有方法，将数据统一转换为DataFrame格式
+    _write_atomic(): 私有方法，先写入同目录下的临时文件再原子替换，读取方不会读到写了一半的文件
     save_to_csv(): 将数据保存为CSV格式文件
     save_to_excel(): 将数据保存为Excel格式文件
     save_to_json(): 将数据保存为JSON格式文件
+    _record(): 私有方法，将保存耗时与文件大小登记到全局指标（utils.metrics）
 """
 
 import os
+import time
 import pandas as pd
 from typing import List, Dict, Union
 import logging
+from utils.metrics import REGISTRY
+
+_SAVE_SECONDS = REGISTRY.histogram("douban_save_seconds", "数据保存耗时(秒)", ["format"])
+_SAVE_BYTES = REGISTRY.gauge("douban_save_bytes", "最近一次保存的文件大小(字节)", ["format"])
+_SAVE_FAILURES = REGISTRY.counter("douban_save_failures_total", "数据保存失败次数", ["format"])
 
 
 class DataSaver:
@@ -56,6 +64,22 @@ class DataSaver:
         else:
             raise ValueError("数据必须是 List[Dict] 或 pd.DataFrame")
 
+    def _write_atomic(self, save_path: str, write) -> None:
+        """调用 write(临时文件路径) 写入数据，成功后原子替换目标文件，失败时删除临时文件"""
+        root, ext = os.path.splitext(save_path)
+        tmp_path = f"{root}.tmp.{os.getpid()}{ext}"  # 保留扩展名，Excel 写入器按扩展名选择格式
+        try:
+            write(tmp_path)
+            os.replace(tmp_path, save_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _record(self, fmt: str, save_path: str, start: float) -> None:
+        """登记保存耗时与文件大小"""
+        _SAVE_SECONDS.observe(time.perf_counter() - start, format=fmt)
+        _SAVE_BYTES.set(os.path.getsize(save_path), format=fmt)
+
     def save_to_csv(
         self, movies: Union[List[Dict], pd.DataFrame], save_path: str
     ) -> bool:
@@ -67,13 +91,18 @@ class DataSaver:
                 self.logger.warning("没有任何电影数据可保存")
                 return False
 
+            start = time.perf_counter()
             self._ensure_dir(save_path)
 
             df = self._convert_to_df(movies)
-            df.to_csv(save_path, index=False, encoding="utf-8-sig")
+            self._write_atomic(
+                save_path, lambda path: df.to_csv(path, index=False, encoding="utf-8-sig")
+            )
+            self._record("csv", save_path, start)
             self.logger.info(f"电影数据已保存至 {save_path}，共 {len(df)} 条记录")
             return True
         except Exception as e:
+            _SAVE_FAILURES.inc(format="csv")
             self.logger.error(f"保存CSV失败: {e}")
             return False
 
@@ -88,13 +117,18 @@ class DataSaver:
                 self.logger.warning("没有任何电影数据可保存")
                 return False
 
+            start = time.perf_counter()
             self._ensure_dir(save_path)
 
             df = self._convert_to_df(movies)
-            df.to_excel(save_path, index=False, engine="openpyxl")
+            self._write_atomic(
+                save_path, lambda path: df.to_excel(path, index=False, engine="openpyxl")
+            )
+            self._record("excel", save_path, start)
             self.logger.info(f"电影数据已保存至 {save_path}，共 {len(df)} 条记录")
             return True
         except Exception as e:
+            _SAVE_FAILURES.inc(format="excel")
             self.logger.error(f"保存Excel失败: {e}")
             return False
 
@@ -109,14 +143,20 @@ class DataSaver:
                 self.logger.warning("没有任何电影数据可保存")
                 return False
 
+            start = time.perf_counter()
             self._ensure_dir(save_path)
 
             df = self._convert_to_df(movies)
             # 使用pandas的to_json方法
-            df.to_json(save_path, orient="records", force_ascii=False, indent=2)
+            self._write_atomic(
+                save_path,
+                lambda path: df.to_json(path, orient="records", force_ascii=False, indent=2),
+            )
 
+            self._record("json", save_path, start)
             self.logger.info(f"电影数据已保存至 {save_path}，共 {len(df)} 条记录")
             return True
         except Exception as e:
+            _SAVE_FAILURES.inc(format="json")
             self.logger.error(f"保存JSON失败: {e}")
             return False
@@ -0,0 +1,255 @@
+"""
+数据缓存模块，用于 Web 应用在进程内缓存电影数据以及由其派生的统计结果
+
+下面是对MovieDataStore类中各个方法的介绍：
+    __init__(): 初始化数据缓存，设置数据文件路径与检查间隔
+    _paths(): 私有方法，当前使用的数据文件（存在发布的数据版本时只使用该版本中的文件）
+    _file_version(): 私有方法，获取数据文件的版本号（优先使用列式文件）
+    _build_snapshot(): 私有方法，读取数据文件并构造一份不可变的数据快照
+        存在列式文件时直接映射该文件，数值统计在零拷贝视图上完成，记录列表与 DataFrame
+        都不预先解码，多个工作进程共享同一份物理内存；否则退回到读取 CSV
+    _compute_score_analytics(): 私有方法，预先计算 /score 页面需要的统计数据
+    snapshot(): 获取当前数据快照，必要时检查数据文件是否更新（更新后在后台加载新快照）
+    refresh(): 在后台重新加载数据文件，加载完成后原子地替换快照
+    warm(): 预加载数据并计算统计结果（在多进程服务器 fork 之前调用）
+    get_dataframe(): 获取电影数据 DataFrame（位置索引，未填充空值，供统计和绘图使用）
+    get_records(): 获取 /movie 页面使用的记录列表（列式数据上为按需解码的视图）
+    get_score_analytics(): 获取 /score 页面使用的统计数据
+"""
+
+import os
+import time
+import logging
+import threading
+import pandas as pd
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from utils.columnar_store import ColumnarDataset, ColumnarStore, RecordView
+from utils.entity_index import ENTITY_FIELDS, EntityIndex
+from utils.release import ReleaseStore
+
+
+class DataSnapshot:
+    """
+    一份只读的数据快照，请求处理期间只读取快照，不会被其他线程修改
+    """
+
+    def __init__(
+        self,
+        df_factory: Callable[[], pd.DataFrame],
+        records: Sequence[Dict],
+        score_analytics: Dict[str, list],
+        version: int,
+        dataset: Optional[ColumnarDataset] = None,
+    ):
+        self._df_factory = df_factory
+        self._df: Optional[pd.DataFrame] = None
+        self._entities: Optional[EntityIndex] = None
+        self.records = records
+        self.score_analytics = score_analytics
+        self.version = version  # 数据文件的修改时间(纳秒)，0 表示无数据
+        self.dataset = dataset  # 列式数据集，未发布列式文件时为 None
+
+    @property
+    def df(self) -> pd.DataFrame:
+        """完整的 DataFrame 在第一次使用时才构造（列式数据上需要解码所有字符串列）"""
+        if self._df is None:
+            self._df = self._df_factory()
+        return self._df
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self.dataset.columns) if self.dataset is not None else list(self.df.columns)
+
+    def frame(self, columns: List[str]) -> pd.DataFrame:
+        """只包含指定列的 DataFrame，列式数据上只解码这些列，不构造完整的 DataFrame"""
+        if self.dataset is not None and self._df is None:
+            return self.dataset.to_frame(columns)
+        return self.df[columns]
+
+    @property
+    def entities(self) -> EntityIndex:
+        """多值字段的关联表，每个快照只构建一次"""
+        if self._entities is None:
+            columns = [field for field in ENTITY_FIELDS if field in self.columns]
+            self._entities = EntityIndex.for_frame(self.frame(columns))
+        return self._entities
+
+
+class MovieDataStore:
+    """
+    电影数据缓存类，数据只在数据文件变化时重新读取
+    """
+
+    def __init__(
+        self,
+        csv_path: str,
+        logger: logging.Logger = None,
+        check_interval: float = 5.0,
+        columnar_path: Optional[str] = None,
+        release: Optional[ReleaseStore] = None,
+    ):
+        """
+        初始化数据缓存
+
+        Args:
+            csv_path: CSV 数据文件路径
+            logger: 日志记录器
+            check_interval: 两次检查数据文件是否更新之间的最小间隔(秒)
+            columnar_path: 列式数据文件路径（可选，存在时优先使用）
+            release: 数据版本（可选，已发布过版本时忽略 csv_path 与 columnar_path，只读取当前版本中的文件）
+        """
+        self.csv_path = csv_path
+        self.columnar_path = columnar_path
+        self.release = release
+        self.columnar: Optional[ColumnarStore] = None
+        self.logger = logger if logger else logging.getLogger(__name__)
+        self.check_interval = check_interval
+        self._snapshot: Optional[DataSnapshot] = None
+        self._last_check = 0.0
+        self._lock = threading.Lock()
+        self._reload_thread: Optional[threading.Thread] = None
+
+    def _paths(self) -> Tuple[Optional[str], Optional[str]]:
+        """(列式文件, CSV) 的路径，不存在时为 None"""
+        current = self.release.current() if self.release else None
+        if current is not None:
+            return current.get("columnar"), current.get("csv")
+        return self.columnar_path, self.csv_path
+
+    def _file_version(self) -> int:
+        """获取数据文件的版本号，文件不存在时返回 0"""
+        for path in self._paths():
+            if path is None:
+                continue
+            try:
+                return os.stat(path).st_mtime_ns
+            except OSError:
+                continue
+        return 0
+
+    def _compute_score_analytics(self, ratings, years) -> Dict[str, list]:
+        """预先计算评分分布与年份分布"""
+        rating_series = pd.to_numeric(pd.Series(ratings), errors="coerce").dropna()
+        if rating_series.empty:
+            return {"score": [], "num": [], "res": {}, "score2": [], "num2": []}
+
+        rating_counts = rating_series.value_counts().sort_index()
+        score_list = rating_counts.index.astype(str).tolist()
+        num_list = rating_counts.values.tolist()
+
+        year_series = pd.to_numeric(pd.Series(years), errors="coerce").dropna()
+        year_counts = year_series.astype(int).value_counts().sort_index()
+
+        return {
+            "score": score_list,
+            "num": num_list,
+            "res": dict(zip(score_list, num_list)),
+            "score2": year_counts.index.astype(str).tolist(),
+            "num2": year_counts.values.tolist(),
+        }
+
+    def _build_snapshot(self, version: int) -> DataSnapshot:
+        """读取数据文件并构造数据快照"""
+        columnar_path, csv_path = self._paths()
+        if columnar_path and (self.columnar is None or self.columnar.path != columnar_path):
+            self.columnar = ColumnarStore(columnar_path, self.logger)
+        dataset = self.columnar.open() if columnar_path else None
+        if dataset is not None:
+            snapshot = DataSnapshot(
+                df_factory=dataset.to_frame,
+                records=RecordView(dataset, fill_value="未知"),
+                score_analytics=self._compute_score_analytics(
+                    dataset.column("nums-rating"), dataset.column("year")
+                ),
+                version=dataset.version,
+                dataset=dataset,
+            )
+            self.logger.info(
+                f"已映射列式数据: {dataset.path}，共 {dataset.nrows} 条记录"
+            )
+            return snapshot
+
+        if version == 0 or csv_path is None:
+            df = pd.DataFrame()
+        else:
+            df = pd.read_csv(csv_path, dtype={"id": str})
+        records = [] if df.empty else df.fillna("未知").to_dict("records")
+        if df.empty:
+            analytics = self._compute_score_analytics([], [])
+        else:
+            analytics = self._compute_score_analytics(df["nums-rating"], df["year"])
+        snapshot = DataSnapshot(
+            df_factory=lambda: df,
+            records=records,
+            score_analytics=analytics,
+            version=version,
+        )
+        self.logger.info(f"已加载电影数据: {csv_path}，共 {len(records)} 条记录")
+        return snapshot
+
+    def snapshot(self) -> DataSnapshot:
+        """
+        获取当前数据快照
+
+        每隔 check_interval 秒最多检查一次数据文件。文件变化时在后台线程中构造新快照，
+        构造完成后再替换引用，期间的请求继续使用旧快照，不会因重新加载而变慢；
+        只有第一次加载时请求需要等待
+        """
+        snapshot = self._snapshot
+        now = time.monotonic()
+        if snapshot is not None and now - self._last_check < self.check_interval:
+            return snapshot
+
+        if snapshot is None:
+            with self._lock:
+                if self._snapshot is None:
+                    self._snapshot = self._build_snapshot(self._file_version())
+                    self._last_check = time.monotonic()
+                return self._snapshot
+
+        self._last_check = now
+        if self._file_version() != snapshot.version:
+            self.refresh()
+        return snapshot
+
+    def refresh(self, wait: bool = False) -> None:
+        """
+        在后台重新加载数据文件（数据发布后可直接调用，不必等待下一次检查）
+
+        Args:
+            wait: 是否等待新快照构造完成
+        """
+        with self._lock:
+            thread = self._reload_thread
+            if thread is None or not thread.is_alive():
+                thread = threading.Thread(target=self._reload, name="data-reload", daemon=True)
+                self._reload_thread = thread
+                thread.start()
+        if wait:
+            thread.join()
+
+    def _reload(self) -> None:
+        """构造新快照并替换；数据文件读取失败时保留旧快照"""
+        try:
+            version = self._file_version()
+            current = self._snapshot
+            if current is not None and current.version == version:
+                return
+            snapshot = self._build_snapshot(version)
+            self._snapshot = snapshot  # 替换引用是原子操作，正在处理的请求仍持有旧快照
+            self._last_check = time.monotonic()
+        except Exception as e:
+            self.logger.error(f"重新加载电影数据失败，继续使用旧数据: {e}")
+
+    def warm(self) -> DataSnapshot:
+        """预加载数据，使第一个请求不再承担读取 CSV 的开销"""
+        return self.snapshot()
+
+    def get_dataframe(self) -> pd.DataFrame:
+        return self.snapshot().df
+
+    def get_records(self) -> Sequence[Dict]:
+        return self.snapshot().records
+
+    def get_score_analytics(self) -> Dict[str, list]:
+        return self.snapshot().score_analytics
@@ -4,7 +4,10 @@
 下面是对类中各个模块的介绍：
     __init__(): 类的构造函数，用于类的初始化
     _ensure_dir(): 私有方法，确保文件路径存在，如不存在则创建
-    _save_figure(): 私有方法，保存图片到指定目录
+    _save_figure(): 私有方法，保存图片到指定目录，并记录该图表的输入指纹
+    _fingerprint(): 私有方法，计算图表所用列、参数和绘图代码版本的内容指纹
+    _is_up_to_date(): 私有方法，判断图表输入是否与上次绘制时一致（一致则跳过绘制）
+    _load_manifest() / _save_manifest(): 私有方法，读写图表指纹清单
     load_data(): 加载数据
     plot_rating_distribution(): 绘制评分分布直方图
     plot_year_distribution(): 绘制电影年份分布图
@@ -12,7 +15,14 @@
     plot_genre_distribution(): 绘制电影类型分布图
     plot_top_directors(): 绘制导演排名分布图
     plot_star_rating_distribution(): 绘制星级评分分布图
-    generate_all_charts(): 封装绘制图像方法的方法
+    plot_rating_vs_comments(): 绘制评分与评论数散点图
+    plot_rank_trends(): 绘制近期排名变化最大的电影的排名走势（数据来自 utils.history_store）
+    plot_rating_drift(): 绘制近期评分变化最大的电影
+    generate_all_charts(): 封装绘制图像方法的方法，支持在进程池中并行绘制
+    generate_trend_charts(): 根据排名历史绘制排名走势图与评分变化图
+    render_chart(): 将单张图表绘制到内存中并返回图片字节（供 Web 应用按需绘制）
+    show_charts(): 在窗口中显示已保存的图表（在主线程中调用）
+    _record_chart(): 私有方法，将图表的绘制耗时与指纹缓存命中情况登记到全局指标（utils.metrics）
 """
 
 import matplotlib.pyplot as plt
@@ -20,27 +30,115 @@ import pandas as pd
 import numpy as np
 import logging
 import os
+import json
+import io
+import time
+import hashlib
+import inspect
+from concurrent.futures import as_completed
+from typing import Dict, List, Optional, Tuple
+from utils.entity_index import EntityIndex
+from utils.metrics import REGISTRY
+from utils.process_pool import process_pool
 
 # 设置中文字体支持
 plt.rcParams["font.sans-serif"] = ["SimHei", "Microsoft YaHei", "STHeiti"]  # 中文字体
 plt.rcParams["axes.unicode_minus"] = False  # 解决负号显示问题
 
+# generate_all_charts() 依次调用的绘图方法
+CHART_METHODS = [
+    "plot_rating_distribution",
+    "plot_year_distribution",
+    "plot_country_distribution",
+    "plot_genre_distribution",
+    "plot_top_directors",
+    "plot_star_rating_distribution",
+    "plot_rating_vs_comments",
+]
+# generate_trend_charts() 绘制的图表
+TREND_CHARTS = ["rank_trends", "rating_drift"]
+# 支持的图片格式
+IMAGE_FORMATS = ("png", "svg", "webp")
+# 绘图代码版本，修改任何 plot_* 的绘图逻辑后需要加一，使旧的缓存失效
+CHART_CODE_VERSION = 2
+# 图表指纹清单文件名（位于图片保存目录下）
+CHART_MANIFEST_NAME = "chart_manifest.json"
+
+_CHART_SECONDS = REGISTRY.histogram("douban_chart_render_seconds", "单张图表的绘制耗时(秒)", ["chart"])
+_CHART_CACHE = REGISTRY.counter(
+    "douban_chart_cache_total", "图表指纹缓存的命中(hit)/未命中(miss)次数", ["result"]
+)
+
+
+def _init_chart_worker():
+    """进程池初始化：工作进程使用非交互式的 Agg 后端"""
+    plt.switch_backend("Agg")
+
+
+def _render_chart_worker(
+    method_name: str,
+    df: pd.DataFrame,
+    save_dir: str,
+    dpi: int,
+    image_format: str,
+    use_cache: bool,
+) -> Tuple[float, Dict[str, str]]:
+    """
+    在工作进程中绘制单张图表
+
+    Returns:
+        (耗时(秒), 新的图表指纹)。指纹清单由主进程统一写入，避免多个进程同时写文件
+    """
+    visualizer = DataVisualizer(
+        save_dir=save_dir,
+        dpi=dpi,
+        image_format=image_format,
+        use_cache=use_cache,
+        autosave_manifest=False,
+    )
+    start = time.perf_counter()
+    getattr(visualizer, method_name)(df, show=False)
+    return time.perf_counter() - start, visualizer.manifest_updates
+
 
 class DataVisualizer:
     """
     数据可视化类，用于分析和展示电影数据
     """
 
-    def __init__(self, logger: logging.Logger = None, save_dir: str = "images"):
+    def __init__(
+        self,
+        logger: logging.Logger = None,
+        save_dir: str = "images",
+        dpi: int = 300,
+        image_format: str = "png",
+        use_cache: bool = True,
+        autosave_manifest: bool = True,
+    ):
         """
         初始化可视化器
 
         Args:
             logger:  日志记录器
             save_dir: 图片保存目录
+            dpi: 图片分辨率
+            image_format: 图片格式，可选 png、svg、webp
+            use_cache: 输入未变化时是否跳过绘制
+            autosave_manifest: 每绘制一张图表后是否立即写入指纹清单
         """
         self.logger = logger if logger else logging.getLogger(__name__)
         self.save_dir = save_dir
+        self.dpi = dpi
+        image_format = image_format.lower()
+        if image_format not in IMAGE_FORMATS:
+            raise ValueError(f"不支持的图片格式: {image_format}，可选 {IMAGE_FORMATS}")
+        self.image_format = image_format
+        self.use_cache = use_cache
+        self.autosave_manifest = autosave_manifest
+        self.manifest_path = os.path.join(save_dir, CHART_MANIFEST_NAME)
+        self.manifest_updates: Dict[str, str] = {}  # 本实例新绘制图表的指纹
+        self._manifest: Optional[Dict[str, str]] = None
+        self._render_buffer: Optional[io.BytesIO] = None  # 非空时图片写入内存
         self._ensure_dir()
 
     def _ensure_dir(self):
@@ -49,12 +147,85 @@ class DataVisualizer:
             os.makedirs(self.save_dir)
             self.logger.info(f"创建图片保存目录: {self.save_dir}")
 
-    def _save_figure(self, fig, filename: str):
-        """保存图片"""
-        filepath = os.path.join(self.save_dir, filename)
-        fig.savefig(filepath, dpi=300, bbox_inches="tight", facecolor="white")
+    def _chart_path(self, name: str) -> str:
+        return os.path.join(self.save_dir, f"{name}.{self.image_format}")
+
+    def _save_figure(self, fig, name: str, fingerprint: Optional[str] = None):
+        """保存图片，name 为不带扩展名的文件名"""
+        if self._render_buffer is not None:
+            fig.savefig(
+                self._render_buffer,
+                format=self.image_format,
+                dpi=self.dpi,
+                bbox_inches="tight",
+                facecolor="white",
+            )
+            plt.close(fig)
+            return
+
+        filepath = self._chart_path(name)
+        fig.savefig(filepath, dpi=self.dpi, bbox_inches="tight", facecolor="white")
         self.logger.info(f"图片已保存: {filepath}")
         plt.close(fig)
+        if fingerprint is not None:
+            self.manifest_updates[name] = fingerprint
+            self._load_manifest()[name] = fingerprint
+            if self.autosave_manifest:
+                self._save_manifest({name: fingerprint})
+
+    def _load_manifest(self) -> Dict[str, str]:
+        """读取图表指纹清单，文件不存在或损坏时视为空"""
+        if self._manifest is None:
+            try:
+                with open(self.manifest_path, "r", encoding="utf-8") as f:
+                    self._manifest = json.load(f)
+            except (OSError, ValueError):
+                self._manifest = {}
+        return self._manifest
+
+    def _save_manifest(self, updates: Dict[str, str]) -> None:
+        """合并并写入图表指纹清单（先写临时文件再原子替换）"""
+        if not updates:
+            return
+        self._manifest = None  # 重新读取磁盘上的清单，保留其他图表的记录
+        manifest = self._load_manifest()
+        manifest.update(updates)
+        tmp_path = f"{self.manifest_path}.tmp.{os.getpid()}"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.manifest_path)
+
+    def _fingerprint(self, df: pd.DataFrame, columns: List[str], **params) -> str:
+        """
+        计算图表输入的内容指纹
+
+        只对图表实际使用的列取哈希，且与行顺序无关，因此仅排名变化时
+        类型、国家、导演等图表的指纹保持不变
+        """
+        row_hashes = pd.util.hash_pandas_object(
+            df[columns].astype(str), index=False
+        ).to_numpy()
+        digest = hashlib.sha1(np.sort(row_hashes).tobytes())
+        meta = {
+            "columns": columns,
+            "params": params,
+            "code_version": CHART_CODE_VERSION,
+            "dpi": self.dpi,
+            "format": self.image_format,
+        }
+        digest.update(json.dumps(meta, sort_keys=True).encode("utf-8"))
+        return digest.hexdigest()
+
+    def _is_up_to_date(self, name: str, fingerprint: str, show: bool) -> bool:
+        """输入指纹与上次绘制一致且图片仍然存在时，跳过绘制"""
+        if show or not self.use_cache or self._render_buffer is not None:
+            return False
+        if self._load_manifest().get(name) != fingerprint:
+            return False
+        if not os.path.exists(self._chart_path(name)):
+            return False
+        self.logger.info(f"图表 {name} 的输入未变化，跳过绘制")
+        return True
 
     def load_data(self, data_source) -> pd.DataFrame:
         """
@@ -83,6 +254,10 @@ class DataVisualizer:
             df: 电影数据DataFrame
             show: 是否显示图片
         """
+        fingerprint = self._fingerprint(df, ["nums-rating"])
+        if self._is_up_to_date("rating_distribution", fingerprint, show):
+            return
+
         fig, ax = plt.subplots(figsize=(10, 6))
 
         # 转换评分为数值类型
@@ -109,7 +284,7 @@ class DataVisualizer:
         ax.legend()
         ax.grid(axis="y", alpha=0.3)
 
-        self._save_figure(fig, "rating_distribution.png")
+        self._save_figure(fig, "rating_distribution", fingerprint)
         if show:
             plt.show()
 
@@ -121,6 +296,10 @@ class DataVisualizer:
             df:  电影数据DataFrame
             show:  是否显示图片
         """
+        fingerprint = self._fingerprint(df, ["year"])
+        if self._is_up_to_date("year_distribution", fingerprint, show):
+            return
+
         fig, ax = plt.subplots(figsize=(14, 6))
 
         # 提取年份并转换为数值
@@ -152,7 +331,7 @@ class DataVisualizer:
         ax.set_xticks([list(year_counts.index.astype(str))[i] for i in tick_positions])
 
         plt.tight_layout()
-        self._save_figure(fig, "year_distribution.png")
+        self._save_figure(fig, "year_distribution", fingerprint)
         if show:
             plt.show()
 
@@ -162,20 +341,14 @@ class DataVisualizer:
         """
         绘制制片国家/地区分布饼图（支持一个电影多个国家）
         """
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
+        fingerprint = self._fingerprint(df, ["country"], top_n=top_n)
+        if self._is_up_to_date("country_distribution", fingerprint, show):
+            return
 
-        # -------- 关键修改：先拆分，再统计 --------
-        all_countries = []
-        for country_str in df["country"].dropna():
-            # 豆瓣常见格式: "美国 英国" / "中国大陆 中国香港"
-            # 先把全角空格替换成半角，防止有奇怪空格
-            s = str(country_str).replace("\u3000", " ").strip()
-            # 按空格拆分，过滤掉空字符串
-            parts = [p for p in s.split(" ") if p]
-            all_countries.extend(parts)
+        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
 
-        country_counts = pd.Series(all_countries).value_counts().head(top_n)
-        # ----------------------------------------
+        # 豆瓣常见格式: "美国 英国" / "中国大陆 中国香港"，拆分后的关联表按数据集缓存
+        country_counts = EntityIndex.for_frame(df).table("country").top(top_n)
 
         # 饼图
         colors = plt.cm.Set3(np.linspace(0, 1, len(country_counts)))
@@ -210,7 +383,7 @@ class DataVisualizer:
             ax2.text(v + 0.5, i, str(v), va="center", fontsize=10)
 
         plt.tight_layout()
-        self._save_figure(fig, "country_distribution.png")
+        self._save_figure(fig, "country_distribution", fingerprint)
         if show:
             plt.show()
 
@@ -225,16 +398,14 @@ class DataVisualizer:
             top_n:  显示前N个类型
             show: 是否显示图片
         """
+        fingerprint = self._fingerprint(df, ["classification"], top_n=top_n)
+        if self._is_up_to_date("genre_distribution", fingerprint, show):
+            return
+
         fig, ax = plt.subplots(figsize=(12, 6))
 
         # 统计类型分布（一部电影可能有多个类型）
-        all_genres = []
-        for genres in df["classification"].dropna():
-            # 按空格分割类型
-            genre_list = str(genres).split()
-            all_genres.extend(genre_list)
-
-        genre_counts = pd.Series(all_genres).value_counts().head(top_n)
+        genre_counts = EntityIndex.for_frame(df).table("classification").top(top_n)
 
         # 绘制柱状图
         bars = ax.bar(
@@ -265,7 +436,7 @@ class DataVisualizer:
         ax.grid(axis="y", alpha=0.3)
 
         plt.tight_layout()
-        self._save_figure(fig, "genre_distribution.png")
+        self._save_figure(fig, "genre_distribution", fingerprint)
         if show:
             plt.show()
 
@@ -277,6 +448,10 @@ class DataVisualizer:
             df: 电影数据DataFrame
             show: 是否显示图片
         """
+        fingerprint = self._fingerprint(df, ["nums-rating", "comment_nums", "title"])
+        if self._is_up_to_date("rating_vs_comments", fingerprint, show):
+            return
+
         fig, ax = plt.subplots(figsize=(10, 8))
 
         # 转换数据类型
@@ -329,7 +504,7 @@ class DataVisualizer:
             )
         )
 
-        self._save_figure(fig, "rating_vs_comments.png")
+        self._save_figure(fig, "rating_vs_comments", fingerprint)
         if show:
             plt.show()
 
@@ -344,10 +519,14 @@ class DataVisualizer:
             top_n: 显示前N个导演
             show: 是否显示图片
         """
+        fingerprint = self._fingerprint(df, ["director"], top_n=top_n)
+        if self._is_up_to_date("top_directors", fingerprint, show):
+            return
+
         fig, ax = plt.subplots(figsize=(10, 8))
 
-        # 统计导演作品数量
-        director_counts = df["director"].value_counts().head(top_n)
+        # 统计导演作品数量（联合执导的电影计入每一位导演）
+        director_counts = EntityIndex.for_frame(df).table("director").top(top_n)
 
         # 绘制横向柱状图
         colors = plt.cm.viridis(np.linspace(0.2, 0.8, len(director_counts)))
@@ -378,7 +557,7 @@ class DataVisualizer:
         ax.grid(axis="x", alpha=0.3)
 
         plt.tight_layout()
-        self._save_figure(fig, "top_directors.png")
+        self._save_figure(fig, "top_directors", fingerprint)
         if show:
             plt.show()
 
@@ -392,6 +571,10 @@ class DataVisualizer:
             df: 电影数据DataFrame
             show: 是否显示图片
         """
+        fingerprint = self._fingerprint(df, ["star-rating"])
+        if self._is_up_to_date("star_rating_distribution", fingerprint, show):
+            return
+
         fig, ax = plt.subplots(figsize=(8, 6))
 
         # 统计星级分布
@@ -426,28 +609,256 @@ class DataVisualizer:
         ax.set_title("豆瓣Top250电影星级分布", fontsize=14, fontweight="bold")
         ax.grid(axis="y", alpha=0.3)
 
-        self._save_figure(fig, "star_rating_distribution.png")
+        self._save_figure(fig, "star_rating_distribution", fingerprint)
         if show:
             plt.show()
 
-    def generate_all_charts(self, data_source, show: bool = False) -> None:
+    def plot_rank_trends(
+        self, history, top_n: int = 10, days: float = 30, show: bool = True
+    ) -> None:
+        """
+        绘制排名变化最大的电影的排名走势
+
+        Args:
+            history: 排名历史（utils.history_store.RankHistory）
+            top_n: 显示排名变化最大的前N部电影
+            days: 统计最近多少天内的变化
+            show: 是否显示图片
+        """
+        movers = history.movers(days=days, n=top_n)
+        if not movers:
+            self.logger.info("排名历史不足两次爬取或排名没有变化，跳过排名走势图")
+            return
+
+        fig, ax = plt.subplots(figsize=(12, 7))
+        colors = plt.cm.tab10(np.linspace(0, 1, len(movers)))
+        for mover, color in zip(movers, colors):
+            points = history.series(mover["id"])["points"]
+            times = pd.to_datetime([p["time"] for p in points])
+            ax.plot(
+                times,
+                [p["rank"] for p in points],
+                marker="o",
+                markersize=4,
+                color=color,
+                label=f"{mover['title']} ({mover['change']:+.0f})",
+            )
+
+        ax.invert_yaxis()  # 排名越靠前越在上方
+        ax.set_xlabel("爬取时间", fontsize=12)
+        ax.set_ylabel("排名", fontsize=12)
+        ax.set_title(
+            f"近{days:g}天排名变化最大的电影 (Top{top_n})", fontsize=14, fontweight="bold"
+        )
+        ax.legend(fontsize=9, loc="center left", bbox_to_anchor=(1, 0.5))
+        ax.grid(alpha=0.3)
+        fig.autofmt_xdate()
+
+        plt.tight_layout()
+        self._save_figure(fig, "rank_trends")
+        if show:
+            plt.show()
+
+    def plot_rating_drift(
+        self, history, top_n: int = 10, days: float = 30, show: bool = True
+    ) -> None:
+        """
+        绘制评分变化最大的电影
+
+        Args:
+            history: 排名历史（utils.history_store.RankHistory）
+            top_n: 显示评分变化最大的前N部电影
+            days: 统计最近多少天内的变化
+            show: 是否显示图片
+        """
+        drift = history.rating_drift(days=days, n=top_n)
+        if not drift:
+            self.logger.info("排名历史不足两次爬取或评分没有变化，跳过评分变化图")
+            return
+
+        fig, ax = plt.subplots(figsize=(10, 8))
+        changes = [d["change"] for d in drift][::-1]
+        bars = ax.barh(
+            [d["title"] for d in drift][::-1],
+            changes,
+            color=["tomato" if c > 0 else "steelblue" for c in changes],
+            edgecolor="black",
+            alpha=0.8,
+        )
+
+        # 在柱子旁显示变化前后的评分
+        for bar, d in zip(bars, drift[::-1]):
+            ax.text(
+                bar.get_width(),
+                bar.get_y() + bar.get_height() / 2,
+                f" {d['from']:.1f}→{d['to']:.1f} ",
+                va="center",
+                ha="left" if d["change"] > 0 else "right",
+                fontsize=10,
+            )
+
+        ax.axvline(0, color="black", linewidth=0.8)
+        ax.set_xlabel("评分变化", fontsize=12)
+        ax.set_ylabel("电影", fontsize=12)
+        ax.set_title(
+            f"近{days:g}天评分变化最大的电影 (Top{top_n})", fontsize=14, fontweight="bold"
+        )
+        ax.grid(axis="x", alpha=0.3)
+
+        plt.tight_layout()
+        self._save_figure(fig, "rating_drift")
+        if show:
+            plt.show()
+
+    def generate_trend_charts(
+        self, history, top_n: int = 10, days: float = 30, show: bool = False
+    ) -> None:
+        """
+        根据排名历史绘制排名走势图与评分变化图
+
+        历史数据随每次爬取变化，这两张图不记录输入指纹，每次都重新绘制
+        """
+        for method in (getattr(self, f"plot_{name}") for name in TREND_CHARTS):
+            chart_start = time.perf_counter()
+            try:
+                method(history, top_n=top_n, days=days, show=show)
+            except Exception as e:
+                self.logger.error(f"图表 {method.__name__} 绘制失败: {e}")
+                continue
+            _CHART_SECONDS.observe(time.perf_counter() - chart_start, chart=method.__name__)
+
+    def generate_all_charts(
+        self,
+        data_source,
+        show: bool = False,
+        parallel: bool = False,
+        max_workers: Optional[int] = None,
+    ) -> None:
         """
         生成所有图表
 
         Args:
             data_source: 数据源（List[Dict]、CSV路径或DataFrame）
-            show: 是否显示图片
+            show: 是否显示图片（显示图片时只能顺序绘制）
+            parallel: 是否在进程池中并行绘制
+            max_workers: 进程池大小，默认取 CPU 核数与图表数量中的较小值
         """
         self.logger.info("开始生成所有可视化图表...")
+        start = time.perf_counter()
 
         df = self.load_data(data_source)
 
-        # 生成各类图表
-        self.plot_rating_distribution(df, show)
-        self.plot_year_distribution(df, show)
-        self.plot_country_distribution(df, show=show)
-        self.plot_genre_distribution(df, show=show)
-        self.plot_top_directors(df, show=show)
-        self.plot_star_rating_distribution(df, show=show)
+        if parallel and not show:
+            workers = max_workers or min(len(CHART_METHODS), os.cpu_count() or 1)
+            with process_pool(
+                max_workers=workers, initializer=_init_chart_worker
+            ) as executor:
+                futures = {
+                    executor.submit(
+                        _render_chart_worker,
+                        method_name,
+                        df,
+                        self.save_dir,
+                        self.dpi,
+                        self.image_format,
+                        self.use_cache,
+                    ): method_name
+                    for method_name in CHART_METHODS
+                }
+                updates = {}
+                for future in as_completed(futures):
+                    method_name = futures[future]
+                    try:
+                        elapsed, chart_updates = future.result()
+                        updates.update(chart_updates)
+                        self._record_chart(method_name, elapsed, rendered=bool(chart_updates))
+                        self.logger.info(f"图表 {method_name} 绘制完成，耗时 {elapsed:.2f} 秒")
+                    except Exception as e:
+                        self.logger.error(f"图表 {method_name} 绘制失败: {e}")
+            self.manifest_updates.update(updates)
+            self._save_manifest(updates)
+        else:
+            for method_name in CHART_METHODS:
+                chart_start = time.perf_counter()
+                rendered_before = len(self.manifest_updates)
+                try:
+                    getattr(self, method_name)(df, show=show)
+                except Exception as e:
+                    self.logger.error(f"图表 {method_name} 绘制失败: {e}")
+                    continue
+                elapsed = time.perf_counter() - chart_start
+                self._record_chart(
+                    method_name, elapsed, rendered=len(self.manifest_updates) > rendered_before
+                )
+                self.logger.info(f"图表 {method_name} 绘制完成，耗时 {elapsed:.2f} 秒")
+
+        self.logger.info(
+            f"所有图表已生成完成，保存在 {self.save_dir} 目录下，"
+            f"总耗时 {time.perf_counter() - start:.2f} 秒"
+        )
+
+    def _record_chart(self, method_name: str, elapsed: float, rendered: bool) -> None:
+        """登记图表耗时；启用缓存时，没有写入新指纹说明输入未变化、跳过了绘制"""
+        _CHART_SECONDS.observe(elapsed, chart=method_name)
+        if self.use_cache:
+            _CHART_CACHE.inc(result="miss" if rendered else "hit")
+
+    def render_chart(self, name: str, df: pd.DataFrame, **params) -> bytes:
+        """
+        将单张图表绘制到内存中
+
+        Args:
+            name: 图表名称，如 "top_directors"（对应 plot_top_directors）
+            df: 电影数据DataFrame
+            params: 绘图参数，绘图方法不支持的参数会被忽略（如 top_n）
 
-        self.logger.info(f"所有图表已生成完成，保存在 {self.save_dir} 目录下")
+        Returns:
+            图片字节
+        """
+        method_name = f"plot_{name}"
+        if method_name not in CHART_METHODS:
+            raise ValueError(f"未知的图表: {name}")
+        method = getattr(self, method_name)
+        accepted = inspect.signature(method).parameters
+        kwargs = {k: v for k, v in params.items() if k in accepted and v is not None}
+
+        self._render_buffer = io.BytesIO()
+        try:
+            method(df, show=False, **kwargs)
+            return self._render_buffer.getvalue()
+        finally:
+            self._render_buffer = None
+
+    def show_charts(self, names: Optional[List[str]] = None) -> int:
+        """
+        在窗口中显示已保存的图表
+
+        流水线的各阶段在工作线程中执行，而 GUI 后端只能在主线程中弹出窗口，
+        因此各阶段只保存图片，由主线程在流水线结束后调用本方法统一显示
+
+        Args:
+            names: 图表名称（不带扩展名），默认为所有统计图表与趋势图
+
+        Returns:
+            显示的图表数量
+        """
+        if self.image_format == "svg":
+            self.logger.warning("SVG 格式的图表无法在窗口中显示，请直接打开图片文件")
+            return 0
+        from PIL import Image
+
+        names = names or [method[len("plot_"):] for method in CHART_METHODS] + TREND_CHARTS
+        shown = 0
+        for name in names:
+            path = self._chart_path(name)
+            if not os.path.exists(path):
+                continue
+            with Image.open(path) as image:
+                fig, ax = plt.subplots(figsize=(12, 8))
+                ax.imshow(image.convert("RGB"))
+            ax.set_axis_off()
+            ax.set_title(name)
+            shown += 1
+        if shown:
+            plt.show()
+        return shown
@@ -0,0 +1,164 @@
+"""
+多值字段规范化模块，将国家、类型、导演、主演等以分隔符拼接的字段拆分为 电影↔实体 关联表
+
+每个字段对应一张关联表（CSR 布局）：
+    labels: 实体名称，下标即实体编码
+    codes: 按电影顺序排列的实体编码
+    indptr: 第 i 部电影的实体编码为 codes[indptr[i]:indptr[i + 1]]
+统计各实体出现次数只需对 codes 做一次 np.bincount，不再重复拆分字符串
+
+下面是对各个类和方法的介绍：
+    EntityTable: 单个字段的关联表
+        counts(): 每个实体关联的电影数
+        top(): 出现次数最多的前 N 个实体
+        entities_of(): 某部电影关联的实体
+        movies_with(): 关联某个实体的所有电影下标
+    EntityIndex: 一个数据集所有多值字段的关联表
+        build(): 由 DataFrame 构建（向量化拆分）
+        for_frame(): 按数据内容缓存，同一份数据只构建一次
+        table(): 获取某个字段的关联表
+"""
+
+import hashlib
+import threading
+import numpy as np
+import pandas as pd
+from collections import OrderedDict
+from typing import Dict, List
+
+# 需要拆分的字段及其分隔符（正则）
+ENTITY_FIELDS = {
+    "country": r"\s+",  # "美国 英国"
+    "classification": r"\s+",  # "剧情 犯罪"
+    "director": r"\s*/\s*",  # 联合导演 "A / B"
+    "actors": r"\s*/\s*",  # "A / B / C"
+}
+# 视为空值的占位字符串
+_EMPTY_VALUES = {"", "None", "nan", "未知", "unshown"}
+
+
+class EntityTable:
+    """
+    单个多值字段的 电影↔实体 关联表
+    """
+
+    def __init__(
+        self, field: str, labels: np.ndarray, codes: np.ndarray, indptr: np.ndarray
+    ):
+        self.field = field
+        self.labels = labels
+        self.codes = codes
+        self.indptr = indptr
+        self.n_movies = len(indptr) - 1
+        self._movie_idx = None
+
+    @property
+    def movie_idx(self) -> np.ndarray:
+        """与 codes 一一对应的电影下标"""
+        if self._movie_idx is None:
+            self._movie_idx = np.repeat(
+                np.arange(self.n_movies, dtype=np.int32), np.diff(self.indptr)
+            )
+        return self._movie_idx
+
+    def counts(self, movie_mask: np.ndarray = None) -> np.ndarray:
+        """
+        每个实体关联的电影数
+
+        Args:
+            movie_mask: 可选的布尔数组，只统计被选中的电影
+        """
+        codes = self.codes
+        if movie_mask is not None:
+            codes = codes[np.asarray(movie_mask, dtype=bool)[self.movie_idx]]
+        return np.bincount(codes, minlength=len(self.labels))
+
+    def top(self, n: int = 10, movie_mask: np.ndarray = None) -> pd.Series:
+        """出现次数最多的前 n 个实体，次数相同时按首次出现的顺序排列"""
+        counts = self.counts(movie_mask)
+        order = np.argsort(-counts, kind="stable")[:n]
+        order = order[counts[order] > 0]
+        return pd.Series(counts[order], index=self.labels[order], name=self.field)
+
+    def entities_of(self, movie: int) -> List[str]:
+        """第 movie 部电影关联的实体"""
+        return self.labels[self.codes[self.indptr[movie] : self.indptr[movie + 1]]].tolist()
+
+    def movies_with(self, label: str) -> np.ndarray:
+        """关联某个实体的所有电影下标"""
+        matches = np.flatnonzero(self.labels == label)
+        if len(matches) == 0:
+            return np.empty(0, dtype=np.int32)
+        return self.movie_idx[self.codes == matches[0]]
+
+
+class EntityIndex:
+    """
+    一个数据集所有多值字段的关联表
+    """
+
+    _cache: "OrderedDict[str, EntityIndex]" = OrderedDict()
+    _cache_size = 4
+    _cache_lock = threading.Lock()
+
+    def __init__(self, tables: Dict[str, EntityTable]):
+        self.tables = tables
+
+    @staticmethod
+    def _build_table(field: str, series: pd.Series, pattern: str) -> EntityTable:
+        """向量化拆分单个字段"""
+        n = len(series)
+        values = pd.Series(series.to_numpy(), index=np.arange(n), dtype=object)
+        values = values[values.notna()].astype(str)
+        parts = values.str.replace("\u3000", " ", regex=False).str.strip().str.split(pattern)
+        exploded = parts.explode()
+        exploded = exploded[exploded.notna() & ~exploded.isin(_EMPTY_VALUES)]
+        # 同一部电影中重复出现的实体只计一次
+        links = pd.DataFrame(
+            {"movie": exploded.index.to_numpy(dtype=np.int64), "label": exploded.to_numpy()}
+        ).drop_duplicates()
+
+        codes, labels = pd.factorize(links["label"], sort=False)
+        movie_idx = links["movie"].to_numpy()
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(movie_idx, minlength=n), out=indptr[1:])
+        return EntityTable(
+            field=field,
+            labels=np.asarray(labels, dtype=object),
+            codes=codes.astype(np.int32),
+            indptr=indptr,
+        )
+
+    @classmethod
+    def build(cls, df: pd.DataFrame) -> "EntityIndex":
+        """由 DataFrame 构建所有多值字段的关联表（缺失的字段跳过）"""
+        tables = {}
+        for field, pattern in ENTITY_FIELDS.items():
+            if field in df.columns:
+                tables[field] = cls._build_table(field, df[field], pattern)
+        return cls(tables)
+
+    @classmethod
+    def for_frame(cls, df: pd.DataFrame) -> "EntityIndex":
+        """
+        获取数据集对应的关联表，按相关列的内容哈希缓存，同一份数据只构建一次
+        """
+        columns = [field for field in ENTITY_FIELDS if field in df.columns]
+        row_hashes = pd.util.hash_pandas_object(df[columns].astype(str), index=False)
+        key = hashlib.sha1(row_hashes.to_numpy().tobytes()).hexdigest()
+        with cls._cache_lock:
+            index = cls._cache.get(key)
+            if index is not None:
+                cls._cache.move_to_end(key)
+                return index
+        index = cls.build(df)
+        with cls._cache_lock:
+            cls._cache[key] = index
+            while len(cls._cache) > cls._cache_size:
+                cls._cache.popitem(last=False)
+        return index
+
+    def table(self, field: str) -> EntityTable:
+        if field not in self.tables:
+            raise KeyError(f"字段 {field} 没有关联表")
+        return self.tables[field]
@@ -0,0 +1,208 @@
+"""
+数据导出模块，以流式方式导出电影数据（NDJSON / CSV），供 Web 应用的 /api/export 使用
+
+导出时不构造完整的结果：按固定行数分块，每块只取出所需的列（列式数据集上数值列为零拷贝视图，
+字符串列只解码该范围内的行），在块内向量化地计算过滤条件，编码为文本后由生成器逐块返回；
+开启 gzip 时每块经流式压缩器后立即输出。内存占用只与分块大小有关，与导出的行数无关
+
+下面是对各个类和函数的介绍：
+    ExportFilter: 导出的过滤条件
+        from_args(): 从请求参数中解析过滤条件
+        mask(): 计算一块数据中满足条件的行
+    ExportSource: 导出的数据源，统一列式数据集（优先）与 DataFrame 的分块取值
+    iter_export(): 生成导出内容的字节块
+"""
+
+import io
+import csv
+import json
+import zlib
+import numpy as np
+import pandas as pd
+from typing import Dict, Iterator, List, Optional, Sequence
+
+FORMATS = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+_JSON_ENCODER = json.JSONEncoder(ensure_ascii=False)
+
+# 数值范围参数 -> (字段, 比较方式)
+_RANGE_ARGS = {
+    "year_from": ("year", "min"),
+    "year_to": ("year", "max"),
+    "rating_min": ("nums-rating", "min"),
+    "rating_max": ("nums-rating", "max"),
+    "rank_max": ("rank", "max"),
+    "comments_min": ("comment_nums", "min"),
+}
+# 文本包含参数（字段名即参数名），如 country=美国
+_CONTAINS_ARGS = ("title", "director", "actors", "country", "classification")
+
+
+class ExportFilter:
+    """
+    导出的过滤条件：数值范围与文本包含，多个条件同时满足
+    """
+
+    def __init__(
+        self,
+        ranges: Optional[Dict[str, Dict[str, float]]] = None,
+        contains: Optional[Dict[str, str]] = None,
+    ):
+        """
+        Args:
+            ranges: 字段 -> {"min": 下限, "max": 上限}（包含边界）
+            contains: 字段 -> 必须包含的文本
+        """
+        self.ranges = ranges or {}
+        self.contains = contains or {}
+
+    @classmethod
+    def from_args(cls, args) -> "ExportFilter":
+        """从请求参数（MultiDict 或字典）中解析过滤条件，数值参数无法解析时抛出 ValueError"""
+        ranges: Dict[str, Dict[str, float]] = {}
+        for arg, (field, bound) in _RANGE_ARGS.items():
+            value = args.get(arg)
+            if value not in (None, ""):
+                try:
+                    ranges.setdefault(field, {})[bound] = float(value)
+                except ValueError:
+                    raise ValueError(f"参数 {arg} 必须是数字: {value}")
+        contains = {field: args[field] for field in _CONTAINS_ARGS if args.get(field)}
+        return cls(ranges, contains)
+
+    @property
+    def fields(self) -> List[str]:
+        return list(dict.fromkeys(list(self.ranges) + list(self.contains)))
+
+    def mask(self, chunk: Dict[str, Sequence]) -> Optional[np.ndarray]:
+        """一块数据中满足所有条件的行，没有条件时返回 None"""
+        result = None
+        for field, bounds in self.ranges.items():
+            values = pd.to_numeric(pd.Series(chunk[field], dtype=object), errors="coerce").to_numpy(float)
+            # NaN 与任何数比较都为 False，缺失值的行不会被选中
+            keep = np.ones(len(values), dtype=bool)
+            if "min" in bounds:
+                keep &= values >= bounds["min"]
+            if "max" in bounds:
+                keep &= values <= bounds["max"]
+            result = keep if result is None else result & keep
+        for field, text in self.contains.items():
+            keep = pd.Series(chunk[field], dtype=object).str.contains(text, regex=False, na=False)
+            keep = keep.to_numpy(dtype=bool)
+            result = keep if result is None else result & keep
+        return result
+
+
+class ExportSource:
+    """
+    导出的数据源：列式数据集按行范围取值（零拷贝/局部解码），否则从快照的 DataFrame 中切片
+    """
+
+    def __init__(self, snapshot):
+        """
+        Args:
+            snapshot: utils.data_store.DataSnapshot；导出期间一直引用该快照，数据切换不影响正在进行的导出
+        """
+        self.dataset = snapshot.dataset
+        if self.dataset is not None:
+            self.columns = list(self.dataset.columns)
+            self.nrows = self.dataset.nrows
+            self._df = None
+        else:
+            self._df = snapshot.df
+            self.columns = list(self._df.columns)
+            self.nrows = len(self._df)
+
+    def chunk(self, fields: Sequence[str], start: int, stop: int) -> Dict[str, list]:
+        """取出 [start, stop) 行的指定列，值为 Python 原生类型，缺失值为 None"""
+        data = {}
+        for name in fields:
+            if self.dataset is not None:
+                if self.dataset.is_numeric(name):
+                    values = self.dataset.column(name)[start:stop]
+                else:
+                    data[name] = self.dataset.strings(name, start, stop)
+                    continue
+            else:
+                values = self._df[name].iloc[start:stop].to_numpy()
+            values = values.astype(object)  # 转换为 Python 原生的 int / float / str
+            values[pd.isna(values)] = None
+            data[name] = values.tolist()
+        return data
+
+
+def _encode_ndjson(fields: Sequence[str], rows: Iterator[tuple]) -> str:
+    return "".join(
+        _JSON_ENCODER.encode(dict(zip(fields, row))) + "\n" for row in rows
+    )
+
+
+def _encode_csv(rows: Iterator[tuple]) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator="\n").writerows(rows)
+    return buffer.getvalue()
+
+
+def iter_export(
+    source: ExportSource,
+    fmt: str,
+    fields: Optional[Sequence[str]] = None,
+    export_filter: Optional[ExportFilter] = None,
+    limit: Optional[int] = None,
+    gzip: bool = False,
+    chunk_size: int = 1000,
+) -> Iterator[bytes]:
+    """
+    按块生成导出内容
+
+    Args:
+        source: 数据源
+        fmt: ndjson / csv（CSV 带 UTF-8 BOM 与表头，与 DataSaver 保存的 CSV 一致）
+        fields: 导出的列（按给定顺序），默认为全部列
+        export_filter: 过滤条件
+        limit: 最多导出的行数
+        gzip: 是否输出 gzip 压缩流
+        chunk_size: 每块的行数
+
+    Returns:
+        字节块生成器（参数在调用时立即校验，不合法时抛出 ValueError）
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"不支持的导出格式: {fmt}")
+    fields = list(fields) if fields else source.columns
+    export_filter = export_filter or ExportFilter()
+    unknown = [name for name in fields + export_filter.fields if name not in source.columns]
+    if unknown:
+        raise ValueError(f"数据中没有这些字段: {', '.join(dict.fromkeys(unknown))}")
+    return _generate(source, fmt, fields, export_filter, limit, gzip, chunk_size)
+
+
+def _generate(source, fmt, fields, export_filter, limit, gzip, chunk_size) -> Iterator[bytes]:
+    # wbits=31 输出带 gzip 头的流
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if gzip else None
+
+    def emit(text: str) -> bytes:
+        data = text.encode("utf-8")
+        return compressor.compress(data) if compressor is not None else data
+
+    if fmt == "csv":
+        yield emit("\ufeff" + _encode_csv([fields]))
+    needed = list(dict.fromkeys(fields + export_filter.fields))
+    remaining = limit if limit is not None else source.nrows
+    for start in range(0, source.nrows, chunk_size):
+        if remaining <= 0:
+            break
+        chunk = source.chunk(needed, start, min(start + chunk_size, source.nrows))
+        rows = zip(*(chunk[name] for name in fields))
+        mask = export_filter.mask(chunk)
+        if mask is not None:
+            rows = (row for row, keep in zip(rows, mask) if keep)
+        rows = list(rows)[:remaining]
+        remaining -= len(rows)
+        if not rows:
+            continue
+        text = _encode_ndjson(fields, rows) if fmt == "ndjson" else _encode_csv(rows)
+        data = emit(text)
+        if data:  # 压缩器可能暂时没有输出
+            yield data
+    if compressor is not None:
+        yield compressor.flush()
@@ -0,0 +1,335 @@
+"""
+排名历史模块，记录每次爬取时各电影的排名、评分与评价人数，用于分析随时间的变化
+
+存储格式（history_dir 目录下）：
+    - history.jsonl.gz: 每次爬取追加一行（一个独立的 gzip 成员），只记录与上一次相比发生变化的电影：
+        {"t": 时间, "new": {编号: [排名, 评分×10, 评价人数]}, "d": {编号: [排名差, 评分差×10, 评价人数差]}, "gone": [编号...]}
+      首次出现的电影记录完整数值，其余只记录增量，没有变化的电影不占空间
+    - movies.json: 电影编号 -> 标题
+电影编号取详情页链接中的豆瓣编号，没有链接时使用标题
+
+下面是对各个类和方法的介绍：
+    RankHistory: 解码后的历史数据（每次爬取 × 每部电影 的排名/评分/评价人数矩阵）
+        series(): 单部电影的排名、评分与评价人数序列
+        movers(): 最近 days 天内排名变化最大的电影
+        rating_drift(): 最近 days 天内评分变化最大的电影
+    HistoryStore: 历史存储
+        append(): 追加一次爬取的结果（按增量编码）
+        get(): 读取并解码历史，文件未变化时直接返回缓存（供 Web 进程使用）
+"""
+
+import os
+import gzip
+import zlib
+import json
+import time
+import logging
+import threading
+import numpy as np
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+from utils.movie_id import subject_id_from_url
+
+HISTORY_NAME = "history.jsonl.gz"
+MOVIES_NAME = "movies.json"
+_TIME_FORMAT = "%Y-%m-%dT%H:%M:%S"
+
+
+def movie_key(row: Dict) -> Optional[str]:
+    """电影编号：豆瓣编号（id 列，旧数据从详情页链接中提取），都没有时使用标题"""
+    movie_id = row.get("id")
+    if movie_id is not None and movie_id == movie_id:  # 排除 NaN
+        return str(movie_id)
+    return subject_id_from_url(row.get("url")) or (str(row["title"]) if row.get("title") else None)
+
+
+def _encode(row: Dict) -> Optional[List[int]]:
+    """[排名, 评分×10, 评价人数]，数值缺失时返回 None"""
+    try:
+        return [
+            int(row["rank"]),
+            int(round(float(row["nums-rating"]) * 10)),
+            int(row["comment_nums"]),
+        ]
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+class RankHistory:
+    """
+    解码后的历史数据，缺失（该次爬取中不在榜单上）的位置为 NaN
+    """
+
+    def __init__(
+        self,
+        times: List[datetime],
+        ids: List[str],
+        ranks: np.ndarray,
+        ratings: np.ndarray,
+        comments: np.ndarray,
+        titles: Dict[str, str],
+    ):
+        self.times = times
+        self.ids = ids
+        self.ranks = ranks  # (爬取次数, 电影数)
+        self.ratings = ratings
+        self.comments = comments
+        self.titles = titles
+        self._column = {movie_id: i for i, movie_id in enumerate(ids)}
+        self._by_title = {title: movie_id for movie_id, title in titles.items()}
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def resolve(self, movie: str) -> Optional[str]:
+        """按编号或标题查找电影编号"""
+        if movie in self._column:
+            return movie
+        return self._by_title.get(movie)
+
+    def series(self, movie: str) -> Optional[Dict]:
+        """
+        单部电影的历史序列
+
+        Args:
+            movie: 电影编号或标题
+
+        Returns:
+            {"id", "title", "points": [{"time", "rank", "rating", "comment_nums"}]}，电影不存在时返回 None
+        """
+        movie_id = self.resolve(movie)
+        if movie_id is None:
+            return None
+        col = self._column[movie_id]
+        points = [
+            {
+                "time": t.strftime(_TIME_FORMAT),
+                "rank": int(self.ranks[i, col]),
+                "rating": float(self.ratings[i, col]),
+                "comment_nums": int(self.comments[i, col]),
+            }
+            for i, t in enumerate(self.times)
+            if not np.isnan(self.ranks[i, col])
+        ]
+        return {"id": movie_id, "title": self.titles.get(movie_id), "points": points}
+
+    def _window(self, days: float) -> Tuple[int, int]:
+        """最近一次爬取，以及 days 天前（或更早的最近一次）爬取的下标"""
+        latest = len(self.times) - 1
+        cutoff = self.times[latest] - timedelta(days=days)
+        base = 0
+        for i, t in enumerate(self.times):
+            if t <= cutoff:
+                base = i
+        return base, latest
+
+    def _top_changes(self, values: np.ndarray, days: float, n: int, sign: int) -> List[Dict]:
+        if len(self.times) < 2:
+            return []
+        base, latest = self._window(days)
+        change = (values[base] - values[latest]) * sign
+        valid = np.flatnonzero(~np.isnan(change) & (change != 0))
+        order = valid[np.argsort(-np.abs(change[valid]), kind="stable")][:n]
+        return [
+            {
+                "id": self.ids[col],
+                "title": self.titles.get(self.ids[col]),
+                "from": float(values[base, col]),
+                "to": float(values[latest, col]),
+                "change": float(change[col]),
+                "since": self.times[base].strftime(_TIME_FORMAT),
+            }
+            for col in order
+        ]
+
+    def movers(self, days: float = 30, n: int = 10) -> List[Dict]:
+        """最近 days 天内排名变化最大的电影，change 为正表示排名上升"""
+        return self._top_changes(self.ranks, days, n, sign=1)
+
+    def rating_drift(self, days: float = 30, n: int = 10) -> List[Dict]:
+        """最近 days 天内评分变化最大的电影，change 为正表示评分升高"""
+        return self._top_changes(self.ratings, days, n, sign=-1)
+
+
+class HistoryStore:
+    """
+    按增量编码追加写入的排名历史
+    """
+
+    def __init__(
+        self,
+        history_dir: str,
+        logger: logging.Logger = None,
+        check_interval: float = 5.0,
+    ):
+        """
+        Args:
+            history_dir: 历史数据目录
+            logger: 日志记录器
+            check_interval: get() 检查文件是否更新的最小间隔(秒)
+        """
+        self.history_dir = history_dir
+        self.logger = logger if logger else logging.getLogger(__name__)
+        self.check_interval = check_interval
+        self.history_path = os.path.join(history_dir, HISTORY_NAME)
+        self.movies_path = os.path.join(history_dir, MOVIES_NAME)
+        self._history: Optional[RankHistory] = None
+        self._version = None
+        self._last_check = 0.0
+        self._lock = threading.Lock()
+
+    def _read_members(self) -> Tuple[List[Dict], int, int]:
+        """
+        逐个解码 gzip 成员
+
+        Returns:
+            (各次爬取的记录, 最后一个完整成员的结束位置, 文件大小)
+        """
+        try:
+            with open(self.history_path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return [], 0, 0
+        lines: List[Dict] = []
+        pos = 0
+        while pos < len(data):
+            decompressor = zlib.decompressobj(wbits=31)  # 带 gzip 头的单个成员
+            try:
+                text = decompressor.decompress(data[pos:])
+            except zlib.error:
+                break
+            if not decompressor.eof:
+                break
+            for line in text.decode("utf-8", errors="replace").splitlines():
+                try:
+                    lines.append(json.loads(line))
+                except ValueError:
+                    continue
+            pos = len(data) - len(decompressor.unused_data)
+        if pos < len(data):
+            # 上次写入中断导致文件末尾的成员不完整，之前的成员仍然有效
+            self.logger.warning(
+                f"{self.history_path} 末尾有 {len(data) - pos} 字节不完整，已忽略"
+            )
+        return lines, pos, len(data)
+
+    def _read_lines(self) -> List[Dict]:
+        return self._read_members()[0]
+
+    @staticmethod
+    def _replay(lines: List[Dict]) -> Tuple[List[Dict[str, List[int]]], List[str]]:
+        """按顺序应用增量，得到每次爬取后的完整状态"""
+        state: Dict[str, List[int]] = {}
+        states = []
+        for line in lines:
+            for movie_id in line.get("gone", []):
+                state.pop(movie_id, None)
+            for movie_id, delta in line.get("d", {}).items():
+                state[movie_id] = [a + b for a, b in zip(state[movie_id], delta)]
+            state.update({movie_id: list(v) for movie_id, v in line.get("new", {}).items()})
+            states.append(dict(state))
+        return states, [line["t"] for line in lines]
+
+    def _load_titles(self) -> Dict[str, str]:
+        try:
+            with open(self.movies_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def append(self, movies, timestamp: Optional[datetime] = None) -> int:
+        """
+        追加一次爬取的结果
+
+        Args:
+            movies: 电影数据（DataFrame 或 List[Dict]），需要 rank、nums-rating、comment_nums 与 url/title
+            timestamp: 爬取时间，默认为当前时间
+
+        Returns:
+            本次发生变化（新增、变化或移出榜单）的电影数
+        """
+        records = movies.to_dict("records") if hasattr(movies, "to_dict") else list(movies)
+        current: Dict[str, List[int]] = {}
+        titles = self._load_titles()
+        for row in records:
+            movie_id = movie_key(row)
+            values = _encode(row)
+            if movie_id is None or values is None:
+                continue
+            current[movie_id] = values
+            if row.get("title"):
+                titles[movie_id] = str(row["title"])
+
+        with self._lock:
+            lines, good_end, size = self._read_members()
+            if good_end < size:
+                # 截掉不完整的末尾，否则之后追加的成员都无法解码
+                with open(self.history_path, "r+b") as f:
+                    f.truncate(good_end)
+                self.logger.warning(f"已截掉 {self.history_path} 末尾不完整的 {size - good_end} 字节")
+            states, _ = self._replay(lines)
+            previous = states[-1] if states else {}
+            line = {"t": (timestamp or datetime.now()).strftime(_TIME_FORMAT)}
+            new = {k: v for k, v in current.items() if k not in previous}
+            delta = {
+                k: [a - b for a, b in zip(v, previous[k])]
+                for k, v in current.items()
+                if k in previous and v != previous[k]
+            }
+            gone = [k for k in previous if k not in current]
+            if new:
+                line["new"] = new
+            if delta:
+                line["d"] = delta
+            if gone:
+                line["gone"] = gone
+
+            os.makedirs(self.history_dir, exist_ok=True)
+            # 每次爬取作为一个独立的 gzip 成员追加写入，已写入的内容不会因后续中断而损坏
+            with gzip.open(self.history_path, "at", encoding="utf-8") as f:
+                f.write(json.dumps(line, ensure_ascii=False, separators=(",", ":")) + "\n")
+            tmp_path = f"{self.movies_path}.tmp.{os.getpid()}"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(titles, f, ensure_ascii=False)
+            os.replace(tmp_path, self.movies_path)
+
+        changed = len(new) + len(delta) + len(gone)
+        self.logger.info(
+            f"排名历史已追加：{len(current)} 部电影，新增 {len(new)}，变化 {len(delta)}，移出 {len(gone)}"
+        )
+        return changed
+
+    def load(self) -> RankHistory:
+        """读取并解码全部历史"""
+        states, times = self._replay(self._read_lines())
+        ids = list(dict.fromkeys(movie_id for state in states for movie_id in state))
+        column = {movie_id: i for i, movie_id in enumerate(ids)}
+        data = np.full((3, len(states), len(ids)), np.nan)
+        for i, state in enumerate(states):
+            for movie_id, values in state.items():
+                data[:, i, column[movie_id]] = values
+        return RankHistory(
+            times=[datetime.strptime(t, _TIME_FORMAT) for t in times],
+            ids=ids,
+            ranks=data[0],
+            ratings=data[1] / 10,
+            comments=data[2],
+            titles=self._load_titles(),
+        )
+
+    def get(self) -> RankHistory:
+        """读取历史，文件未变化时返回缓存"""
+        now = time.monotonic()
+        if self._history is not None and now - self._last_check < self.check_interval:
+            return self._history
+        with self._lock:
+            try:
+                stat = os.stat(self.history_path)
+                version = (stat.st_mtime_ns, stat.st_size)
+            except OSError:
+                version = None
+            if self._history is None or version != self._version:
+                self._history = self.load()
+                self._version = version
+            self._last_check = time.monotonic()
+            return self._history
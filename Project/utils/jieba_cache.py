@@ -0,0 +1,55 @@
+"""
+jieba 词典初始化模块
+
+jieba 默认把解析后的词典缓存放在系统临时目录（可能被清理），且在第一次分词时才加载词典。
+这里把缓存放到项目的数据目录中，并在每个进程中只初始化一次：
+进程池的工作进程（forkserver / spawn 启动，不继承主进程已加载的词典）在初始化函数中调用，
+各进程都从这份共享的缓存文件加载词典，不需要重新解析词典
+
+下面是对各个函数的介绍：
+    init_jieba(): 使用项目内的词典缓存初始化 jieba，重复调用直接返回
+"""
+
+import os
+import sys
+import time
+import logging
+import threading
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import JIEBA_CACHE_PATH
+
+_initialized = False
+_init_lock = threading.Lock()
+
+
+def init_jieba(logger: logging.Logger = None, cache_path: str = JIEBA_CACHE_PATH) -> float:
+    """
+    初始化 jieba 词典
+
+    Args:
+        logger: 日志记录器
+        cache_path: 词典缓存文件路径
+
+    Returns:
+        本次初始化耗时(秒)，已初始化过时返回 0
+    """
+    global _initialized
+    if _initialized:
+        return 0.0
+    with _init_lock:
+        if _initialized:
+            return 0.0
+        start = time.perf_counter()
+        import jieba
+
+        jieba.setLogLevel(logging.WARNING)
+        directory = os.path.dirname(cache_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        jieba.dt.cache_file = os.path.abspath(cache_path)
+        jieba.initialize()
+        _initialized = True
+        elapsed = time.perf_counter() - start
+        (logger or logging.getLogger(__name__)).info(f"jieba 词典初始化完成，耗时 {elapsed:.2f} 秒")
+        return elapsed
@@ -1,25 +1,226 @@
+"""
+日志配置模块
+
+日志记录不在调用线程中做 I/O：所有日志先放入队列(QueueHandler)，由后台线程(QueueListener)
+写入控制台和日志文件，爬取与解析的热路径上只有一次入队操作
+
+进程池的工作进程（utils.process_pool）不继承主进程的日志配置：工作进程初始化时清除根记录器上的处理器，
+改为把日志放入一个进程间队列，由主进程中的另一个后台线程写入同样的控制台和日志文件
+
+下面是对各个函数和类的介绍：
+    setup_logging(): 配置日志，支持按大小或按时间轮转（轮转出的旧文件用 gzip 压缩）、
+        JSON 格式输出以及按模块设置日志级别（如只关闭解析过程中的逐条日志）
+    stop_logging(): 停止后台写日志的线程，写出队列中剩余的日志（程序退出时自动调用）
+    worker_logging_args(): 工作进程的日志配置（进程间队列与各级别），未调用 setup_logging() 时返回 None
+    init_worker_logging(): 在工作进程中按 worker_logging_args() 的结果配置日志
+    clear_log_file(): 清空当前日志文件
+    JsonFormatter: 每条日志输出为一行 JSON
+    ExcQueueHandler: 入队时把异常堆栈单独保存，不并入消息（JSON 格式下输出为 exc_info 字段）
+"""
+
 import os
 import sys
+import copy
+import gzip
+import json
+import queue
+import atexit
+import shutil
 import logging
+import logging.handlers
+from typing import Dict, Optional, Tuple
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from config import LOG_PATH
-
-
-def setup_logging():
-    """创建日志记录器"""
-    logging.basicConfig(
-        level=logging.INFO,  # 日志级别
-        format="%(asctime)s - %(name)s -  %(levelname)s - %(message)s",  # 日志格式
-        handlers=[
-            logging.FileHandler("logs/spider.log", encoding="utf-8"),  # 日志文件
-            logging.StreamHandler(),  # 控制台输出
-        ],
-    )
+from config import LOG_BACKUP_COUNT, LOG_MAX_BYTES, LOG_PATH
+
+_TEXT_FORMAT = "%(asctime)s - %(name)s -  %(levelname)s - %(message)s"
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional[logging.handlers.QueueHandler] = None
+_module_levels: Dict[str, str] = {}
+# 工作进程的日志队列及其后台线程，第一次创建进程池时才创建
+_worker_queue = None
+_worker_listener: Optional[logging.handlers.QueueListener] = None
+_EXC_FORMATTER = logging.Formatter()
+
+
+class ExcQueueHandler(logging.handlers.QueueHandler):
+    """
+    入队前把异常堆栈格式化为文本保存在 exc_text 中
+
+    标准的 QueueHandler 会把堆栈并入 message 并清空 exc_info（traceback 对象无法跨进程传递），
+    写日志的线程就无法区分消息与堆栈；这里只合并消息参数，堆栈交给写日志线程中的格式化器处理
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        if record.exc_info and not record.exc_text:
+            record.exc_text = _EXC_FORMATTER.formatException(record.exc_info)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        record.exc_info = None
+        return record
+
+
+class JsonFormatter(logging.Formatter):
+    """每条日志输出为一行 JSON，包含时间、级别、记录器名称、消息与所在线程"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "thread": record.threadName,
+        }
+        # 经过队列的记录只有 exc_text（见 ExcQueueHandler）
+        exc_text = record.exc_text or (self.formatException(record.exc_info) if record.exc_info else None)
+        if exc_text:
+            entry["exc_info"] = exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
+
+def _gzip_namer(name: str) -> str:
+    return name + ".gz"
+
+
+def _gzip_rotator(source: str, dest: str) -> None:
+    """轮转时将旧日志压缩为 .gz"""
+    with open(source, "rb") as f_in, gzip.open(dest, "wb") as f_out:
+        shutil.copyfileobj(f_in, f_out)
+    os.remove(source)
+
+
+def _file_handler(
+    log_path: str, rotation: str, max_bytes: int, backup_count: int, when: str, compress: bool
+) -> logging.Handler:
+    directory = os.path.dirname(log_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    if rotation == "size":
+        handler = logging.handlers.RotatingFileHandler(
+            log_path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8"
+        )
+    elif rotation == "time":
+        handler = logging.handlers.TimedRotatingFileHandler(
+            log_path, when=when, backupCount=backup_count, encoding="utf-8"
+        )
+    elif rotation == "none":
+        return logging.FileHandler(log_path, encoding="utf-8")
+    else:
+        raise ValueError(f"不支持的日志轮转方式: {rotation}，可选 size / time / none")
+    if compress:
+        handler.namer = _gzip_namer
+        handler.rotator = _gzip_rotator
+    return handler
+
+
+def setup_logging(
+    level: str = "INFO",
+    log_path: str = LOG_PATH,
+    rotation: str = "size",
+    max_bytes: int = LOG_MAX_BYTES,
+    backup_count: int = LOG_BACKUP_COUNT,
+    when: str = "midnight",
+    compress: bool = True,
+    json_format: bool = False,
+    module_levels: Optional[Dict[str, str]] = None,
+    console: bool = True,
+) -> logging.Logger:
+    """
+    创建日志记录器
+
+    Args:
+        level: 全局日志级别
+        log_path: 日志文件路径
+        rotation: 轮转方式，size（按大小）/ time（按时间）/ none（不轮转）
+        max_bytes: 按大小轮转时单个日志文件的最大字节数
+        backup_count: 保留的旧日志文件数
+        when: 按时间轮转的周期（同 TimedRotatingFileHandler 的 when 参数，如 midnight、H）
+        compress: 是否用 gzip 压缩轮转出的旧日志
+        json_format: 是否以 JSON Lines 格式输出
+        module_levels: 按记录器名称单独设置的级别，如 {"spiders.spider.items": "WARNING"}
+        console: 是否同时输出到控制台
+    """
+    global _listener, _queue_handler, _module_levels
+    stop_logging()
+
+    formatter = JsonFormatter() if json_format else logging.Formatter(_TEXT_FORMAT)
+    handlers = [_file_handler(log_path, rotation, max_bytes, backup_count, when, compress)]
+    if console:
+        handlers.append(logging.StreamHandler())
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue = queue.SimpleQueue()
+    _queue_handler = ExcQueueHandler(log_queue)
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.addHandler(_queue_handler)
+    _module_levels = {name: module_level.upper() for name, module_level in (module_levels or {}).items()}
+    for name, module_level in _module_levels.items():
+        logging.getLogger(name).setLevel(module_level)
+
     logger = logging.getLogger(__name__)  # 获取日志记录器
     return logger
 
 
+def worker_logging_args(context) -> Optional[Tuple]:
+    """
+    工作进程的日志配置，作为进程池初始化函数的参数
+
+    Args:
+        context: 进程池使用的多进程上下文，日志队列由该上下文创建
+
+    Returns:
+        (进程间日志队列, 全局级别, 按模块设置的级别)；未调用 setup_logging() 时返回 None
+    """
+    global _worker_queue, _worker_listener
+    if _listener is None:
+        return None
+    if _worker_listener is None:
+        _worker_queue = context.Queue()
+        _worker_listener = logging.handlers.QueueListener(
+            _worker_queue, *_listener.handlers, respect_handler_level=True
+        )
+        _worker_listener.start()
+    return _worker_queue, logging.getLogger().level, dict(_module_levels)
+
+
+def init_worker_logging(log_queue, level: int, module_levels: Dict[str, str]) -> None:
+    """在工作进程中清除继承或默认的处理器，日志全部放入进程间队列"""
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(ExcQueueHandler(log_queue))
+    root.setLevel(level)
+    for name, module_level in module_levels.items():
+        logging.getLogger(name).setLevel(module_level)
+
+
+def stop_logging() -> None:
+    """停止后台写日志的线程，并写出队列中剩余的日志"""
+    global _listener, _queue_handler, _worker_queue, _worker_listener
+    if _queue_handler is not None:
+        logging.getLogger().removeHandler(_queue_handler)
+        _queue_handler = None
+    if _worker_listener is not None:
+        _worker_listener.stop()  # 与主进程共用处理器，先写出工作进程的日志，再关闭处理器
+        _worker_listener = None
+        _worker_queue = None
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+atexit.register(stop_logging)
+
+
 def clear_log_file():
     """清除日志文件"""
     if os.path.exists(LOG_PATH):
@@ -0,0 +1,301 @@
+"""
+运行指标模块，提供轻量的计数器(Counter)、仪表(Gauge)与直方图(Histogram)，
+爬虫、数据清洗、数据保存、图表绘制与 Web 应用把各自的指标登记在全局的 REGISTRY 中：
+    - Web 应用通过 /metrics 以 Prometheus 文本格式输出（每个工作进程各自统计）
+    - 主程序在每次运行结束时把指标写入 JSON 运行报告
+
+指标可以带标签，如 douban_spider_requests_total{status="200"}；
+同名指标重复登记时返回已有的指标，因此可以在模块顶层直接声明
+
+下面是对各个类和方法的介绍：
+    Counter: 只增不减的计数器，inc()
+    Gauge: 可以任意设置的数值，set() / inc()；也可以指定回调函数，在读取指标时才取值
+    Histogram: 按区间统计观测值的分布，observe()，time() 上下文管理器记录一段代码的耗时
+    MetricsRegistry: 指标注册表
+        counter() / gauge() / histogram(): 登记（或获取已有的）指标
+        to_prometheus(): 生成 Prometheus 文本格式
+        to_dict(): 生成可序列化为 JSON 的字典
+        write_report(): 将指标与附加信息写入 JSON 运行报告
+        reset(): 清空所有指标的数值
+"""
+
+import os
+import json
+import math
+import time
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# 默认的直方图区间上界(秒)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str], extra: str = "") -> str:
+    parts = []
+    for name, value in zip(names, values):
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        parts.append(f'{name}="{value}"')
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class _Metric:
+    """指标基类，按标签值分别保存数值"""
+
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, object]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"指标 {self.name} 的标签应为 {self.labelnames}，收到 {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _items(self) -> List[Tuple[Tuple[str, ...], object]]:
+        with self._lock:
+            return sorted(self._values.items())
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+    def _samples(self) -> List[str]:
+        items = self._items()
+        if not items and not self.labelnames:
+            items = [((), 0)]  # 没有标签的指标在首次记录前输出 0
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in items
+        ]
+
+    def _to_dict(self):
+        if not self.labelnames:
+            return self._values.get((), 0)
+        return [dict(zip(self.labelnames, key), value=value) for key, value in self._items()]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        if amount < 0:
+            raise ValueError("计数器只能增加")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._callback: Optional[Callable[[], object]] = None
+
+    def set(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def set_function(self, callback: Callable[[], object]) -> None:
+        """
+        读取指标时调用 callback 取值：没有标签时返回数值，
+        有标签时返回 {标签值元组: 数值}（如缓存命中数等由其他对象维护的统计）
+        """
+        self._callback = callback
+
+    def _items(self):
+        if self._callback is None:
+            return super()._items()
+        try:
+            value = self._callback()
+        except Exception:
+            return []
+        if not self.labelnames:
+            return [((), value)]
+        return sorted(
+            (tuple(str(v) for v in (key if isinstance(key, tuple) else (key,))), val)
+            for key, val in value.items()
+        )
+
+    def _to_dict(self):
+        if not self.labelnames:
+            items = self._items()
+            return items[0][1] if items else 0
+        return super()._to_dict()
+
+
+class _HistogramValue:
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.counts = [0] * (len(buckets) + 1)  # 最后一个区间为 +Inf
+        self.sum = 0.0
+        self.count = 0
+        self.max = 0.0
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        index = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = i
+                break
+        with self._lock:
+            hist = self._values.get(key)
+            if hist is None:
+                hist = self._values[key] = _HistogramValue(self.buckets)
+            hist.counts[index] += 1
+            hist.sum += value
+            hist.count += 1
+            hist.max = max(hist.max, value)
+
+    @contextmanager
+    def time(self, **labels):
+        """记录一段代码的耗时(秒)"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def _samples(self) -> List[str]:
+        lines = []
+        for key, hist in self._items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), hist.counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}"
+                )
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(hist.sum)}")
+            lines.append(f"{self.name}_count{labels} {hist.count}")
+        return lines
+
+    @staticmethod
+    def _summary(hist: _HistogramValue, buckets: Tuple[float, ...]) -> Dict:
+        return {
+            "count": hist.count,
+            "sum": hist.sum,
+            "mean": hist.sum / hist.count if hist.count else 0.0,
+            "max": hist.max,
+            "buckets": {
+                _format_value(bound): count
+                for bound, count in zip(buckets + (math.inf,), hist.counts)
+            },
+        }
+
+    def _to_dict(self):
+        items = [(key, self._summary(hist, self.buckets)) for key, hist in self._items()]
+        if not self.labelnames:
+            return items[0][1] if items else self._summary(_HistogramValue(self.buckets), self.buckets)
+        return [dict(zip(self.labelnames, key), **summary) for key, summary in items]
+
+
+class MetricsRegistry:
+    """
+    指标注册表
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, cls, name: str, documentation: str, labelnames: Iterable[str], **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, documentation, labelnames, **kwargs)
+            elif type(metric) is not cls or metric.labelnames != tuple(labelnames):
+                raise ValueError(f"指标 {name} 已以不同的类型或标签登记")
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self._register(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Gauge:
+        return self._register(Gauge, name, documentation, labelnames)
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def _sorted_metrics(self) -> List[_Metric]:
+        with self._lock:
+            return [self._metrics[name] for name in sorted(self._metrics)]
+
+    def to_prometheus(self) -> str:
+        """生成 Prometheus 文本格式(version 0.0.4)"""
+        lines = []
+        for metric in self._sorted_metrics():
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric._samples())
+        return "\n".join(lines) + "\n"
+
+    def to_dict(self) -> Dict[str, object]:
+        return {metric.name: metric._to_dict() for metric in self._sorted_metrics()}
+
+    def write_report(self, path: str, **extra) -> None:
+        """
+        将指标写入 JSON 运行报告（先写临时文件再原子替换）
+
+        Args:
+            path: 报告文件路径
+            extra: 附加到报告中的其他信息（如各阶段的状态）
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        report = dict(extra, metrics=self.to_dict())
+        tmp_path = f"{path}.tmp.{os.getpid()}"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2, default=str)
+        os.replace(tmp_path, path)
+
+    def reset(self) -> None:
+        for metric in self._sorted_metrics():
+            metric.reset()
+
+
+# 全局指标注册表
+REGISTRY = MetricsRegistry()
@@ -0,0 +1,76 @@
+"""
+电影编号模块，用详情页链接中的豆瓣编号作为电影在各处的主键
+
+排名每次爬取都会变化、标题也不唯一，因此合并多次爬取、关联详情页/短评、去重都以编号为键，
+通过哈希索引完成，不需要逐条比较字符串
+
+下面是对各个函数的介绍：
+    subject_id_from_url(): 从单个详情页链接中提取豆瓣编号
+    extract_ids(): 对整列链接提取编号（向量化）
+    dedupe_movies(): 按编号去重；同一部电影在一次爬取中出现多次（翻页期间排名变化）时，
+        保留字段最完整的一条，完整程度相同时保留评价人数更多（即更晚抓取）的一条
+编号只作为 id 列保存，DataFrame 保持位置索引：旧数据没有编号、新数据也可能缺少个别链接，
+以编号作为索引会产生重复的标签
+"""
+
+import re
+import logging
+import numpy as np
+import pandas as pd
+from typing import Optional, Tuple
+
+_SUBJECT_PATTERN = re.compile(r"/subject/(\d+)")
+
+
+def subject_id_from_url(url: str) -> Optional[str]:
+    """从电影详情页链接中提取豆瓣电影编号，如 https://movie.douban.com/subject/1292052/ -> 1292052"""
+    if not url:
+        return None
+    match = _SUBJECT_PATTERN.search(str(url))
+    return match.group(1) if match else None
+
+
+def extract_ids(urls: pd.Series) -> pd.Series:
+    """对整列链接提取豆瓣编号，无法提取时为缺失值"""
+    return urls.astype("string").str.extract(_SUBJECT_PATTERN.pattern, expand=False)
+
+
+def dedupe_movies(df: pd.DataFrame, logger: logging.Logger = None) -> Tuple[pd.DataFrame, int]:
+    """
+    按编号去重
+
+    Args:
+        df: 电影数据，需要 id 列（编号缺失的记录不参与去重）
+        logger: 日志记录器
+
+    Returns:
+        (去重后的数据, 被去掉的记录数)
+    """
+    logger = logger if logger else logging.getLogger(__name__)
+    ids = df["id"]
+    duplicated = (ids.duplicated(keep=False) & ids.notna()).to_numpy()
+    if not duplicated.any():
+        return df, 0
+
+    # 只对重复的记录排序：字段越完整越优先，其次评价人数越多越优先，最后按出现顺序
+    rows = df[duplicated]
+    comments = rows["comment_nums"] if "comment_nums" in df.columns else pd.Series(0, index=rows.index)
+    candidates = pd.DataFrame(
+        {
+            "id": ids.to_numpy()[duplicated],
+            "filled": rows.notna().sum(axis=1).to_numpy(),
+            "comment_nums": pd.to_numeric(comments, errors="coerce").fillna(-1).to_numpy(),
+            "position": np.flatnonzero(duplicated),
+        }
+    )
+    winners = candidates.sort_values(
+        ["filled", "comment_nums", "position"], ascending=[False, False, True]
+    ).drop_duplicates("id")
+    keep = ~duplicated
+    keep[winners["position"].to_numpy()] = True
+    removed = int(len(df) - keep.sum())
+    logger.warning(
+        f"{len(winners)} 部电影在本次数据中出现多次（共多出 {removed} 条），已按编号去重："
+        + ", ".join(winners["id"].astype(str).head(10))
+    )
+    return df[keep], removed
@@ -0,0 +1,170 @@
+"""
+原始页面归档模块，把爬取到的每个页面追加写入压缩归档，解析逻辑修改后可以不访问网络重新解析
+
+归档格式参考 WARC：
+    - 归档目录下是若干个分段文件 pages-00000.warc.gz、pages-00001.warc.gz ...，
+      单个分段超过 max_segment_bytes 后写入下一个分段
+    - 每个页面是分段文件中一个独立的 gzip 成员，内容为 WARC 记录（WARC 头 + 页面 HTML），
+      可以用 gzip -dc 或其他 WARC 工具直接查看；只追加写入，已写入的记录不会因后续中断而损坏
+    - index.jsonl 记录每个页面所在的分段、偏移量与长度以及抓取信息（链接、时间、状态码、耗时、
+      本次运行编号、内容哈希），读取单个页面时直接定位，不需要解压整个分段
+
+下面是对PageArchive类中各个方法的介绍：
+    append(): 追加写入一个页面并记录索引
+    entries(): 读取索引；latest_only 为真时每个链接只保留最近一次抓取
+    read(): 按索引条目读取页面 HTML
+    runs(): 归档中各次运行的编号
+"""
+
+import os
+import gzip
+import json
+import time
+import uuid
+import hashlib
+import logging
+import threading
+from typing import Dict, List, Optional
+
+INDEX_NAME = "index.jsonl"
+
+
+def read_record(path: str, offset: int, length: int) -> str:
+    """读取分段文件中指定位置的一条记录，返回页面 HTML（供进程池中的工作进程直接调用）"""
+    with open(path, "rb") as f:
+        f.seek(offset)
+        record = gzip.decompress(f.read(length))
+    _, _, body = record.partition(b"\r\n\r\n")
+    return body[:-4].decode("utf-8")  # 去掉记录末尾的 \r\n\r\n
+
+
+class PageArchive:
+    """
+    只追加写入的压缩页面归档
+    """
+
+    def __init__(
+        self,
+        archive_dir: str,
+        logger: logging.Logger = None,
+        max_segment_bytes: int = 64 * 1024 * 1024,
+        run_id: Optional[str] = None,
+    ):
+        """
+        Args:
+            archive_dir: 归档目录
+            logger: 日志记录器
+            max_segment_bytes: 单个分段文件的大小上限(字节)
+            run_id: 本次运行的编号，默认为当前时间
+        """
+        self.archive_dir = archive_dir
+        self.logger = logger if logger else logging.getLogger(__name__)
+        self.max_segment_bytes = max_segment_bytes
+        self.run_id = run_id or time.strftime("%Y%m%d-%H%M%S")
+        self.index_path = os.path.join(archive_dir, INDEX_NAME)
+        self._lock = threading.Lock()
+        os.makedirs(archive_dir, exist_ok=True)
+        self._segment = self._last_segment()
+
+    def _segment_path(self, segment: int) -> str:
+        return os.path.join(self.archive_dir, f"pages-{segment:05d}.warc.gz")
+
+    def _last_segment(self) -> int:
+        segments = [
+            int(name[6:11])
+            for name in os.listdir(self.archive_dir)
+            if name.startswith("pages-") and name.endswith(".warc.gz")
+        ]
+        return max(segments, default=0)
+
+    def append(
+        self,
+        url: str,
+        html: str,
+        status: int = 200,
+        latency: Optional[float] = None,
+    ) -> Dict:
+        """
+        追加写入一个页面
+
+        Returns:
+            该页面的索引条目
+        """
+        body = html.encode("utf-8")
+        digest = hashlib.sha1(body).hexdigest()
+        fetched_at = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+        headers = [
+            "WARC/1.0",
+            "WARC-Type: resource",
+            f"WARC-Record-ID: <urn:uuid:{uuid.uuid4()}>",
+            f"WARC-Target-URI: {url}",
+            f"WARC-Date: {fetched_at}",
+            f"WARC-Payload-Digest: sha1:{digest}",
+            "Content-Type: text/html; charset=utf-8",
+            f"Content-Length: {len(body)}",
+            f"X-Fetch-Status: {status}",
+            f"X-Fetch-Seconds: {latency if latency is not None else ''}",
+            f"X-Run-Id: {self.run_id}",
+        ]
+        record = ("\r\n".join(headers) + "\r\n\r\n").encode("utf-8") + body + b"\r\n\r\n"
+        member = gzip.compress(record)
+
+        with self._lock:
+            path = self._segment_path(self._segment)
+            if os.path.exists(path) and os.path.getsize(path) >= self.max_segment_bytes:
+                self._segment += 1
+                path = self._segment_path(self._segment)
+            with open(path, "ab") as f:
+                offset = f.tell()
+                f.write(member)
+            entry = {
+                "url": url,
+                "segment": os.path.basename(path),
+                "offset": offset,
+                "length": len(member),
+                "fetched_at": fetched_at,
+                "status": status,
+                "latency": latency,
+                "run_id": self.run_id,
+                "sha1": digest,
+            }
+            # 先写分段再写索引，中断时最多丢失一条索引，不会出现指向不完整记录的索引
+            with open(self.index_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        return entry
+
+    def entries(self, latest_only: bool = True, run_id: Optional[str] = None) -> List[Dict]:
+        """
+        读取索引
+
+        Args:
+            latest_only: 每个链接只保留最近一次抓取
+            run_id: 只返回指定运行的页面
+        """
+        if not os.path.exists(self.index_path):
+            return []
+        entries = []
+        with open(self.index_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # 写入中断的最后一行
+                if run_id is None or entry["run_id"] == run_id:
+                    entries.append(entry)
+        if latest_only:
+            latest = {}
+            for entry in entries:
+                latest[entry["url"]] = entry  # 索引按写入顺序排列，后出现的更新
+            entries = list(latest.values())
+        return entries
+
+    def path_of(self, entry: Dict) -> str:
+        return os.path.join(self.archive_dir, entry["segment"])
+
+    def read(self, entry: Dict) -> str:
+        """按索引条目读取页面 HTML"""
+        return read_record(self.path_of(entry), entry["offset"], entry["length"])
+
+    def runs(self) -> List[str]:
+        return list(dict.fromkeys(entry["run_id"] for entry in self.entries(latest_only=False)))
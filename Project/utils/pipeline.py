@@ -0,0 +1,216 @@
+"""
+阶段图(DAG)运行模块，按依赖关系调度主程序的各个阶段
+
+每个阶段声明依赖的阶段(deps)、输入文件(inputs)与输出文件(outputs)：
+    - 依赖都已完成的阶段会被同时提交到线程池，互不依赖的阶段并发执行
+    - 类似 make：输出文件都存在且都比输入文件新、并且本次运行中没有依赖阶段被重新执行时，跳过该阶段；
+      没有声明输出文件的阶段（如爬取）每次都会执行
+    - 依赖的阶段失败时，下游阶段不再执行
+    - 未被选中的依赖阶段视为已满足（使用磁盘上已有的结果）
+    - 指定 profiler（utils.profiling.StageProfiler）时，每个阶段都在剖析器中执行
+
+下面是对各个类和方法的介绍：
+    Stage: 阶段定义
+    PipelineContext: 阶段之间共享的数据（线程安全），get_or_load() 在没有上游结果时从磁盘加载
+    Pipeline: 阶段图运行器
+        add(): 添加阶段
+        _is_up_to_date(): 私有方法，判断阶段的输出是否比输入新
+        run(): 运行选中的阶段，返回各阶段的状态
+        summary(): 生成各阶段状态与耗时的汇总表格
+"""
+
+import os
+import time
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, Optional
+
+# 阶段状态
+DONE = "完成"
+SKIPPED = "跳过(已是最新)"
+FAILED = "失败"
+BLOCKED = "未执行(上游失败)"
+
+
+class Stage:
+    """
+    阶段定义
+    """
+
+    def __init__(
+        self,
+        name: str,
+        run: Callable[["PipelineContext"], None],
+        deps: Iterable[str] = (),
+        inputs: Iterable[str] = (),
+        outputs: Iterable[str] = (),
+    ):
+        """
+        Args:
+            name: 阶段名称
+            run: 阶段函数，参数为共享上下文
+            deps: 依赖的阶段名称
+            inputs: 输入文件路径
+            outputs: 输出文件路径，为空时每次都执行
+        """
+        self.name = name
+        self.run = run
+        self.deps = list(deps)
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+
+
+class PipelineContext:
+    """
+    阶段之间共享的数据，读写都加锁
+    """
+
+    def __init__(self, **values):
+        self._values: Dict[str, Any] = dict(values)
+        self._lock = threading.RLock()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            return self._values.get(key, default)
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._values[key] = value
+
+    def get_or_load(self, key: str, loader: Callable[[], Any]) -> Any:
+        """获取共享数据，不存在时调用 loader 加载（多个阶段同时请求时只加载一次）"""
+        with self._lock:
+            if key not in self._values:
+                self._values[key] = loader()
+            return self._values[key]
+
+
+class Pipeline:
+    """
+    阶段图运行器
+    """
+
+    def __init__(
+        self,
+        logger: logging.Logger = None,
+        max_workers: int = 4,
+        force: bool = False,
+        profiler=None,
+    ):
+        """
+        Args:
+            logger: 日志记录器
+            max_workers: 最多同时执行的阶段数
+            force: 是否忽略输出文件的新旧，强制执行所有选中的阶段
+            profiler: 阶段剖析器，为 None 时不剖析
+        """
+        self.logger = logger if logger else logging.getLogger(__name__)
+        self.max_workers = max_workers
+        self.force = force
+        self.profiler = profiler
+        self.stages: "OrderedDict[str, Stage]" = OrderedDict()
+        self.status: Dict[str, str] = {}
+        self.elapsed: Dict[str, float] = {}
+        self.wall_time = 0.0
+
+    def add(self, stage: Stage) -> "Pipeline":
+        for dep in stage.deps:
+            if dep not in self.stages:
+                raise ValueError(f"阶段 {stage.name} 依赖的阶段 {dep} 未定义（需要先添加依赖的阶段）")
+        self.stages[stage.name] = stage
+        return self
+
+    def _is_up_to_date(self, stage: Stage) -> bool:
+        """输出文件都存在且都比输入文件新，并且本次没有依赖阶段被重新执行"""
+        if self.force or not stage.outputs:
+            return False
+        if any(self.status.get(dep) == DONE for dep in stage.deps):
+            return False
+        try:
+            oldest_output = min(os.path.getmtime(path) for path in stage.outputs)
+        except OSError:
+            return False
+        newest_input = max(
+            (os.path.getmtime(path) for path in stage.inputs if os.path.exists(path)),
+            default=0.0,
+        )
+        return oldest_output >= newest_input
+
+    def _run_stage(self, stage: Stage, context: PipelineContext) -> float:
+        start = time.perf_counter()
+        if self.profiler is None:
+            stage.run(context)
+        else:
+            with self.profiler.profile(stage.name):
+                stage.run(context)
+        return time.perf_counter() - start
+
+    def run(self, context: PipelineContext, selected: Optional[Iterable[str]] = None) -> Dict[str, str]:
+        """
+        运行选中的阶段
+
+        Args:
+            context: 共享上下文
+            selected: 要运行的阶段名称，为 None 时运行全部阶段
+
+        Returns:
+            各阶段的状态
+        """
+        selected = list(self.stages) if selected is None else list(selected)
+        unknown = [name for name in selected if name not in self.stages]
+        if unknown:
+            raise ValueError(f"未知的阶段: {unknown}，可选: {list(self.stages)}")
+        pending = [name for name in self.stages if name in selected]
+        self.status, self.elapsed = {}, {}
+        start = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            running = {}
+            while pending or running:
+                # 提交依赖都已满足的阶段
+                for name in list(pending):
+                    stage = self.stages[name]
+                    deps = [dep for dep in stage.deps if dep in selected]
+                    if any(self.status.get(dep) in (FAILED, BLOCKED) for dep in deps):
+                        self.status[name] = BLOCKED
+                        pending.remove(name)
+                        self.logger.warning(f"阶段 {name} 的上游阶段失败，不再执行")
+                        continue
+                    if not all(dep in self.status for dep in deps):
+                        continue
+                    pending.remove(name)
+                    if self._is_up_to_date(stage):
+                        self.status[name] = SKIPPED
+                        self.logger.info(f"阶段 {name} 的输出已是最新，跳过")
+                        continue
+                    self.logger.info(f"开始执行阶段 {name}")
+                    running[executor.submit(self._run_stage, stage, context)] = name
+
+                if not running:
+                    continue
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    try:
+                        self.elapsed[name] = future.result()
+                        self.status[name] = DONE
+                        self.logger.info(f"阶段 {name} 完成，耗时 {self.elapsed[name]:.2f} 秒")
+                    except Exception as e:
+                        self.status[name] = FAILED
+                        self.logger.exception(f"阶段 {name} 失败: {e}")
+
+        self.wall_time = time.perf_counter() - start
+        return self.status
+
+    def summary(self) -> str:
+        """生成各阶段状态与耗时的汇总表格（单位：秒）"""
+        lines = [f"{'阶段':<16}{'状态':<16}{'耗时':>10}", "-" * 42]
+        for name, status in self.status.items():
+            elapsed = self.elapsed.get(name)
+            elapsed = f"{elapsed:>10.3f}" if elapsed is not None else f"{'-':>10}"
+            lines.append(f"{name:<16}{status:<16}{elapsed}")
+        total = sum(self.elapsed.values())
+        lines.append(f"各阶段耗时之和 {total:.3f} 秒，实际耗时 {self.wall_time:.3f} 秒")
+        return "\n".join(lines)
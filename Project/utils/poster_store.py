@@ -0,0 +1,223 @@
+"""
+海报存储模块，管理海报原图、下载清单与缩略图
+
+    - 原图按内容的 SHA-1 保存为 <posters_dir>/originals/<sha1>.<扩展名>，内容相同的海报只保存一份
+    - 下载清单 <posters_dir>/manifest.json 记录每部电影（豆瓣编号）海报的链接、ETag、Last-Modified 与内容哈希，
+      spiders.poster_spider 据此判断是否需要重新下载
+    - 缩略图在进程池中生成，保存为 <static_dir>/<sha1>_<宽度>.<webp|jpg>；文件名由原图内容决定，
+      内容不变时文件不变，Web 应用可以用 immutable 长期缓存，已存在的缩略图不会重新生成
+
+下面是对各个函数和方法的介绍：
+    thumbnail_name(): 缩略图文件名
+    PosterStore: 海报存储
+        save_original(): 按内容哈希保存原图，已存在时不重复写入
+        load_manifest() / save_manifest(): 读取 / 原子写入下载清单
+        build_thumbnails(): 在进程池中为缺少缩略图的原图生成所有尺寸与格式的缩略图
+        get(): 豆瓣编号 -> 原图哈希（供 Web 应用使用，清单未变化时返回缓存）
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+from utils.process_pool import process_pool
+
+MANIFEST_NAME = "manifest.json"
+# 缩略图格式 -> (PIL 格式名, 扩展名)
+_FORMATS = {"webp": ("WEBP", "webp"), "jpeg": ("JPEG", "jpg")}
+
+
+def thumbnail_name(sha1: str, width: int, fmt: str) -> str:
+    return f"{sha1}_{width}.{_FORMATS[fmt][1]}"
+
+
+def _make_thumbnails(task: Tuple[str, str, str, Sequence[int], Sequence[str], int]) -> Tuple[int, Optional[str]]:
+    """
+    为一张原图生成所有尺寸与格式的缩略图（在进程池中执行）
+
+    从大到小依次缩放，每个尺寸都在上一个尺寸的结果上缩小；只缩小不放大
+
+    Returns:
+        (生成的缩略图数, 错误信息：成功时为 None)
+    """
+    source = task[0]
+    try:
+        return _resize(*task), None
+    except Exception as e:  # 单张图片损坏不影响其他图片
+        return 0, f"{source}: {e}"
+
+
+def _resize(source: str, sha1: str, out_dir: str, sizes: Sequence[int], formats: Sequence[str], quality: int) -> int:
+    from PIL import Image
+
+    created = 0
+    with Image.open(source) as image:
+        widths = sorted(set(sizes), reverse=True)
+        # JPEG 按最大尺寸以降采样方式解码，大幅减少解码耗时
+        image.draft("RGB", (widths[0], widths[0] * 2))
+        current = image.convert("RGB")
+    for width in widths:
+        if width < current.width:
+            height = max(1, round(current.height * width / current.width))
+            current = current.resize((width, height), Image.LANCZOS)
+        for fmt in formats:
+            path = os.path.join(out_dir, thumbnail_name(sha1, width, fmt))
+            if os.path.exists(path):
+                continue
+            # 先写临时文件再替换，Web 应用不会读到写了一半的缩略图
+            tmp_path = f"{path}.tmp.{os.getpid()}"
+            current.save(tmp_path, format=_FORMATS[fmt][0], quality=quality, optimize=True)
+            os.replace(tmp_path, path)
+            created += 1
+    return created
+
+
+class PosterStore:
+    """
+    海报原图、下载清单与缩略图
+    """
+
+    def __init__(
+        self,
+        posters_dir: str,
+        static_dir: str,
+        sizes: Sequence[int] = (60, 120, 240),
+        formats: Sequence[str] = ("webp", "jpeg"),
+        quality: int = 80,
+        logger: logging.Logger = None,
+        check_interval: float = 0.0,
+    ):
+        """
+        Args:
+            posters_dir: 原图与下载清单的保存目录
+            static_dir: 缩略图保存目录（由 Web 应用以长期缓存的方式提供）
+            sizes: 缩略图宽度(像素)
+            formats: 缩略图格式（webp / jpeg）
+            quality: 缩略图的压缩质量
+            logger: 日志记录器
+            check_interval: get() 检查清单是否更新的最小间隔(秒)
+        """
+        unknown = set(formats) - set(_FORMATS)
+        if unknown:
+            raise ValueError(f"不支持的缩略图格式: {', '.join(sorted(unknown))}")
+        self.posters_dir = posters_dir
+        self.static_dir = static_dir
+        self.sizes = list(sizes)
+        self.formats = list(formats)
+        self.quality = quality
+        self.logger = logger if logger else logging.getLogger(__name__)
+        self.check_interval = check_interval
+        self.manifest_path = os.path.join(posters_dir, MANIFEST_NAME)
+        self._lock = threading.Lock()
+        self._index: Optional[Dict[str, str]] = None
+        self._version = None
+        self._last_check = 0.0
+
+    def original_path(self, sha1: str, ext: str) -> str:
+        return os.path.join(self.posters_dir, "originals", f"{sha1}.{ext}")
+
+    def save_original(self, content: bytes, ext: str) -> Tuple[str, bool]:
+        """
+        按内容哈希保存原图
+
+        Returns:
+            (内容的 SHA-1, 是否为新内容)
+        """
+        sha1 = hashlib.sha1(content).hexdigest()
+        path = self.original_path(sha1, ext)
+        if os.path.exists(path):
+            return sha1, False
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp.{os.getpid()}.{threading.get_ident()}"
+        with open(tmp_path, "wb") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+        return sha1, True
+
+    def load_manifest(self) -> Dict[str, Dict]:
+        """读取下载清单：豆瓣编号 -> {url, etag, last_modified, sha1, ext, fetched_at}"""
+        if not os.path.exists(self.manifest_path):
+            return {}
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"海报下载清单读取失败，将重新下载: {e}")
+            return {}
+
+    def save_manifest(self, manifest: Dict[str, Dict]) -> None:
+        """原子写入下载清单（应在缩略图生成之后调用，Web 应用只会看到已有缩略图的海报）"""
+        os.makedirs(self.posters_dir, exist_ok=True)
+        tmp_path = f"{self.manifest_path}.tmp.{os.getpid()}"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False)
+        os.replace(tmp_path, self.manifest_path)
+
+    def _missing(self, sha1: str) -> bool:
+        return any(
+            not os.path.exists(os.path.join(self.static_dir, thumbnail_name(sha1, width, fmt)))
+            for width in self.sizes
+            for fmt in self.formats
+        )
+
+    def build_thumbnails(self, manifest: Dict[str, Dict], workers: Optional[int] = None) -> int:
+        """
+        为清单中缺少缩略图的原图生成缩略图，同一内容只处理一次
+
+        Args:
+            manifest: 下载清单
+            workers: 进程数，默认为 CPU 核数
+
+        Returns:
+            生成的缩略图数
+        """
+        os.makedirs(self.static_dir, exist_ok=True)
+        originals = {entry["sha1"]: entry["ext"] for entry in manifest.values() if entry.get("sha1")}
+        tasks: List[Tuple] = [
+            (self.original_path(sha1, ext), sha1, self.static_dir, self.sizes, self.formats, self.quality)
+            for sha1, ext in originals.items()
+            if self._missing(sha1) and os.path.exists(self.original_path(sha1, ext))
+        ]
+        if not tasks:
+            self.logger.info(f"{len(originals)} 张海报的缩略图均已存在")
+            return 0
+
+        start = time.perf_counter()
+        workers = max(1, min(workers or os.cpu_count() or 1, len(tasks)))
+        if workers == 1:
+            results = list(map(_make_thumbnails, tasks))
+        else:
+            with process_pool(max_workers=workers) as executor:
+                chunksize = max(1, len(tasks) // (workers * 4))
+                results = list(executor.map(_make_thumbnails, tasks, chunksize=chunksize))
+        created = sum(count for count, _ in results)
+        for _, error in results:
+            if error:
+                self.logger.warning(f"海报缩略图生成失败 {error}")
+        self.logger.info(
+            f"已为 {len(tasks)} 张海报生成 {created} 张缩略图，耗时 {time.perf_counter() - start:.2f} 秒"
+        )
+        return created
+
+    def get(self) -> Dict[str, str]:
+        """豆瓣编号 -> 原图哈希，清单未变化时返回缓存"""
+        now = time.monotonic()
+        if self._index is not None and now - self._last_check < self.check_interval:
+            return self._index
+        with self._lock:
+            try:
+                stat = os.stat(self.manifest_path)
+                version = (stat.st_mtime_ns, stat.st_size)
+            except OSError:
+                version = None
+            if self._index is None or version != self._version:
+                manifest = self.load_manifest() if version is not None else {}
+                self._index = {
+                    movie_id: entry["sha1"] for movie_id, entry in manifest.items() if entry.get("sha1")
+                }
+                self._version = version
+            self._last_check = time.monotonic()
+            return self._index
@@ -0,0 +1,51 @@
+"""
+进程池模块，统一创建各阶段使用的进程池
+
+流水线中互不依赖的阶段在线程中并发执行。在多线程的进程中 fork 时，其他线程持有的锁
+（日志处理器、导入锁、jieba 等）会以加锁状态复制到子进程，子进程可能因此死锁。
+进程池因此使用 forkserver 启动方式（平台不支持时使用 spawn）：工作进程由单线程的服务进程派生，
+不继承父进程的线程与锁；相应地，工作进程需要在初始化函数中自行加载所需的资源。
+工作进程的日志经进程间队列交给主进程写出（utils.log.init_worker_logging）
+
+下面是对各个函数的介绍：
+    mp_context(): 进程池使用的多进程上下文
+    process_pool(): 创建进程池
+"""
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Optional
+from utils.log import init_worker_logging, worker_logging_args
+
+
+def mp_context():
+    """forkserver（Windows 等不支持的平台上使用 spawn）"""
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+def _init_worker(log_args: Optional[tuple], initializer: Optional[Callable], initargs: tuple) -> None:
+    """工作进程的初始化：先配置日志，再调用调用方的初始化函数"""
+    if log_args is not None:
+        init_worker_logging(*log_args)
+    if initializer is not None:
+        initializer(*initargs)
+
+
+def process_pool(
+    max_workers: Optional[int] = None,
+    initializer: Optional[Callable] = None,
+    initargs: tuple = (),
+) -> ProcessPoolExecutor:
+    """
+    创建进程池，参数与 ProcessPoolExecutor 相同
+
+    初始化函数与任务函数需要定义在模块顶层（按名称传给工作进程）
+    """
+    context = mp_context()
+    return ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=context,
+        initializer=_init_worker,
+        initargs=(worker_logging_args(context), initializer, initargs),
+    )
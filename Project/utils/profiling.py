@@ -0,0 +1,168 @@
+"""
+性能剖析模块，用 cProfile 与 tracemalloc 找出各阶段（或 Web 请求）的耗时热点与内存分配位置
+
+未启用剖析时，主程序与 Web 应用都不会调用本模块，没有任何额外开销
+
+下面是对各个类和方法的介绍：
+    StageProfiler: 按阶段剖析
+        profile(): 上下文管理器，剖析一段代码，保存 <阶段>.prof 并生成热点与内存分配汇总
+        summary(): 所有阶段的汇总文本，同时写入 summary.txt
+    RequestProfiler: 按比例抽样剖析 Web 请求，每个被抽中的请求保存一个 .prof 文件
+        start() / stop(): 在请求开始 / 结束时调用
+
+.prof 文件可以用 python -m pstats、snakeviz 等工具查看
+"""
+
+import io
+import os
+import time
+import random
+import pstats
+import cProfile
+import logging
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+
+def _format_bytes(size: float) -> str:
+    for unit in ("B", "KB", "MB"):
+        if abs(size) < 1024:
+            return f"{size:.1f}{unit}"
+        size /= 1024
+    return f"{size:.1f}GB"
+
+
+def _hotspots(profiler: cProfile.Profile, top_n: int) -> str:
+    """按累计耗时与自身耗时分别列出前 top_n 个函数"""
+    stream = io.StringIO()
+    stats = pstats.Stats(profiler, stream=stream).strip_dirs()
+    stream.write("== 累计耗时 (cumulative) ==\n")
+    stats.sort_stats("cumulative").print_stats(top_n)
+    stream.write("== 自身耗时 (tottime) ==\n")
+    stats.sort_stats("tottime").print_stats(top_n)
+    return stream.getvalue()
+
+
+class StageProfiler:
+    """
+    按阶段剖析 CPU 耗时与内存分配
+    """
+
+    def __init__(
+        self,
+        output_dir: str,
+        top_n: int = 20,
+        memory: bool = True,
+        logger: logging.Logger = None,
+    ):
+        """
+        Args:
+            output_dir: .prof 文件与汇总文件的保存目录
+            top_n: 汇总中列出的热点函数与内存分配位置数
+            memory: 是否用 tracemalloc 记录内存分配（开销较大，只关心 CPU 时可关闭）
+            logger: 日志记录器
+        """
+        self.output_dir = output_dir
+        self.top_n = top_n
+        self.memory = memory
+        self.logger = logger if logger else logging.getLogger(__name__)
+        self.summaries: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        os.makedirs(output_dir, exist_ok=True)
+
+    @contextmanager
+    def profile(self, stage: str):
+        """
+        剖析一段代码
+
+        cProfile 只记录当前线程；tracemalloc 统计的是整个进程的分配，
+        因此多个阶段同时运行时各阶段的内存数据会混在一起（主程序启用剖析时按顺序执行各阶段）
+        """
+        started_tracing = False
+        if self.memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(10)
+                started_tracing = True
+            tracemalloc.reset_peak()
+            before = tracemalloc.take_snapshot()
+        profiler = cProfile.Profile()
+        start = time.perf_counter()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            elapsed = time.perf_counter() - start
+            lines = [f"######## 阶段 {stage}：耗时 {elapsed:.3f} 秒"]
+            if self.memory:
+                after = tracemalloc.take_snapshot()
+                current, peak = tracemalloc.get_traced_memory()
+                if started_tracing:
+                    tracemalloc.stop()
+                lines.append(f"内存：当前 {_format_bytes(current)}，阶段内峰值 {_format_bytes(peak)}")
+                lines.append(f"== 内存分配增量前 {self.top_n} 位 ==")
+                for diff in after.compare_to(before, "lineno")[: self.top_n]:
+                    frame = diff.traceback[0]
+                    lines.append(
+                        f"{_format_bytes(diff.size_diff):>10}  {diff.count_diff:>+8} 个  "
+                        f"{frame.filename}:{frame.lineno}"
+                    )
+            prof_path = os.path.join(self.output_dir, f"{stage}.prof")
+            profiler.dump_stats(prof_path)
+            lines.append(_hotspots(profiler, self.top_n))
+            summary = "\n".join(lines)
+            with self._lock:
+                self.summaries[stage] = summary
+            with open(os.path.join(self.output_dir, f"{stage}.txt"), "w", encoding="utf-8") as f:
+                f.write(summary)
+            self.logger.info(f"阶段 {stage} 的剖析结果已保存至 {prof_path}")
+
+    def summary(self) -> str:
+        """所有阶段的剖析汇总，同时写入 summary.txt"""
+        with self._lock:
+            text = "\n\n".join(self.summaries.values())
+        with open(os.path.join(self.output_dir, "summary.txt"), "w", encoding="utf-8") as f:
+            f.write(text)
+        return text
+
+
+class RequestProfiler:
+    """
+    按比例抽样剖析 Web 请求
+    """
+
+    def __init__(self, output_dir: str, rate: float = 0.01, logger: logging.Logger = None):
+        """
+        Args:
+            output_dir: .prof 文件保存目录
+            rate: 被剖析的请求比例（0~1）
+            logger: 日志记录器
+        """
+        self.output_dir = output_dir
+        self.rate = rate
+        self.logger = logger if logger else logging.getLogger(__name__)
+        os.makedirs(output_dir, exist_ok=True)
+
+    def start(self) -> Optional[cProfile.Profile]:
+        """按比例抽样，被抽中时开始剖析并返回剖析器"""
+        if random.random() >= self.rate:
+            return None
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # 同一时刻只能有一个剖析器处于启用状态的 Python 版本中，并发的请求不再剖析
+            return None
+        return profiler
+
+    def stop(self, profiler: cProfile.Profile, endpoint: str, elapsed: float) -> str:
+        """停止剖析并保存为 <视图>_<时间戳>_<耗时>ms.prof"""
+        profiler.disable()
+        stamp = f"{time.strftime('%Y%m%d-%H%M%S')}-{int(time.time() * 1000) % 1000:03d}"
+        name = f"{endpoint.replace('.', '_')}_{stamp}_{elapsed * 1000:.0f}ms.prof"
+        path = os.path.join(self.output_dir, name)
+        profiler.dump_stats(path)
+        self.logger.info(f"请求 {endpoint} 的剖析结果已保存至 {path}")
+        return path
@@ -0,0 +1,137 @@
+"""
+数据版本发布模块，把一次运行生成的 CSV、列式数据与检索索引作为一个整体发布给 Web 应用
+
+各数据文件由不同的阶段分别原子替换，Web 应用如果直接读取这些文件，可能在替换的间隙
+读到新旧混合的数据（如新的 CSV 与旧的检索索引）。发布时把这些文件硬链接（跨文件系统时复制）
+到一个新的版本目录中，写好清单后再用 os.replace 原子地切换 CURRENT 指针：
+Web 应用只通过指针找到版本目录，读到的几个文件总是来自同一次发布
+
+目录结构（release_dir 目录下）：
+    - <版本名>/manifest.json: {"version": 版本名, "files": {名称: 文件名}}，以及各数据文件
+    - CURRENT: 当前版本名
+
+下面是对ReleaseStore类中各个方法的介绍：
+    publish(): 把数据文件发布为一个新版本并切换指针，文件与当前版本相同时不发布
+    current(): 当前版本：{"version": 版本名, 名称: 文件的绝对路径}，没有发布过时返回 None
+    _prune(): 私有方法，删除旧版本，只保留最近 keep 个
+"""
+
+import os
+import json
+import time
+import shutil
+import logging
+from typing import Dict, Optional
+
+CURRENT_NAME = "CURRENT"
+MANIFEST_NAME = "manifest.json"
+
+
+class ReleaseStore:
+    """
+    数据版本目录与 CURRENT 指针
+    """
+
+    def __init__(self, release_dir: str, keep: int = 3, logger: logging.Logger = None):
+        """
+        Args:
+            release_dir: 版本目录的父目录
+            keep: 保留的版本数（已被 Web 进程映射的旧文件在删除后仍可继续读取）
+            logger: 日志记录器
+        """
+        self.release_dir = release_dir
+        self.keep = max(1, keep)
+        self.logger = logger if logger else logging.getLogger(__name__)
+        self.current_path = os.path.join(release_dir, CURRENT_NAME)
+
+    def current(self) -> Optional[Dict[str, str]]:
+        """当前版本：{"version": 版本名, 名称: 文件路径}，没有发布过（或指针损坏）时返回 None"""
+        try:
+            with open(self.current_path, "r", encoding="utf-8") as f:
+                version = f.read().strip()
+            with open(os.path.join(self.release_dir, version, MANIFEST_NAME), "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+        directory = os.path.join(self.release_dir, version)
+        release = {name: os.path.join(directory, filename) for name, filename in manifest["files"].items()}
+        release["version"] = version
+        return release
+
+    @staticmethod
+    def _same_file(a: str, b: str) -> bool:
+        try:
+            sa, sb = os.stat(a), os.stat(b)
+        except OSError:
+            return False
+        return (sa.st_size, sa.st_mtime_ns) == (sb.st_size, sb.st_mtime_ns)
+
+    def publish(self, files: Dict[str, str]) -> Optional[str]:
+        """
+        发布一个新版本
+
+        Args:
+            files: 名称 -> 数据文件路径（如 {"csv": ..., "columnar": ..., "search_index": ...}），不存在的文件跳过
+
+        Returns:
+            当前版本名；没有可发布的文件时返回 None
+        """
+        files = {name: path for name, path in files.items() if path and os.path.exists(path)}
+        if not files:
+            self.logger.warning("没有可发布的数据文件")
+            return None
+        current = self.current()
+        if current is not None and set(current) - {"version"} == set(files) and all(
+            self._same_file(path, current[name]) for name, path in files.items()
+        ):
+            self.logger.info(f"数据文件与当前版本 {current['version']} 相同，不发布新版本")
+            return current["version"]
+
+        base = f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+        version, n = base, 1
+        while os.path.exists(os.path.join(self.release_dir, version)):  # 同一秒内多次发布
+            n += 1
+            version = f"{base}-{n}"
+        directory = os.path.join(self.release_dir, version)
+        tmp_dir = os.path.join(self.release_dir, f".{version}.tmp")
+        os.makedirs(tmp_dir, exist_ok=True)
+        try:
+            manifest = {"version": version, "files": {}}
+            for name, path in files.items():
+                filename = os.path.basename(path)
+                target = os.path.join(tmp_dir, filename)
+                try:
+                    # 各阶段用 os.replace 写入新文件，硬链接指向的旧内容不会被之后的运行修改
+                    os.link(path, target)
+                except OSError:
+                    shutil.copy2(path, target)
+                manifest["files"][name] = filename
+            with open(os.path.join(tmp_dir, MANIFEST_NAME), "w", encoding="utf-8") as f:
+                json.dump(manifest, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_dir, directory)
+        finally:
+            if os.path.exists(tmp_dir):
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+
+        # 切换指针：读取方要么看到旧版本，要么看到完整的新版本
+        tmp_path = f"{self.current_path}.tmp.{os.getpid()}"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(version)
+        os.replace(tmp_path, self.current_path)
+        self.logger.info(f"数据版本 {version} 已发布：{', '.join(sorted(files))}")
+        self._prune(version)
+        return version
+
+    def _prune(self, current: str) -> None:
+        versions = sorted(
+            name
+            for name in os.listdir(self.release_dir)
+            if not name.startswith(".") and os.path.isdir(os.path.join(self.release_dir, name))
+        )
+        for name in versions[: -self.keep]:
+            if name == current:
+                continue
+            try:
+                shutil.rmtree(os.path.join(self.release_dir, name))
+            except OSError as e:  # Windows 上仍被映射的文件无法删除，下次发布时再删除
+                self.logger.warning(f"旧数据版本 {name} 删除失败: {e}")
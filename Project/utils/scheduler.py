@@ -0,0 +1,193 @@
+"""
+定时爬取模块，按固定间隔（加随机抖动）周期性地运行爬取流水线
+
+同一时刻只允许一次运行(single-flight)：进程内用线程锁，进程间（如 Web 服务内的定时任务与
+单独启动的 main.py 定时任务）用锁文件，拿不到锁的一方直接跳过本次运行，而不是排队等待
+
+下面是对各个类和方法的介绍：
+    FileLock: 非阻塞的进程间文件锁（Linux/macOS 使用 fcntl，Windows 使用 msvcrt）
+    CrawlScheduler: 定时任务
+        run_once(): 在单飞锁保护下运行一次，成功后调用 on_publish 通知数据已更新
+        next_delay(): 下一次运行前的等待时间（间隔 ± 抖动）
+        start() / stop(): 在后台线程中运行 / 停止
+        run_forever(): 在当前线程中循环运行（main.py 的定时模式）
+"""
+
+import os
+import time
+import random
+import logging
+import threading
+from typing import Callable, Optional
+from utils.metrics import REGISTRY
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+_RUNS = REGISTRY.counter(
+    "douban_scheduled_runs_total", "定时运行次数（成功/失败/因已有运行而跳过）", ["result"]
+)
+_RUN_SECONDS = REGISTRY.histogram("douban_scheduled_run_seconds", "单次定时运行的耗时(秒)")
+_LAST_PUBLISH = REGISTRY.gauge("douban_last_publish_timestamp", "最近一次成功发布数据的时间(Unix 时间戳)")
+
+
+class FileLock:
+    """
+    非阻塞的进程间文件锁，持有锁的进程退出后由操作系统自动释放
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._fd: Optional[int] = None
+
+    def acquire(self) -> bool:
+        """尝试获取锁，已被其他进程持有时立即返回 False"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        except OSError:
+            os.close(fd)
+            return False
+        # 记录持有锁的进程，便于排查
+        os.ftruncate(fd, 0)
+        os.write(fd, str(os.getpid()).encode())
+        self._fd = fd
+        return True
+
+    def release(self) -> None:
+        if self._fd is None:
+            return
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(self._fd, 0, os.SEEK_SET)
+                msvcrt.locking(self._fd, msvcrt.LK_UNLCK, 1)
+        finally:
+            os.close(self._fd)
+            self._fd = None
+
+
+class CrawlScheduler:
+    """
+    带抖动与单飞锁的定时任务
+    """
+
+    def __init__(
+        self,
+        run: Callable[[], bool],
+        interval: float,
+        jitter: float = 0.0,
+        lock_path: Optional[str] = None,
+        on_publish: Optional[Callable[[], None]] = None,
+        run_immediately: bool = False,
+        logger: logging.Logger = None,
+    ):
+        """
+        Args:
+            run: 运行一次流水线，返回是否成功（成功时数据文件已原子替换）
+            interval: 两次运行之间的间隔(秒)
+            jitter: 间隔的随机抖动幅度(秒)，避免多个实例总在同一时刻访问网站
+            lock_path: 进程间锁文件路径，为 None 时只在进程内保证单飞
+            on_publish: 运行成功后调用，用于通知 Web 应用立即切换数据
+            run_immediately: 启动后是否立即运行一次（否则先等待一个间隔）
+            logger: 日志记录器
+        """
+        self.run = run
+        self.interval = interval
+        self.jitter = jitter
+        self.file_lock = FileLock(lock_path) if lock_path else None
+        self.on_publish = on_publish
+        self.run_immediately = run_immediately
+        self.logger = logger if logger else logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def next_delay(self) -> float:
+        return max(0.0, self.interval + random.uniform(-self.jitter, self.jitter))
+
+    def run_once(self) -> Optional[bool]:
+        """
+        运行一次
+
+        Returns:
+            是否成功；已有运行正在进行时跳过并返回 None
+        """
+        if not self._lock.acquire(blocking=False):
+            _RUNS.inc(result="skipped")
+            self.logger.warning("上一次定时运行尚未结束，跳过本次运行")
+            return None
+        try:
+            if self.file_lock is not None and not self.file_lock.acquire():
+                _RUNS.inc(result="skipped")
+                self.logger.warning(f"其他进程正在运行（锁文件 {self.file_lock.path}），跳过本次运行")
+                return None
+            try:
+                start = time.perf_counter()
+                try:
+                    ok = bool(self.run())
+                except Exception as e:
+                    self.logger.exception(f"定时运行出错: {e}")
+                    ok = False
+                elapsed = time.perf_counter() - start
+                _RUN_SECONDS.observe(elapsed)
+                _RUNS.inc(result="success" if ok else "failed")
+            finally:
+                if self.file_lock is not None:
+                    self.file_lock.release()
+        finally:
+            self._lock.release()
+
+        if not ok:
+            self.logger.error(f"定时运行失败，耗时 {elapsed:.1f} 秒，继续使用现有数据")
+            return False
+        _LAST_PUBLISH.set(time.time())
+        self.logger.info(f"定时运行完成，耗时 {elapsed:.1f} 秒，新数据已发布")
+        if self.on_publish is not None:
+            try:
+                self.on_publish()
+            except Exception as e:
+                self.logger.error(f"通知数据更新失败: {e}")
+        return True
+
+    def _loop(self) -> None:
+        if self.run_immediately:
+            self.run_once()
+        while True:
+            delay = self.next_delay()
+            self.logger.info(f"下一次定时运行在 {delay / 60:.1f} 分钟后")
+            if self._stop.wait(delay):
+                return
+            self.run_once()
+
+    def start(self) -> None:
+        """在后台守护线程中运行"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="crawl-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """停止定时任务（正在进行的运行会执行完）"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def run_forever(self) -> None:
+        """在当前线程中循环运行，Ctrl+C 退出"""
+        try:
+            self._loop()
+        except KeyboardInterrupt:
+            self.logger.info("定时任务已停止")
@@ -0,0 +1,309 @@
+"""
+全文检索模块，在爬取阶段为电影数据建立倒排索引，供 Web 应用的 /api/search 接口查询
+
+下面是对各个类和方法的介绍：
+    SearchIndex: 倒排索引
+        _tokenize_text(): 私有方法，中文字段使用 jieba 搜索引擎模式分词
+        _tokenize_names(): 私有方法，人名字段按人拆分后生成整词与字符二元组(n-gram)
+        build(): 由 DataFrame 建立索引，按字段加权后计算 BM25 所需的统计量；
+            人名字段复用 EntityIndex 的拆分结果，每个不同的人名只分词一次
+        save(): 将索引写入磁盘（gzip 压缩的 JSON，原子替换）
+        load(): 从磁盘加载索引
+        search(): 查询，只访问倒排表，不扫描原始数据
+    SearchIndexLoader: 在 Web 进程中缓存索引，索引文件更新后在后台重新加载，加载期间继续使用旧索引
+        （已发布过数据版本时读取当前版本中的索引，见 utils.release）
+"""
+
+import os
+import re
+import gzip
+import json
+import math
+import time
+import heapq
+import logging
+import threading
+import jieba
+import pandas as pd
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional
+from utils.entity_index import EntityIndex
+from utils.jieba_cache import init_jieba
+from utils.release import ReleaseStore
+
+# 参与检索的字段及其权重
+SEARCH_FIELDS = {
+    "title": 3.0,
+    "director": 2.0,
+    "actors": 1.5,
+    "comment": 1.0,
+}
+NAME_FIELDS = {"director", "actors"}
+# 检索结果中返回的字段
+RESULT_FIELDS = ["rank", "title", "director", "year", "nums-rating"]
+
+_PUNCTUATION = re.compile(r"[\s\W_]+", re.UNICODE)
+
+
+class SearchIndex:
+    """
+    基于 BM25 排序的倒排索引
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.docs: List[Dict] = []  # 每个文档的展示字段
+        self.doc_len: List[float] = []  # 加权后的文档长度
+        self.avgdl = 0.0
+        self.postings: Dict[str, list] = {}  # term -> [idf, [doc_id...], [tf...]]
+
+    @staticmethod
+    def _tokenize_text(text: str) -> List[str]:
+        """中文字段分词，去掉标点和空白"""
+        tokens = []
+        for token in jieba.cut_for_search(text.lower()):
+            token = _PUNCTUATION.sub("", token)
+            if token:
+                tokens.append(token)
+        return tokens
+
+    @staticmethod
+    def _tokenize_names(text: str) -> List[str]:
+        """
+        人名字段分词：先按 "/" 拆分出每个人，再拆分出中文名/外文名中的每个部分，
+        每个部分产生整词和字符二元组，便于按部分姓名检索（如 "诺兰"、"nolan"）
+        """
+        tokens = []
+        for name in text.split("/"):
+            tokens.extend(SearchIndex._tokenize_name(name))
+        return tokens
+
+    @staticmethod
+    def _tokenize_name(name: str) -> List[str]:
+        """单个人名的整词与字符二元组"""
+        tokens = []
+        for part in re.split(r"[\s·・.]+", name.lower()):
+            part = _PUNCTUATION.sub("", part)
+            if not part:
+                continue
+            tokens.append(part)
+            if len(part) > 2:
+                tokens.extend(part[i : i + 2] for i in range(len(part) - 1))
+        return tokens
+
+    def _tokenize_field(self, field: str, text: str) -> List[str]:
+        if field in NAME_FIELDS:
+            return self._tokenize_names(text)
+        return self._tokenize_text(text)
+
+    def _tokenize_query(self, query: str) -> List[str]:
+        """查询同时使用两种分词方式，保证与任意字段的索引词对齐"""
+        tokens = set(self._tokenize_text(query))
+        tokens.update(self._tokenize_names(query))
+        return list(tokens)
+
+    def build(self, df: pd.DataFrame) -> "SearchIndex":
+        """
+        由 DataFrame 建立索引
+
+        Args:
+            df: 电影数据DataFrame
+        """
+        init_jieba()
+        term_tfs: Dict[str, Dict[int, float]] = defaultdict(dict)
+        self.docs = []
+        self.doc_len = []
+
+        # 人名字段直接使用关联表：每个不同的人名只分词一次
+        entities = EntityIndex.for_frame(df)
+        name_tables = {}
+        for field in NAME_FIELDS:
+            if field in entities.tables:
+                table = entities.table(field)
+                label_tokens = [self._tokenize_name(label) for label in table.labels]
+                name_tables[field] = (table, label_tokens)
+
+        for doc_id, row in enumerate(df.to_dict("records")):
+            weighted_tf: Counter = Counter()
+            length = 0.0
+            for field, weight in SEARCH_FIELDS.items():
+                if field in name_tables:
+                    table, label_tokens = name_tables[field]
+                    codes = table.codes[table.indptr[doc_id] : table.indptr[doc_id + 1]]
+                    tokens = [token for code in codes for token in label_tokens[code]]
+                else:
+                    value = row.get(field)
+                    if value is None or (isinstance(value, float) and math.isnan(value)):
+                        continue
+                    tokens = self._tokenize_field(field, str(value))
+                length += weight * len(tokens)
+                for token in tokens:
+                    weighted_tf[token] += weight
+            for token, tf in weighted_tf.items():
+                term_tfs[token][doc_id] = tf
+            self.doc_len.append(length)
+            doc = {}
+            for field in RESULT_FIELDS:
+                if field not in row:
+                    continue
+                value = row[field]
+                if pd.isna(value):
+                    value = None
+                elif hasattr(value, "item"):  # NumPy 标量转为 Python 类型
+                    value = value.item()
+                doc[field] = value
+            self.docs.append(doc)
+
+        n_docs = len(self.docs)
+        self.avgdl = sum(self.doc_len) / n_docs if n_docs else 0.0
+        self.postings = {}
+        for term, doc_tfs in term_tfs.items():
+            df_t = len(doc_tfs)
+            idf = math.log(1 + (n_docs - df_t + 0.5) / (df_t + 0.5))
+            doc_ids = sorted(doc_tfs)
+            self.postings[term] = [idf, doc_ids, [doc_tfs[d] for d in doc_ids]]
+        return self
+
+    def save(self, path: str) -> None:
+        """将索引保存为 gzip 压缩的 JSON（先写临时文件再原子替换）"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        payload = {
+            "k1": self.k1,
+            "b": self.b,
+            "avgdl": self.avgdl,
+            "doc_len": self.doc_len,
+            "docs": self.docs,
+            "postings": self.postings,
+        }
+        tmp_path = f"{path}.tmp.{os.getpid()}"
+        with gzip.open(tmp_path, "wt", encoding="utf-8", compresslevel=5) as f:
+            json.dump(payload, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "SearchIndex":
+        """从磁盘加载索引"""
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            payload = json.load(f)
+        index = cls(k1=payload["k1"], b=payload["b"])
+        index.avgdl = payload["avgdl"]
+        index.doc_len = payload["doc_len"]
+        index.docs = payload["docs"]
+        index.postings = payload["postings"]
+        return index
+
+    def search(self, query: str, limit: int = 10) -> List[Dict]:
+        """
+        查询
+
+        Args:
+            query: 查询字符串
+            limit: 返回结果数量上限
+
+        Returns:
+            按 BM25 得分从高到低排序的结果列表
+        """
+        if not query or not self.docs:
+            return []
+        scores: Dict[int, float] = defaultdict(float)
+        k1, b, avgdl = self.k1, self.b, self.avgdl or 1.0
+        for term in self._tokenize_query(query):
+            posting = self.postings.get(term)
+            if posting is None:
+                continue
+            idf, doc_ids, tfs = posting
+            for doc_id, tf in zip(doc_ids, tfs):
+                norm = k1 * (1 - b + b * self.doc_len[doc_id] / avgdl)
+                scores[doc_id] += idf * tf * (k1 + 1) / (tf + norm)
+
+        top = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+        return [dict(self.docs[doc_id], score=round(score, 4)) for doc_id, score in top]
+
+
+class SearchIndexLoader:
+    """
+    Web 进程内的索引缓存，索引文件更新后自动重新加载
+    """
+
+    def __init__(
+        self,
+        path: str,
+        logger: logging.Logger = None,
+        check_interval: float = 5.0,
+        release: Optional[ReleaseStore] = None,
+    ):
+        self.path = path
+        self.release = release
+        self.logger = logger if logger else logging.getLogger(__name__)
+        self.check_interval = check_interval
+        self._index: Optional[SearchIndex] = None
+        self._version = 0
+        self._last_check = 0.0
+        self._lock = threading.Lock()
+        self._reload_thread: Optional[threading.Thread] = None
+
+    def get(self) -> Optional[SearchIndex]:
+        """
+        获取当前索引，索引文件不存在时返回 None
+
+        索引文件更新后在后台线程中加载新索引，加载完成前的查询继续使用旧索引
+        """
+        now = time.monotonic()
+        if self._index is not None and now - self._last_check < self.check_interval:
+            return self._index
+        if self._index is None:
+            with self._lock:
+                if self._index is None:
+                    self._load(self._file_version())
+                self._last_check = time.monotonic()
+                return self._index
+        self._last_check = now
+        if self._file_version() != self._version:
+            self.refresh()
+        return self._index
+
+    def _current_path(self) -> Optional[str]:
+        current = self.release.current() if self.release else None
+        return current.get("search_index") if current is not None else self.path
+
+    def _file_version(self) -> int:
+        path = self._current_path()
+        try:
+            return os.stat(path).st_mtime_ns if path else 0
+        except OSError:
+            return 0
+
+    def _load(self, version: int) -> None:
+        if version == 0:
+            self._index = None
+        elif version != self._version:
+            path = self._current_path()
+            # 查询分词使用项目内的词典缓存，不在第一次查询时从系统临时目录加载默认词典
+            init_jieba(self.logger)
+            start = time.perf_counter()
+            self._index = SearchIndex.load(path)
+            self.logger.info(
+                f"已加载检索索引: {path}，耗时 {time.perf_counter() - start:.3f} 秒"
+            )
+        self._version = version
+
+    def refresh(self, wait: bool = False) -> None:
+        """在后台重新加载索引文件，wait 为真时等待加载完成"""
+        with self._lock:
+            thread = self._reload_thread
+            if thread is None or not thread.is_alive():
+                thread = threading.Thread(target=self._reload, name="index-reload", daemon=True)
+                self._reload_thread = thread
+                thread.start()
+        if wait:
+            thread.join()
+
+    def _reload(self) -> None:
+        try:
+            self._load(self._file_version())
+            self._last_check = time.monotonic()
+        except Exception as e:
+            self.logger.error(f"重新加载检索索引失败，继续使用旧索引: {e}")
@@ -0,0 +1,62 @@
+"""
+耗时统计模块，按 阶段 × 环节（导入 / 初始化 / 执行）记录耗时并生成汇总报告
+
+下面是对StageTimer类中各个方法的介绍：
+    measure(): 上下文管理器，记录一段代码的耗时
+    add(): 直接累加一段耗时
+    report(): 生成按阶段汇总的耗时表格
+"""
+
+import time
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict
+
+PHASES = ("import", "init", "work")
+_PHASE_NAMES = {"import": "导入", "init": "初始化", "work": "执行"}
+
+
+class StageTimer:
+    """
+    按阶段与环节统计耗时
+    """
+
+    def __init__(self):
+        self.stages: "OrderedDict[str, Dict[str, float]]" = OrderedDict()
+        self.start = time.perf_counter()
+        self._lock = threading.Lock()  # 并发执行的阶段共用同一个计时器
+
+    def add(self, stage: str, phase: str, seconds: float) -> None:
+        with self._lock:
+            phases = self.stages.setdefault(stage, {p: 0.0 for p in PHASES})
+            phases[phase] = phases.get(phase, 0.0) + seconds
+
+    @contextmanager
+    def measure(self, stage: str, phase: str = "work"):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(stage, phase, time.perf_counter() - start)
+
+    def report(self) -> str:
+        """生成耗时表格（单位：秒）"""
+        header = f"{'阶段':<16}" + "".join(f"{_PHASE_NAMES[p]:>10}" for p in PHASES) + f"{'合计':>10}"
+        lines = [header, "-" * (16 + 10 * (len(PHASES) + 1))]
+        totals = {p: 0.0 for p in PHASES}
+        for stage, phases in self.stages.items():
+            for p in PHASES:
+                totals[p] += phases.get(p, 0.0)
+            lines.append(
+                f"{stage:<16}"
+                + "".join(f"{phases.get(p, 0.0):>10.3f}" for p in PHASES)
+                + f"{sum(phases.values()):>10.3f}"
+            )
+        lines.append(
+            f"{'合计':<16}"
+            + "".join(f"{totals[p]:>10.3f}" for p in PHASES)
+            + f"{sum(totals.values()):>10.3f}"
+        )
+        lines.append(f"总耗时(含未计入阶段的部分): {time.perf_counter() - self.start:.3f} 秒")
+        return "\n".join(lines)
@@ -0,0 +1,204 @@
+"""
+数据校验模块，按声明式的字段规则（config.MOVIE_SCHEMA）对整批电影数据做向量化校验
+
+每个字段只做一次整列运算（类型转换、正则提取、范围与可选值检查），不逐条处理记录：
+    - 必填字段校验失败的记录整条移入隔离文件（JSON Lines，附带失败原因与原始值）
+    - 选填字段校验失败时只将该字段置空，记录的其余字段保留
+各字段的失败次数与失败率登记在全局指标（utils.metrics）中，并输出到日志
+
+下面是对各个类和方法的介绍：
+    ValidationReport: 一批数据的校验结果（通过的数据、隔离的记录、各字段的失败统计）
+        summary(): 各字段失败率的文本表格
+    SchemaValidator: 校验器
+        validate(): 校验一批数据
+        quarantine(): 将隔离的记录追加写入隔离文件
+"""
+
+import os
+import json
+import time
+import logging
+import numpy as np
+import pandas as pd
+from typing import Dict, List
+from utils.metrics import REGISTRY
+
+_FAILURES = REGISTRY.counter(
+    "douban_validation_failures_total", "字段校验失败次数（按字段与原因）", ["field", "reason"]
+)
+_FAILURE_RATE = REGISTRY.gauge(
+    "douban_validation_failure_rate", "最近一批数据中各字段的校验失败率", ["field"]
+)
+_QUARANTINED = REGISTRY.counter("douban_validation_quarantined_total", "移入隔离文件的记录数")
+
+# 失败原因
+MISSING = "missing"  # 必填字段为空
+INVALID = "invalid"  # 无法转换为指定类型，或不匹配正则
+OUT_OF_RANGE = "out_of_range"  # 超出 min / max
+NOT_IN_CHOICES = "not_in_choices"  # 不在可选值中
+
+_EMPTY_STRINGS = {"", "None", "nan", "NaN", "null"}
+
+
+class ValidationReport:
+    """
+    一批数据的校验结果
+    """
+
+    def __init__(
+        self,
+        valid: pd.DataFrame,
+        quarantined: pd.DataFrame,
+        failures: Dict[str, Dict[str, int]],
+        total: int,
+    ):
+        self.valid = valid  # 通过校验的数据（选填字段的非法值已置空）
+        self.quarantined = quarantined  # 必填字段未通过校验的原始记录，reasons 列为失败原因
+        self.failures = failures  # 字段 -> {原因: 次数}
+        self.total = total
+
+    def failure_rates(self) -> Dict[str, float]:
+        """各字段的失败率"""
+        if not self.total:
+            return {}
+        return {field: sum(reasons.values()) / self.total for field, reasons in self.failures.items()}
+
+    def summary(self) -> str:
+        lines = [f"{'字段':<16}{'失败数':>8}{'失败率':>10}  原因"]
+        for field, reasons in self.failures.items():
+            count = sum(reasons.values())
+            if not count:
+                continue
+            detail = ", ".join(f"{reason}={n}" for reason, n in reasons.items() if n)
+            lines.append(f"{field:<16}{count:>8}{count / self.total:>10.2%}  {detail}")
+        lines.append(f"共 {self.total} 条记录，通过 {len(self.valid)} 条，隔离 {len(self.quarantined)} 条")
+        return "\n".join(lines)
+
+
+class SchemaValidator:
+    """
+    按字段规则对整批数据做向量化校验
+    """
+
+    def __init__(self, schema: Dict[str, Dict], logger: logging.Logger = None):
+        """
+        Args:
+            schema: 字段 -> 规则（type、required、pattern、min、max、choices），格式见 config.MOVIE_SCHEMA
+            logger: 日志记录器
+        """
+        self.schema = schema
+        self.logger = logger if logger else logging.getLogger(__name__)
+
+    def _check_field(self, raw: pd.Series, rule: Dict):
+        """
+        校验并转换一列
+
+        Returns:
+            (转换后的列, 失败原因数组：通过为 None)
+        """
+        numeric = rule.get("type") in ("int", "float")
+        reasons = np.full(len(raw), None, dtype=object)
+        if numeric and pd.api.types.is_numeric_dtype(raw):
+            # 已是数值列（如从 CSV 读取），不需要字符串处理
+            values = raw.astype(float)
+            empty = values.isna().to_numpy()
+        else:
+            as_text = raw.astype("string").str.strip()
+            empty = raw.isna().to_numpy() | as_text.isin(_EMPTY_STRINGS).fillna(True).to_numpy()
+            values = as_text.mask(empty)
+            if rule.get("pattern"):
+                values = values.str.extract(rule["pattern"], expand=False)
+            if numeric:
+                values = pd.to_numeric(values.astype(object), errors="coerce").astype(float)
+        invalid = values.isna().to_numpy() & ~empty
+        reasons[invalid] = INVALID
+
+        if numeric:
+            out_of_range = np.zeros(len(raw), dtype=bool)
+            if rule.get("min") is not None:
+                out_of_range |= (values < rule["min"]).fillna(False).to_numpy()
+            if rule.get("max") is not None:
+                out_of_range |= (values > rule["max"]).fillna(False).to_numpy()
+            reasons[out_of_range] = OUT_OF_RANGE
+        if rule.get("choices") is not None:
+            not_in_choices = (~values.isin(rule["choices"]) & values.notna()).to_numpy()
+            reasons[not_in_choices] = NOT_IN_CHOICES
+        if rule.get("required"):
+            reasons[empty] = MISSING
+
+        values = values.mask(pd.notna(reasons))
+        if rule.get("type") == "str":
+            values = values.astype(object).where(values.notna(), None)
+        return values, reasons
+
+    def validate(self, df: pd.DataFrame) -> ValidationReport:
+        """
+        校验一批数据
+
+        Args:
+            df: 原始数据，缺少的字段视为全部为空
+
+        Returns:
+            校验结果
+        """
+        total = len(df)
+        valid = df.copy()
+        failures: Dict[str, Dict[str, int]] = {}
+        row_reasons: List[List[str]] = [[] for _ in range(total)]
+        rejected = np.zeros(total, dtype=bool)
+
+        for field, rule in self.schema.items():
+            raw = df[field] if field in df.columns else pd.Series([None] * total, index=df.index)
+            values, reasons = self._check_field(raw, rule)
+            valid[field] = values.to_numpy()
+            failed = np.flatnonzero(pd.notna(reasons))
+            counts = pd.Series(reasons[failed]).value_counts().to_dict() if len(failed) else {}
+            failures[field] = counts
+            for reason, n in counts.items():
+                _FAILURES.inc(n, field=field, reason=reason)
+            _FAILURE_RATE.set(len(failed) / total if total else 0.0, field=field)
+            for i in failed:
+                row_reasons[i].append(f"{field}:{reasons[i]}")
+            if rule.get("required"):
+                rejected[failed] = True
+
+        valid = valid[~rejected].reset_index(drop=True)
+        for field, rule in self.schema.items():
+            # 整数字段没有空值时转换为整数类型，有空值时与 pd.to_numeric 一样保留为浮点数
+            if rule.get("type") == "int" and valid[field].notna().all():
+                valid[field] = valid[field].astype("int64")
+
+        quarantined = df[rejected].copy()
+        quarantined["reasons"] = [row_reasons[i] for i in np.flatnonzero(rejected)]
+        report = ValidationReport(
+            valid=valid,
+            quarantined=quarantined.reset_index(drop=True),
+            failures=failures,
+            total=total,
+        )
+        if any(failures.values()):
+            self.logger.warning("数据校验未通过的字段：\n" + report.summary())
+        return report
+
+    def quarantine(self, report: ValidationReport, path: str) -> int:
+        """
+        将隔离的记录追加写入隔离文件，每行一条：{"time", "reasons", "record"}
+
+        Returns:
+            写入的记录数
+        """
+        if report.quarantined.empty:
+            return 0
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        now = time.strftime("%Y-%m-%d %H:%M:%S")
+        records = report.quarantined.drop(columns="reasons").astype(object)
+        records = records.where(records.notna(), None).to_dict("records")
+        with open(path, "a", encoding="utf-8") as f:
+            for record, reasons in zip(records, report.quarantined["reasons"]):
+                entry = {"time": now, "reasons": reasons, "record": record}
+                f.write(json.dumps(entry, ensure_ascii=False, default=str) + "\n")
+        _QUARANTINED.inc(len(records))
+        self.logger.warning(f"{len(records)} 条记录未通过校验，已移入隔离文件 {path}")
+        return len(records)
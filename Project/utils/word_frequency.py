@@ -0,0 +1,438 @@
+"""
+流式词频统计模块，用于对大规模文本（如爬取的大量短评）分块读取、并行分词并增量累计词频
+
+读取的文本不会拼接成一个大字符串：文件按行/按块流式读取，每块在工作进程中分词计数，
+主进程合并各块的部分词频；内存中的词表超过上限时，按词排序后溢写(spill)到磁盘，
+最后与已持久化的词频文件做多路归并，内存占用只与上限有关，与语料规模无关
+
+持久化文件（均位于 store_dir 下）：
+    counts.<代数>.tsv.gz: 按词排序的 "词\\t次数" 文本（gzip 压缩），每次归并写入新的一代
+    state.json: 当前一代词频文件的文件名、各数据源已处理到的位置、累计文档数与词数，用于增量更新
+词频文件与处理进度通过 state.json 的一次原子替换同时生效：替换之前中断时仍使用上一代词频与进度，
+不会重复计数；没有被 state.json 引用的词频文件在下次更新后删除
+
+下面是对WordFrequencyEngine类中各个方法的介绍：
+    __init__(): 初始化引擎，设置存储目录、内存词表上限、分块大小与进程数
+    _iter_source(): 私有方法，从上次处理到的位置开始流式读取数据源中的文本
+    _iter_gzip_lines(): 私有方法，按 gzip 成员增量读取压缩数据源，不解压已处理的成员
+    _spill(): 私有方法，将内存中的部分词频排序后写入临时文件
+    _merge_runs(): 私有方法，多路归并已持久化的词频与所有临时文件
+    update(): 核心方法，增量处理数据源中新增的文本（文件追加写入后只处理新增部分）
+    update_texts(): 增量处理内存中的一批文本
+    iter_counts(): 流式遍历已持久化的词频
+    top_terms(): 出现次数最多的前 N 个词（流式遍历，不加载全部词表）
+    export_top_terms(): 将高频词报告保存为 CSV
+    rebuild(): 清空已持久化的词频与处理进度
+
+模块级函数：
+    keep_word(): 判断一个词是否计入词频（过滤单字、停用词和纯标点）
+"""
+
+import os
+import re
+import csv
+import glob
+import gzip
+import zlib
+import json
+import heapq
+import shutil
+import logging
+import jieba
+from collections import Counter
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import STOPWORDS_PATH
+from utils.jieba_cache import init_jieba
+from utils.process_pool import process_pool
+
+# 只保留包含中文、字母或数字的词
+_WORD_PATTERN = re.compile(r"[\u4e00-\u9fffA-Za-z0-9]")
+# 支持的数据源格式：纯文本（每行一条）、JSON Lines（可 gzip 压缩）、CSV
+_LINE_SUFFIXES = (".txt", ".txt.gz", ".jsonl", ".jsonl.gz")
+# 读取压缩数据源时每次读入的字节数
+_READ_BLOCK = 1 << 20
+_COUNTS_PATTERN = re.compile(r"^counts(\.\d+)?\.tsv\.gz$")
+
+# 工作进程中的停用词（由进程池初始化函数设置，避免随每个任务传输）
+_worker_stopwords: frozenset = frozenset()
+
+
+def keep_word(word: str, stopwords) -> bool:
+    """判断一个词是否计入词频：至少两个字符、不是停用词、包含中文/字母/数字"""
+    return len(word) >= 2 and word not in stopwords and bool(_WORD_PATTERN.search(word))
+
+
+def _init_count_worker(stopwords: frozenset) -> None:
+    global _worker_stopwords
+    _worker_stopwords = stopwords
+    init_jieba()
+
+
+def _count_chunk(texts: List[str], stopwords: Optional[frozenset] = None) -> Dict[str, int]:
+    """进程池任务：对一块文本分词并统计词频"""
+    stopwords = _worker_stopwords if stopwords is None else stopwords
+    counts = Counter()
+    for text in texts:
+        for word in jieba.cut(text):
+            word = word.strip()
+            if keep_word(word, stopwords):
+                counts[word] += 1
+    return dict(counts)
+
+
+def _read_sorted_counts(path: str) -> Iterator[Tuple[str, int]]:
+    """流式读取按词排序的词频文件"""
+    with gzip.open(path, "rt", encoding="utf-8", newline="\n") as f:
+        for line in f:
+            word, _, count = line.rstrip("\n").rpartition("\t")
+            yield word, int(count)
+
+
+class WordFrequencyEngine:
+    """
+    分块读取、并行分词、溢写归并的增量词频统计引擎
+    """
+
+    def __init__(
+        self,
+        store_dir: str,
+        logger: logging.Logger = None,
+        stopwords_path: Optional[str] = STOPWORDS_PATH,
+        text_field: str = "comment",
+        chunk_size: int = 2000,
+        max_terms_in_memory: int = 500_000,
+        max_workers: Optional[int] = None,
+    ):
+        """
+        Args:
+            store_dir: 词频文件与处理进度的保存目录
+            logger: 日志记录器
+            stopwords_path: 停用词文件路径（每行一个词），为 None 时不过滤停用词
+            text_field: JSON Lines / CSV 数据源中的文本字段名
+            chunk_size: 每个分词任务包含的文本条数
+            max_terms_in_memory: 内存中部分词表的词数上限，超过后溢写到磁盘
+            max_workers: 分词进程数，为 1 时在主进程中分词
+        """
+        self.store_dir = store_dir
+        self.logger = logger if logger else logging.getLogger(__name__)
+        self.stopwords = self._load_stopwords(stopwords_path)
+        self.text_field = text_field
+        self.chunk_size = chunk_size
+        self.max_terms_in_memory = max_terms_in_memory
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.state_path = os.path.join(store_dir, "state.json")
+        self.runs_dir = os.path.join(store_dir, "runs")
+        os.makedirs(self.store_dir, exist_ok=True)
+        self.state = self._load_state()
+
+    @staticmethod
+    def _load_stopwords(path: Optional[str]) -> frozenset:
+        if not path or not os.path.exists(path):
+            return frozenset()
+        with open(path, "r", encoding="utf-8") as f:
+            return frozenset(line.strip() for line in f if line.strip())
+
+    @property
+    def counts_path(self) -> str:
+        """当前一代词频文件（由 state.json 引用）"""
+        return os.path.join(self.store_dir, self.state.get("counts_file", "counts.tsv.gz"))
+
+    def _load_state(self) -> Dict:
+        if os.path.exists(self.state_path):
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        return {"sources": {}, "documents": 0, "tokens": 0, "terms": 0}
+
+    def _save_state(self) -> None:
+        """原子写入 state.json，新一代词频文件与处理进度同时生效，之后删除不再引用的词频文件"""
+        tmp_path = f"{self.state_path}.tmp.{os.getpid()}"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.state, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.state_path)
+        current = os.path.basename(self.counts_path)
+        for name in os.listdir(self.store_dir):
+            if _COUNTS_PATTERN.match(name) and name != current:
+                os.remove(os.path.join(self.store_dir, name))
+
+    def _extract_text(self, line: bytes, is_json: bool) -> Optional[str]:
+        text = line.decode("utf-8", errors="replace").strip()
+        if not text:
+            return None
+        if is_json:
+            try:
+                text = json.loads(text).get(self.text_field)
+            except (ValueError, AttributeError):
+                return None
+        return str(text) if text else None
+
+    def _iter_source(self, path: str) -> Iterator[str]:
+        """
+        从上次处理到的位置开始流式读取数据源，读取完毕后更新该数据源的进度
+
+        纯文本文件记录已处理的字节偏移量，gzip 文件记录成员在压缩文件中的偏移量（见 _iter_gzip_lines()），
+        CSV 文件记录已处理的行数；文件比已处理的位置短（被改写而非追加）时无法增量处理，跳过并提示调用 rebuild()
+        """
+        key = os.path.abspath(path)
+        progress = self.state["sources"].get(key, {})
+        lower = path.lower()
+
+        if lower.endswith(_LINE_SUFFIXES):
+            is_json = ".jsonl" in lower
+            offset = progress.get("member_offset" if lower.endswith(".gz") else "offset", 0)
+            # 用文件大小判断是否被改写，不需要读取（或解压）整个文件
+            if os.path.getsize(path) < offset:
+                self.logger.warning(f"{path} 比上次处理时短，已被改写，请调用 rebuild() 后重新统计")
+                return
+            if lower.endswith(".gz"):
+                for line in self._iter_gzip_lines(path, key, progress):
+                    text = self._extract_text(line, is_json)
+                    if text:
+                        yield text
+                return
+            with open(path, "rb") as f:
+                f.seek(offset)
+                # 只在读到完整的一行（以换行结尾）时推进偏移量，正在追加的半行留到下次
+                for line in iter(f.readline, b""):
+                    if not line.endswith(b"\n"):
+                        break
+                    offset += len(line)
+                    text = self._extract_text(line, is_json)
+                    if text:
+                        yield text
+            self.state["sources"][key] = {"offset": offset}
+        elif lower.endswith(".csv"):
+            import pandas as pd
+
+            rows = progress.get("rows", 0)
+            reader = pd.read_csv(
+                path,
+                usecols=[self.text_field],
+                skiprows=range(1, rows + 1),
+                chunksize=self.chunk_size,
+            )
+            for chunk in reader:
+                rows += len(chunk)
+                for text in chunk[self.text_field].dropna().astype(str):
+                    yield text
+            self.state["sources"][key] = {"rows": rows}
+        else:
+            self.logger.warning(f"不支持的数据源格式，已跳过: {path}")
+
+    def _iter_gzip_lines(self, path: str, key: str, progress: Dict) -> Iterator[bytes]:
+        """
+        按 gzip 成员增量读取压缩数据源中的完整行
+
+        追加写入的 gzip 文件由多个成员(member)首尾相接组成。进度记录最后一个未读完的成员
+        在压缩文件中的起点(member_offset)及其中已处理的行数(member_lines)，
+        下次直接从该成员开始解压并跳过已处理的行，之前的成员不需要再解压
+        """
+        member_start = progress.get("member_offset", 0)
+        skip = progress.get("member_lines", 0)
+        lines_in_member = 0
+        pending = b""
+        decompressor = zlib.decompressobj(wbits=31)
+        with open(path, "rb") as f:
+            f.seek(member_start)
+            data_start, data = member_start, b""
+            while True:
+                if not data:
+                    data_start, data = f.tell(), f.read(_READ_BLOCK)
+                    if not data:
+                        break
+                try:
+                    pending += decompressor.decompress(data)
+                except zlib.error as e:
+                    self.logger.warning(f"{path} 在偏移量 {member_start} 之后的内容无法解压，留到下次处理: {e}")
+                    break
+                lines = pending.split(b"\n")
+                pending = lines.pop()
+                if decompressor.eof and pending:
+                    lines.append(pending)  # 成员以不带换行的一行结尾
+                    pending = b""
+                for line in lines:
+                    lines_in_member += 1
+                    if lines_in_member > skip:
+                        yield line
+                if decompressor.eof:
+                    # 成员读完：进度移到下一个成员的起点
+                    unused = decompressor.unused_data
+                    member_start = data_start + len(data) - len(unused)
+                    data_start, data = member_start, unused
+                    lines_in_member = skip = 0
+                    decompressor = zlib.decompressobj(wbits=31)
+                else:
+                    data = b""
+        # 最后一个成员可能正在追加写入，只记录其中已处理的完整行
+        self.state["sources"][key] = {
+            "member_offset": member_start,
+            "member_lines": max(lines_in_member, skip),
+        }
+
+    def _chunks(self, texts: Iterable[str]) -> Iterator[List[str]]:
+        chunk = []
+        for text in texts:
+            chunk.append(text)
+            if len(chunk) >= self.chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def _count_chunks(self, chunks: Iterator[List[str]]) -> Iterator[Tuple[int, Dict[str, int]]]:
+        """
+        分词计数，依次产出 (文本条数, 部分词频)
+
+        使用进程池时最多同时提交 2 * max_workers 个任务，读取速度不会超过分词速度太多
+        """
+        if self.max_workers <= 1:
+            for chunk in chunks:
+                yield len(chunk), _count_chunk(chunk, self.stopwords)
+            return
+
+        with process_pool(
+            max_workers=self.max_workers,
+            initializer=_init_count_worker,
+            initargs=(self.stopwords,),
+        ) as executor:
+            pending = []
+            for chunk in chunks:
+                pending.append((len(chunk), executor.submit(_count_chunk, chunk)))
+                if len(pending) >= 2 * self.max_workers:
+                    n, future = pending.pop(0)
+                    yield n, future.result()
+            for n, future in pending:
+                yield n, future.result()
+
+    def _spill(self, counts: Counter) -> str:
+        """将部分词频按词排序后写入临时文件"""
+        os.makedirs(self.runs_dir, exist_ok=True)
+        path = os.path.join(self.runs_dir, f"run_{len(os.listdir(self.runs_dir)):05d}.tsv.gz")
+        with gzip.open(path, "wt", encoding="utf-8", newline="\n", compresslevel=1) as f:
+            for word in sorted(counts):
+                f.write(f"{word}\t{counts[word]}\n")
+        return path
+
+    def _merge_runs(self, runs: List[str]) -> int:
+        """
+        多路归并已持久化的词频文件与临时文件，写入新一代词频文件，返回合并后的词数
+
+        新文件只在 state.json 保存后才生效（_save_state()）
+        """
+        sources = [_read_sorted_counts(path) for path in runs]
+        if os.path.exists(self.counts_path):
+            sources.append(_read_sorted_counts(self.counts_path))
+
+        n_terms = 0
+        generation = self.state.get("generation", 0) + 1
+        counts_file = f"counts.{generation}.tsv.gz"
+        path = os.path.join(self.store_dir, counts_file)
+        tmp_path = f"{path}.tmp.{os.getpid()}"
+        with gzip.open(tmp_path, "wt", encoding="utf-8", newline="\n", compresslevel=5) as f:
+            current, total = None, 0
+            for word, count in heapq.merge(*sources):
+                if word != current:
+                    if current is not None:
+                        f.write(f"{current}\t{total}\n")
+                        n_terms += 1
+                    current, total = word, 0
+                total += count
+            if current is not None:
+                f.write(f"{current}\t{total}\n")
+                n_terms += 1
+        os.replace(tmp_path, path)
+        self.state["generation"] = generation
+        self.state["counts_file"] = counts_file
+        return n_terms
+
+    def _consume(self, texts: Iterable[str]) -> Tuple[int, int]:
+        """分词并累计，内存词表超过上限时溢写，返回 (新增文本数, 新增词数)"""
+        shutil.rmtree(self.runs_dir, ignore_errors=True)  # 清理上次中断留下的临时文件
+        init_jieba(self.logger)
+        partial = Counter()
+        runs = []
+        n_docs = n_tokens = 0
+        for n, counts in self._count_chunks(self._chunks(texts)):
+            n_docs += n
+            n_tokens += sum(counts.values())
+            partial.update(counts)
+            if len(partial) > self.max_terms_in_memory:
+                runs.append(self._spill(partial))
+                partial = Counter()
+        if partial:
+            runs.append(self._spill(partial))
+        if runs:
+            self.state["terms"] = self._merge_runs(runs)
+            self.logger.info(f"已归并 {len(runs)} 个部分词频文件，共 {self.state['terms']} 个词")
+        shutil.rmtree(self.runs_dir, ignore_errors=True)
+        return n_docs, n_tokens
+
+    def update(self, sources: Iterable[str]) -> int:
+        """
+        增量处理数据源中新增的文本
+
+        Args:
+            sources: 文件路径或通配符（.txt/.jsonl 及其 .gz 压缩形式、.csv）
+
+        Returns:
+            本次新处理的文本条数
+        """
+        paths = []
+        for pattern in sources:
+            matched = sorted(glob.glob(pattern))
+            if not matched:
+                self.logger.warning(f"未找到数据源: {pattern}")
+            paths.extend(matched)
+
+        def texts():
+            for path in paths:
+                yield from self._iter_source(path)
+
+        # 进度随读取推进，新一代词频文件与进度在保存 state.json 时同时生效，中断时不会丢失或重复计数
+        n_docs, n_tokens = self._consume(texts())
+        self.state["documents"] += n_docs
+        self.state["tokens"] += n_tokens
+        self._save_state()
+        self.logger.info(f"词频增量更新：新处理 {n_docs} 条文本，{n_tokens} 个词")
+        return n_docs
+
+    def update_texts(self, texts: Iterable[str]) -> int:
+        """增量处理内存中的一批文本，返回处理的文本条数"""
+        n_docs, n_tokens = self._consume(t for t in texts if t)
+        self.state["documents"] += n_docs
+        self.state["tokens"] += n_tokens
+        self._save_state()
+        return n_docs
+
+    def iter_counts(self) -> Iterator[Tuple[str, int]]:
+        """按词的顺序流式遍历已持久化的词频"""
+        if os.path.exists(self.counts_path):
+            yield from _read_sorted_counts(self.counts_path)
+
+    def top_terms(self, n: int = 200) -> List[Tuple[str, int]]:
+        """出现次数最多的前 n 个词，次数相同时按词排序"""
+        top = heapq.nsmallest(n, self.iter_counts(), key=lambda item: (-item[1], item[0]))
+        return top
+
+    def export_top_terms(self, path: str, n: int = 200) -> None:
+        """将高频词报告（排名、词、次数、占比）保存为 CSV"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        total = self.state["tokens"] or 1
+        with open(path, "w", encoding="utf-8-sig", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["rank", "word", "count", "ratio"])
+            for i, (word, count) in enumerate(self.top_terms(n), start=1):
+                writer.writerow([i, word, count, f"{count / total:.6f}"])
+        self.logger.info(f"高频词报告已保存至 {path}")
+
+    def rebuild(self) -> None:
+        """清空已持久化的词频与处理进度，下次 update() 时从头统计"""
+        for name in os.listdir(self.store_dir):
+            if _COUNTS_PATTERN.match(name) or name == os.path.basename(self.state_path):
+                os.remove(os.path.join(self.store_dir, name))
+        shutil.rmtree(self.runs_dir, ignore_errors=True)
+        self.state = self._load_state()
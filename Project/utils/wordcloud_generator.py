@@ -3,24 +3,106 @@
 
 下面是对WordCloudGenerator类中各个方法的介绍：
     __init__(): 初始化生成器，设置日志记录器和默认字体
-    _load_stopwords(): 私有方法，加载停用词（可扩展）
-    _processing_text(): 私有方法，对文本列表进行分词和清洗
-    generate_wordcloud(): 核心方法，生成并保存词云图片
+    _load_stopwords(): 私有方法，从 STOPWORDS_PATH 加载停用词
+    _load_token_cache() / _save_token_cache(): 私有方法，读写按文本哈希缓存的分词结果
+    _tokenize_records(): 私有方法，逐条记录分词，只对缓存中没有的文本调用 jieba，
+        待分词的记录较多时在进程池中并行分词
+    _count_words(): 私有方法，统计词频（过滤停用词、单字和标点）
+    generate_wordcloud(): 核心方法，根据词频生成词云，多个列在进程池中并行绘制，
+        图片直接由 WordCloud 画布写出（不经过 matplotlib 重新缩放和编码）
+    generate_from_frequencies(): 直接由已统计好的词频生成词云
+
+模块级函数：
+    load_mask(): 读取遮罩图片并二值化，按 (路径, 修改时间, 尺寸) 缓存
 """
 
+import json
+import time
+import threading
+import hashlib
 import logging
 import jieba
 import numpy as np
 import pandas as pd
 from PIL import Image
 from wordcloud import WordCloud
-from typing import List, Optional
+from collections import Counter
+from concurrent.futures import as_completed
+from typing import Dict, List, Optional, Tuple
 import os
-from matplotlib import pyplot as plt
 import sys
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from config import IMAGE_SAVE_DIR
+from config import IMAGE_SAVE_DIR, STOPWORDS_PATH, TOKEN_CACHE_PATH
+from utils.word_frequency import keep_word
+from utils.jieba_cache import init_jieba
+from utils.process_pool import process_pool
+
+# 遮罩缓存：(路径, 修改时间, 尺寸) -> 二值化后的遮罩数组
+_MASK_CACHE: Dict[Tuple[str, int, Optional[Tuple[int, int]]], np.ndarray] = {}
+_MASK_CACHE_LOCK = threading.Lock()
+
+
+def _cut_texts(texts: List[str]) -> List[List[str]]:
+    """进程池任务：对一批文本分词"""
+    return [jieba.lcut(text) for text in texts]
+
+
+def load_mask(
+    path: str, size: Optional[Tuple[int, int]] = None, threshold: int = 250
+) -> np.ndarray:
+    """
+    读取遮罩图片并二值化
+
+    透明像素按白色处理；灰度 >= threshold 的像素置为 255（不绘制区域），其余置为 0。
+    结果按 (路径, 修改时间, 尺寸) 缓存，图片未修改时不会重复解码
+
+    Args:
+        path: 遮罩图片路径
+        size: 可选的 (宽, 高)，遮罩会被缩放到该尺寸
+        threshold: 二值化阈值
+    """
+    key = (os.path.abspath(path), os.stat(path).st_mtime_ns, size)
+    with _MASK_CACHE_LOCK:
+        mask = _MASK_CACHE.get(key)
+    if mask is not None:
+        return mask
+
+    with Image.open(path) as img:
+        if img.mode in ("RGBA", "LA") or "transparency" in img.info:
+            background = Image.new("RGBA", img.size, (255, 255, 255, 255))
+            img = Image.alpha_composite(background, img.convert("RGBA"))
+        gray = img.convert("L")
+        if size is not None:
+            gray = gray.resize(size, Image.LANCZOS)
+        mask = np.where(np.asarray(gray) >= threshold, 255, 0).astype(np.uint8)
+    mask.setflags(write=False)
+
+    with _MASK_CACHE_LOCK:
+        # 同一路径只保留最新版本
+        for old_key in [k for k in _MASK_CACHE if k[0] == key[0] and k[1] != key[1]]:
+            del _MASK_CACHE[old_key]
+        _MASK_CACHE[key] = mask
+    return mask
+
+
+def _render_wordcloud(
+    frequencies: Dict[str, int], mask: np.ndarray, options: Dict, save_path: str
+) -> float:
+    """绘制单个词云并直接由画布写出图片，返回耗时(秒)"""
+    start = time.perf_counter()
+    wc = WordCloud(
+        background_color="white",
+        mask=mask,
+        font_path=options["font_path"],
+        width=options["width"],
+        height=options["height"],
+        scale=options["scale"],
+        max_words=options["max_words"],
+    )
+    wc.generate_from_frequencies(frequencies)
+    wc.to_file(save_path)
+    return time.perf_counter() - start
 
 
 class WordCloudGenerator:
@@ -30,20 +112,141 @@ class WordCloudGenerator:
         logger: logging.Logger = None,
         save_dir: str = IMAGE_SAVE_DIR,
         font_path: str = "msyh.ttc",  # 默认字体路径
+        stopwords_path: str = STOPWORDS_PATH,
+        token_cache_path: Optional[str] = TOKEN_CACHE_PATH,
+        parallel_threshold: int = 5000,
+        width: int = 800,
+        height: int = 600,
+        scale: float = 1.0,
+        max_words: int = 200,
+        max_workers: Optional[int] = None,
     ):
-        self.logger = logger
+        """
+        Args:
+            data: 电影数据DataFrame
+            logger: 日志记录器
+            save_dir: 词云图片保存目录
+            font_path: 字体路径
+            stopwords_path: 停用词文件路径（每行一个词）
+            token_cache_path: 分词缓存文件路径，为 None 时不使用缓存
+            parallel_threshold: 待分词记录数达到该值时使用进程池并行分词
+            width / height: 画布尺寸（使用遮罩时以遮罩尺寸为准）
+            scale: 输出图片相对画布的放大倍数
+            max_words: 词云中最多显示的词数
+            max_workers: 并行绘制的进程数，为 1 时顺序绘制
+        """
+        self.logger = logger if logger else logging.getLogger(__name__)
         self.save_dir = save_dir
         self.font_path = font_path
         self.data = data
+        self.stopwords_path = stopwords_path
+        self.token_cache_path = token_cache_path
+        self.parallel_threshold = parallel_threshold
+        self.width = width
+        self.height = height
+        self.scale = scale
+        self.max_words = max_words
+        self.max_workers = max_workers
+        self.stopwords = self._load_stopwords()
+        self._token_cache: Optional[Dict[str, List[str]]] = None
+        self._touched_keys = set()  # 本次运行用到的缓存项，保存时只保留这些
+        self._cache_dirty = False
+
+    def _load_stopwords(self) -> set:
+        """加载停用词，文件不存在时返回空集合"""
+        if not self.stopwords_path or not os.path.exists(self.stopwords_path):
+            self.logger.info(f"未找到停用词文件 {self.stopwords_path}，不过滤停用词")
+            return set()
+        with open(self.stopwords_path, "r", encoding="utf-8") as f:
+            stopwords = {line.strip() for line in f if line.strip()}
+        self.logger.info(f"已加载 {len(stopwords)} 个停用词")
+        return stopwords
+
+    def _load_token_cache(self) -> Dict[str, List[str]]:
+        if self._token_cache is None:
+            self._token_cache = {}
+            if self.token_cache_path and os.path.exists(self.token_cache_path):
+                try:
+                    with open(self.token_cache_path, "r", encoding="utf-8") as f:
+                        self._token_cache = json.load(f)
+                except (OSError, ValueError) as e:
+                    self.logger.warning(f"分词缓存读取失败，将重新分词: {e}")
+        return self._token_cache
+
+    def _save_token_cache(self) -> None:
+        """保存分词缓存，只保留本次运行用到的记录，避免缓存无限增长"""
+        if not self.token_cache_path or self._token_cache is None:
+            return
+        if not self._cache_dirty and len(self._touched_keys) == len(self._token_cache):
+            return
+        cache = {k: self._token_cache[k] for k in self._touched_keys}
+        directory = os.path.dirname(self.token_cache_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.token_cache_path}.tmp.{os.getpid()}"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(cache, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, self.token_cache_path)
+        self._cache_dirty = False
 
-    def _processing_text(self, text_series: pd.Series) -> str:
-        # 1. 拼接所有文本
-        text = " ".join(text_series.dropna().astype(str).tolist())
+    def _tokenize_records(self, texts: List[str]) -> List[List[str]]:
+        """
+        逐条记录分词
 
-        # 2. jieba分词
-        cut = jieba.cut(text)
-        string = " ".join(cut)
-        return string
+        以文本的哈希为键缓存分词结果，数据小幅变化后只需对新增或修改的记录分词
+        """
+        cache = self._load_token_cache()
+        keys = [hashlib.sha1(text.encode("utf-8")).hexdigest()[:20] for text in texts]
+        self._touched_keys.update(keys)
+
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in cache and key not in missing:
+                missing[key] = text
+
+        if missing:
+            # 全部命中缓存时不需要加载 jieba 词典；需要分词时在启动进程池之前加载并写入词典缓存，
+            # 工作进程在初始化时从缓存加载
+            init_jieba(self.logger)
+            missing_keys = list(missing)
+            missing_texts = [missing[k] for k in missing_keys]
+            if len(missing_texts) >= self.parallel_threshold:
+                workers = os.cpu_count() or 1
+                chunk = max(1, len(missing_texts) // (workers * 4) + 1)
+                batches = [
+                    missing_texts[i : i + chunk]
+                    for i in range(0, len(missing_texts), chunk)
+                ]
+                with process_pool(max_workers=workers, initializer=init_jieba) as executor:
+                    results = [t for batch in executor.map(_cut_texts, batches) for t in batch]
+            else:
+                results = _cut_texts(missing_texts)
+            cache.update(zip(missing_keys, results))
+            self._cache_dirty = True
+            self.logger.info(
+                f"分词 {len(missing_texts)} 条新记录，{len(texts) - len(missing_texts)} 条命中缓存"
+            )
+        return [cache[key] for key in keys]
+
+    def _count_words(self, text_series: pd.Series) -> Counter:
+        """统计词频，过滤停用词、单字和纯标点"""
+        texts = text_series.dropna().astype(str).tolist()
+        counts = Counter()
+        for tokens in self._tokenize_records(texts):
+            counts.update(tokens)
+        for word in list(counts):
+            if not keep_word(word.strip(), self.stopwords):
+                del counts[word]
+        return counts
+
+    def _render_options(self) -> Dict:
+        return {
+            "font_path": self.font_path,
+            "width": self.width,
+            "height": self.height,
+            "scale": self.scale,
+            "max_words": self.max_words,
+        }
 
     def generate_wordcloud(
         self,
@@ -54,35 +257,76 @@ class WordCloudGenerator:
             self.logger.warning("未提供遮罩图片，无法生成词云")
             return False
 
-        img = mask_path
-        img_array = np.array(Image.open(img))
+        mask = load_mask(mask_path)
 
-        success = False
+        # 分词与词频统计在主进程中完成（共享分词缓存），绘制在进程池中并行
+        tasks = []
         for column in columns:
             if self.data[column].empty:
                 self.logger.warning(f"列 {column} 中没有数据，跳过该列的词云生成")
                 continue
-            file_name = f"wordcloud_{column}.png"
-            string = self._processing_text(self.data[column])
-            wc = WordCloud(
-                background_color="white",
-                mask=img_array,
-                font_path=self.font_path,
-            )
-            wc.generate_from_text(string)
-
-            # 绘制图片
-            success = True
-            plt.imshow(wc)
-            plt.axis("off")
-            plt.savefig(os.path.join(self.save_dir, file_name))
-            plt.close()
-        if success:
-            self.logger.info(
-                f"词云图片已保存至 {os.path.join(self.save_dir, file_name)}"
-            )
+            frequencies = self._count_words(self.data[column])
+            if not frequencies:
+                self.logger.warning(f"列 {column} 分词后没有有效词语，跳过该列的词云生成")
+                continue
+            save_path = os.path.join(self.save_dir, f"wordcloud_{column}.png")
+            tasks.append((column, dict(frequencies), save_path))
+        self._save_token_cache()
+
+        return self._render_tasks(tasks, mask)
+
+    def generate_from_frequencies(
+        self,
+        frequencies: Dict[str, int],
+        name: str,
+        mask_path: Optional[str] = None,
+    ) -> bool:
+        """
+        直接由词频生成词云（如 WordFrequencyEngine 统计的大规模短评词频），
+        图片保存为 wordcloud_<name>.png
+        """
+        if not mask_path:
+            self.logger.warning("未提供遮罩图片，无法生成词云")
+            return False
+        if not frequencies:
+            self.logger.warning(f"{name} 没有有效词语，跳过词云生成")
+            return False
+        save_path = os.path.join(self.save_dir, f"wordcloud_{name}.png")
+        return self._render_tasks([(name, dict(frequencies), save_path)], load_mask(mask_path))
 
+    def _render_tasks(self, tasks: List[Tuple[str, Dict[str, int], str]], mask: np.ndarray) -> bool:
+        """绘制词云，多个任务在进程池中并行"""
+        success = False
+        options = self._render_options()
+        workers = min(len(tasks), self.max_workers or os.cpu_count() or 1)
+        if workers > 1:
+            with process_pool(max_workers=workers) as executor:
+                futures = {
+                    executor.submit(
+                        _render_wordcloud, frequencies, mask, options, save_path
+                    ): (column, save_path)
+                    for column, frequencies, save_path in tasks
+                }
+                for future in as_completed(futures):
+                    column, save_path = futures[future]
+                    try:
+                        elapsed = future.result()
+                    except Exception as e:
+                        self.logger.error(f"列 {column} 的词云生成失败: {e}")
+                        continue
+                    success = True
+                    self.logger.info(f"词云图片已保存至 {save_path}，耗时 {elapsed:.2f} 秒")
         else:
+            for column, frequencies, save_path in tasks:
+                try:
+                    elapsed = _render_wordcloud(frequencies, mask, options, save_path)
+                except Exception as e:
+                    self.logger.error(f"列 {column} 的词云生成失败: {e}")
+                    continue
+                success = True
+                self.logger.info(f"词云图片已保存至 {save_path}，耗时 {elapsed:.2f} 秒")
+
+        if not success:
             print("生成过程出现错误！未生成任何词云图片")
             self.logger.error("未生成任何词云图片")
         return success
@@ -0,0 +1,15 @@
+"""
+WSGI 入口模块，供 gunicorn / waitress 等 WSGI 服务器加载
+
+    gunicorn --preload -w 4 -k gthread --threads 4 wsgi:app
+"""
+
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from app import create_app
+
+# 在模块导入时预加载数据，配合 --preload 在 fork 工作进程之前完成
+app = create_app(preload=True)
+application = app